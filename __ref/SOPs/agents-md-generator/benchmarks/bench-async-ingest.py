@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+bench-async-ingest.py - Overlapped reads on a simulated slow filesystem
+
+Purpose: Time analyze_folder() and extract_context() with 1/4/16/64 reads in
+         flight on a local folder made to behave like a network share (every
+         document read waits --latency-ms per round trip, stat/open/read),
+         and verify the output is identical for every setting
+
+Usage:
+    python bench-async-ingest.py [--files N] [--words N] [--latency-ms MS] [--round-trips N]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from bench_corpus import load_execution, make_markdown
+
+from md_document import read_document  # importable once bench_corpus has set up sys.path
+
+
+class SlowFilesystem:
+    """Stand-in for read_document() on a share with per-call latency.
+
+    The wait uses time.sleep(), which releases the GIL like a blocking
+    network call does.
+    """
+
+    def __init__(self, latency: float, round_trips: int):
+        self.latency = latency
+        self.round_trips = round_trips
+
+    def read_document(self, file_path: Path):
+        time.sleep(self.latency * self.round_trips)
+        return read_document(file_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Overlapped reads on a simulated slow filesystem")
+    parser.add_argument('--files', type=int, default=300)
+    parser.add_argument('--words', type=int, default=800)
+    parser.add_argument('--latency-ms', type=float, default=5.0)
+    parser.add_argument('--round-trips', type=int, default=3)
+    args = parser.parse_args()
+
+    analyzer = load_execution('analyze-folder.py')
+    extractor = load_execution('extract-context.py')
+    slow = SlowFilesystem(args.latency_ms / 1000, args.round_trips)
+    analyzer.read_document = extractor.read_document = slow.read_document
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp) / 'share'
+        folder.mkdir()
+        rng = random.Random(42)
+        for i in range(args.files):
+            (folder / f'doc-{i:04d}.md').write_text(make_markdown(rng, args.words, f'Document {i}'),
+                                                    encoding='utf-8')
+        print(f"{args.files} files (~{args.words} words), "
+              f"{args.latency_ms:g} ms x {args.round_trips} round trips per read")
+
+        reference = None
+        baseline = None
+        for in_flight in (1, 4, 16, 64):
+            start = time.perf_counter()
+            analysis = analyzer.analyze_folder(str(folder), in_flight=in_flight)
+            analyzed = time.perf_counter() - start
+            start = time.perf_counter()
+            context = extractor.extract_context(str(folder), analysis, in_flight=in_flight)
+            extracted = time.perf_counter() - start
+
+            analysis.pop('analysis_date')
+            result = (analysis, context)
+            if reference is None:
+                reference, baseline = result, analyzed + extracted
+            print(f"  in_flight={in_flight:3d}: analyze {analyzed:6.2f}s  extract {extracted:6.2f}s  "
+                  f"speedup={baseline / (analyzed + extracted):5.2f}x  "
+                  f"identical={'yes' if result == reference else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
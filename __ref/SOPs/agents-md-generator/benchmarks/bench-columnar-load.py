@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+bench-columnar-load.py - Loading a large analysis: JSON vs columnar
+
+Purpose: Write a synthetic N-file analysis as indented JSON (the current
+         output) and as a columnar .mdcol file, then time and measure the
+         peak RSS of loading it back, each case in a fresh interpreter:
+         full json.load, opening the mmap reader and fetching one record,
+         decoding every record, and decoding a single column
+
+Usage:
+    python bench-columnar-load.py [--files N]   (Linux: reads peak RSS from /proc)
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from bench_corpus import VOCABULARY
+
+from columnar_store import write_columnar  # importable once bench_corpus has set up sys.path
+
+# Each case runs in a child process so that peak RSS is its own
+CASES = {
+    'json.load': "data = json.load(open(path, encoding='utf-8')); record = data['files'][n // 2]",
+    'columnar: one record': "store = ColumnarFile(path); record = store[n // 2]",
+    'columnar: all records': "store = ColumnarFile(path); records = list(store)",
+    'columnar: one column': "store = ColumnarFile(path); total = sum(store.column('word_count'))",
+}
+
+# ru_maxrss survives exec (it would report the parent's peak), so peak RSS
+# is read from VmHWM on Linux
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {executions!r})
+from columnar_store import ColumnarFile
+
+def peak_kb():
+    with open('/proc/self/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith('VmHWM:'))
+
+path, n = {path!r}, {n}
+before = peak_kb()
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, peak_kb() - before]))
+"""
+
+
+def make_records(rng: random.Random, count: int) -> list:
+    """Analysis records shaped like analyze_document() output."""
+    types = ['sop', 'template', 'guide', 'reference', 'documentation', 'summary']
+    records = []
+    for i in range(count):
+        title = ' '.join(rng.sample(VOCABULARY, 3)).title()
+        records.append({
+            'name': f'doc-{i:06d}.md',
+            'path': f'docs/doc-{i:06d}.md',
+            'size_bytes': rng.randrange(500, 200000),
+            'word_count': rng.randrange(50, 30000),
+            'last_modified': f'2026-0{rng.randrange(1, 10)}-1{rng.randrange(10)}T12:00:00',
+            'file_type': rng.choice(types),
+            'has_frontmatter': True,
+            'frontmatter': {'title': title, 'keywords': rng.sample(VOCABULARY, 4)},
+            'headings': [f'Section {j}: {" ".join(rng.sample(VOCABULARY, 3))}' for j in range(10)],
+            'line_count': rng.randrange(10, 3000),
+            'content_hash': '%064x' % rng.getrandbits(256)
+        })
+    return records
+
+
+def measure(executions: str, path: str, n: int, statement: str) -> tuple:
+    code = CHILD.format(executions=executions, path=path, n=n, statement=statement)
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    return tuple(json.loads(output))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Loading a large analysis: JSON vs columnar")
+    parser.add_argument('--files', type=int, default=50000)
+    args = parser.parse_args()
+
+    from bench_corpus import EXECUTIONS_DIR
+    rng = random.Random(42)
+    records = make_records(rng, args.files)
+    meta = {'folder_name': 'docs', 'file_count': args.files}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = Path(tmp) / 'docs_analysis.json'
+        columnar_file = Path(tmp) / 'docs_analysis.mdcol'
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(dict(meta, files=records), f, indent=2, ensure_ascii=False)
+        write_columnar(str(columnar_file), meta, records)
+        print(f"{args.files} records: JSON {json_file.stat().st_size / 1e6:.1f} MB, "
+              f"columnar {columnar_file.stat().st_size / 1e6:.1f} MB")
+
+        for case, statement in CASES.items():
+            path = json_file if case.startswith('json') else columnar_file
+            elapsed, rss_kb = measure(str(EXECUTIONS_DIR), str(path), args.files, statement)
+            print(f"  {case:22s} {elapsed * 1000:9.1f} ms  peak RSS +{rss_kb / 1024:7.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+bench-document-scan.py - Document scanning benchmark for md_document.py
+
+Purpose: Time the per-file structure work (headings, word/line counts, first
+         paragraph, concept headings, file type sniffing) on a synthetic
+         corpus: the previous multi-pass approach (line loop, repeated
+         splits, full-content lowercasing, a second heading regex) against
+         the single md_scanner.py pass used by MarkdownDocument
+
+Usage:
+    python bench-document-scan.py [--files N] [--words N] [--repeat N]
+"""
+
+import argparse
+import random
+import re
+import time
+from pathlib import Path
+
+from bench_corpus import load_execution, make_markdown
+
+import md_document  # importable once bench_corpus has set up sys.path
+
+
+def multi_pass(content: str) -> tuple:
+    """The per-file work as it was done before md_scanner.py."""
+    headings = []
+    for line in content.split('\n'):
+        if line.strip().startswith('#'):
+            headings.append(re.sub(r'^#+\s*', '', line.strip()))
+    frontmatter_text, body = md_document.split_frontmatter(content)
+    md_document.parse_frontmatter_fields(frontmatter_text)
+    paragraphs = [p.strip() for p in body.split('\n\n') if p.strip()]
+    first_paragraph = md_document.first_paragraph_text(paragraphs)
+    word_count = len(content.split())
+    line_count = len(content.split('\n'))
+    concept_headings = re.findall(r'^#+\s+(.+)$', content, re.MULTILINE)[:10]
+    sniffed = ('example' in content.lower()[:500], 'overview' in content.lower()[:1000])
+    return headings, first_paragraph, word_count, line_count, concept_headings, sniffed
+
+
+def single_pass(content: str, identify_file_type) -> tuple:
+    """The same results from one MarkdownDocument."""
+    doc = md_document.MarkdownDocument(Path('bench.md'), content, len(content), 0.0)
+    concept_headings = [h.text for h in doc.scan.headings if h.text][:10]
+    identify_file_type(doc.name, doc.content)
+    return doc.headings, doc.first_paragraph, doc.word_count, doc.line_count, concept_headings
+
+
+def timed(fn, documents, *args) -> float:
+    start = time.perf_counter()
+    for content in documents:
+        fn(content, *args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Document scanning benchmark")
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--words', type=int, default=800)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    identify_file_type = load_execution('analyze-folder.py').identify_file_type
+    rng = random.Random(42)
+    documents = [make_markdown(rng, args.words, f'Document {i}') for i in range(args.files)]
+    size_mb = sum(len(d) for d in documents) / (1024 * 1024)
+
+    for content in documents[:200]:
+        assert multi_pass(content)[:5] == single_pass(content, identify_file_type), "results differ"
+
+    old = min(timed(multi_pass, documents) for _ in range(args.repeat))
+    new = min(timed(single_pass, documents, identify_file_type) for _ in range(args.repeat))
+    print(f"{args.files} files ({size_mb:.0f} MB), best of {args.repeat}")
+    print(f"  multi-pass:  {old:6.2f}s  ({args.files / old:8.0f} files/s)")
+    print(f"  single-pass: {new:6.2f}s  ({args.files / new:8.0f} files/s)  {old / new:4.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+bench-existing-detect.py - Generator detection on large AGENTS.md files
+
+Purpose: Build a tree of folders whose AGENTS.md files are several MB each
+         (generated ones with a long frontmatter inventory, manual ones of
+         plain prose), then time the previous whole-file check against the
+         bounded-prefix detection, and the --scan report with 1 and 8
+         threads; verify both checks agree on every file
+
+Usage:
+    python bench-existing-detect.py [--folders N] [--mb MB]
+"""
+
+import argparse
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from bench_corpus import VOCABULARY, load_execution, make_markdown
+
+
+def whole_file_check(agents_md_path: Path) -> bool:
+    """is_generated_by_tool() as it was: read everything, scan it all."""
+    with open(agents_md_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    if content.startswith('---'):
+        parts = content.split('---', 2)
+        if len(parts) >= 2:
+            frontmatter = parts[1]
+            if 'agents-md-generator' in frontmatter.lower():
+                return True
+            if 'progressive context loading' in frontmatter.lower():
+                return True
+    if '## 🎯 CONTEXT: Progressive Context Loading Protocol' in content:
+        return True
+    if 'Level 1: Front Matter' in content and 'Level 2: AGENTS.md Content' in content:
+        return True
+    if re.search(r'Generated.*\d{4}-\d{2}-\d{2}', content):
+        return True
+    return False
+
+
+def make_generated(rng: random.Random, size: int) -> str:
+    lines = ['---', 'title: "Docs"', 'author: "agents-md-generator"',
+             'generator: "agents-md-generator/1"', 'files:']
+    i = 0
+    written = 0
+    while written < size:
+        entry = [f'  - name: "doc-{i:06d}.md"',
+                 f'    purpose: "{" ".join(rng.sample(VOCABULARY, 8))}"',
+                 f'    tier: {rng.randrange(1, 4)}']
+        lines += entry
+        written += sum(map(len, entry))
+        i += 1
+    return '\n'.join(lines + ['---', '', '# Docs', '', '**Generated:** 2026-01-01', ''])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generator detection on large AGENTS.md files")
+    parser.add_argument('--folders', type=int, default=40)
+    parser.add_argument('--mb', type=float, default=4.0)
+    args = parser.parse_args()
+
+    checker = load_execution('check-existing-agents-md.py')
+    size = int(args.mb * 1024 * 1024)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        rng = random.Random(42)
+        for i in range(args.folders):
+            folder = root / f'project-{i:03d}' / 'docs'
+            folder.mkdir(parents=True)
+            if i % 2:
+                text = make_generated(rng, size)
+            else:
+                text = make_markdown(rng, size // 8, f'Notes {i}')
+            (folder / 'AGENTS.md').write_text(text, encoding='utf-8')
+        paths = sorted(root.glob('*/docs/AGENTS.md'))
+        print(f"{len(paths)} AGENTS.md files of ~{args.mb:g} MB (half generated)")
+
+        start = time.perf_counter()
+        before = [whole_file_check(p) for p in paths]
+        whole = time.perf_counter() - start
+        start = time.perf_counter()
+        after = [checker.is_generated_by_tool(p) for p in paths]
+        bounded = time.perf_counter() - start
+        print(f"  whole-file check:    {whole * 1000:8.1f} ms")
+        print(f"  bounded detection:   {bounded * 1000:8.1f} ms  speedup={whole / bounded:6.1f}x  "
+              f"agree={'yes' if before == after else 'NO'}")
+
+        for workers in (1, 8):
+            start = time.perf_counter()
+            report = checker.scan_tree(str(root), workers)
+            elapsed = time.perf_counter() - start
+            print(f"  --scan, {workers} thread(s): {elapsed * 1000:8.1f} ms  {report['counts']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+bench-frontmatter-load.py - Frontmatter loader benchmark for validate-agents-md.py
+
+Purpose: Time loading a large AGENTS.md frontmatter (one `files:` and one
+         `contextual_snippets:` entry per file) with yaml.safe_load, the
+         libyaml CSafeLoader and the built-in subset parser
+
+Usage:
+    python bench-frontmatter-load.py [--files N] [--repeat N]
+"""
+
+import argparse
+import random
+import time
+
+from bench_corpus import VOCABULARY
+
+import frontmatter_loader  # importable once bench_corpus has set up sys.path
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+def make_frontmatter(file_count: int, seed: int = 42) -> str:
+    """AGENTS.md-style frontmatter describing file_count files."""
+    rng = random.Random(seed)
+    lines = [
+        'title: Benchmark Folder',
+        'version: 1.0.0',
+        'author: Generated',
+        'date: 2025-01-15',
+        'status: Active',
+        'classification: Internal Operations | Handoff to IDE/CLI AI Coders',
+        '',
+        '# Contextual Retrieval Snippets (Level 1: Always Loaded)',
+        'contextual_snippets:'
+    ]
+    names = [f"{rng.choice(VOCABULARY)}-{i:04d}.md" for i in range(file_count)]
+    for name in names:
+        words = ' '.join(rng.choice(VOCABULARY) for _ in range(12))
+        keywords = ', '.join(rng.sample(VOCABULARY, 5))
+        lines += [
+            f'  - snippet: "{words.capitalize()}"',
+            f'    keywords: [{keywords}]',
+            f'    file: {name}',
+            f'    tier: {rng.randint(1, 3)}'
+        ]
+    lines += ['', '# File Inventory', 'files:']
+    for name in names:
+        lines += [
+            f'  - name: {name}',
+            f'    purpose: "Guide to {rng.choice(VOCABULARY)} {rng.choice(VOCABULARY)}"',
+            f'    use_when: "When working on {rng.choice(VOCABULARY)} tasks"',
+            f'    tier: {rng.randint(1, 3)}',
+            f'    word_count: {rng.randint(50, 5000)}  # from analysis'
+        ]
+    lines += ['', 'key_concepts:'] + [f'  - "{w}"' for w in rng.sample(VOCABULARY, 8)]
+    return '\n'.join(lines) + '\n'
+
+
+def best_of(repeat: int, fn, text: str) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frontmatter loader benchmark")
+    parser.add_argument('--files', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_frontmatter(args.files)
+    subset = frontmatter_loader.parse_frontmatter_subset(text)
+    assert len(subset['files']) == len(subset['contextual_snippets']) == args.files
+
+    loaders = [('subset parser', frontmatter_loader.parse_frontmatter_subset)]
+    if yaml is not None:
+        assert yaml.safe_load(text) == subset, "subset parser disagrees with yaml.safe_load"
+        loaders.insert(0, ('yaml.safe_load', yaml.safe_load))
+        if frontmatter_loader.HAS_LIBYAML:
+            loaders.insert(1, ('CSafeLoader', lambda t: yaml.load(t, Loader=yaml.CSafeLoader)))
+
+    print(f"{args.files}-file AGENTS.md frontmatter ({len(text) / 1024:.0f} KB), best of {args.repeat}")
+    baseline = None
+    for name, fn in loaders:
+        elapsed = best_of(args.repeat, fn, text)
+        baseline = baseline or elapsed
+        print(f"  {name + ':':18} {elapsed * 1000:8.1f} ms  ({baseline / elapsed:5.1f}x)")
+    print(f"  load_frontmatter() uses: {frontmatter_loader.LOADER}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+bench-keyword-index.py - Keyword engine benchmark for extract-context.py
+
+Purpose: Time building the BM25 keyword index for a synthetic folder of
+         N files (term vectors, document frequencies, top-k scoring),
+         compare a full rebuild with an incremental update after a few
+         files change, and time the search index sidecar (build, load, query)
+
+Usage:
+    python bench-keyword-index.py [--files N] [--words N] [--changed N]
+"""
+
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+from pathlib import Path
+
+from bench_corpus import load_execution, make_markdown
+
+import search_index  # importable once bench_corpus has set up sys.path
+from md_document import MarkdownDocument
+
+
+def long_tail(rng: random.Random, size: int = 20000) -> list:
+    """Made-up terms; drawn Zipf-like so document frequencies span a realistic range."""
+    return [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+            for _ in range(size)]
+
+
+def tail_words(rng: random.Random, vocabulary: list, count: int) -> str:
+    return ' '.join(vocabulary[min(int(rng.paretovariate(1.0)) - 1, len(vocabulary) - 1)]
+                    for _ in range(count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword engine benchmark")
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--words', type=int, default=800)
+    parser.add_argument('--changed', type=int, default=10)
+    args = parser.parse_args()
+
+    extractor = load_execution('extract-context.py')
+    rng = random.Random(42)
+    vocabulary = long_tail(rng)
+    docs = [MarkdownDocument(Path(f'doc-{i:05d}.md'),
+                             make_markdown(rng, args.words, f'Document {i}') + '\n' + tail_words(rng, vocabulary, 200),
+                             0, 0.0)
+            for i in range(args.files)]
+
+    start = time.perf_counter()
+    vectors = [extractor.keyword_vector(doc) for doc in docs]
+    vectorize = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = extractor.KeywordIndex()
+    for key, vector in enumerate(vectors):
+        index.add(key, vector)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    keywords = [extractor.file_keywords(index, key) for key in range(len(docs))]
+    score = time.perf_counter() - start
+
+    # A few files change: replace their vectors, then rescore the folder
+    changed = rng.sample(range(args.files), args.changed)
+    start = time.perf_counter()
+    for key in changed:
+        doc = docs[key]
+        doc = MarkdownDocument(doc.path, doc.content + '\n\nchangelog entry: revised wording.\n', 0, 0.0)
+        index.add(key, extractor.keyword_vector(doc))
+    update = time.perf_counter() - start
+    start = time.perf_counter()
+    keywords = [extractor.file_keywords(index, key) for key in range(len(docs))]
+    rescore = time.perf_counter() - start
+    assert len(keywords) == args.files and 'changelog' in index.df
+
+    full = vectorize + build + score
+    print(f"{args.files} files, {len(index.df)} distinct terms")
+    print(f"  term vectors:      {vectorize:6.2f}s")
+    print(f"  document freqs:    {build:6.2f}s")
+    print(f"  top-k scoring:     {score:6.2f}s")
+    print(f"  full build:        {full:6.2f}s")
+    print(f"  {args.changed} files changed: {update + rescore:6.2f}s  "
+          f"(update {update * 1000:.1f} ms + rescore {rescore:.2f}s, {full / (update + rescore):.1f}x faster)")
+
+    records = [{'name': doc.name, 'keywords': kw} for doc, kw in zip(docs, keywords)]
+    start = time.perf_counter()
+    sidecar = search_index.build_search_index(index, records, 'bench')
+    build_index = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file = os.path.join(tmp, 'bench_index.json')
+        search_index.write_search_index(index_file, sidecar)
+        size_mb = os.path.getsize(index_file) / (1024 * 1024)
+        start = time.perf_counter()
+        loaded = search_index.load_search_index(index_file)
+        load = time.perf_counter() - start
+    queries = [' '.join(rng.sample(vocabulary[:2000], 4)) + ' validation workflow' for _ in range(100)]
+    search_index.search(loaded, queries[0])
+    start = time.perf_counter()
+    for query in queries:
+        search_index.search(loaded, query)
+    query = (time.perf_counter() - start) / len(queries)
+    print(f"  search index:      {build_index:6.2f}s build, {size_mb:.1f} MB, "
+          f"load {load * 1000:.0f} ms, query {query * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
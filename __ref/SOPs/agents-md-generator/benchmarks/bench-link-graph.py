@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+bench-link-graph.py - Link graph construction and PageRank on large trees
+
+Purpose: Generate link lists for synthetic trees of 10k / 30k / 100k files
+         spread over folders (relative links within and across folders,
+         targets skewed towards a few popular files), then time link
+         extraction from markdown text, graph construction and PageRank,
+         and report time per link to show construction stays linear
+
+Usage:
+    python bench-link-graph.py [--links-per-file N] [--sizes 10000,30000,100000]
+"""
+
+import argparse
+import random
+import time
+
+import bench_corpus  # noqa: F401  (puts executions/ on sys.path)
+
+from link_graph import build_link_graph, extract_links, pagerank  # importable once bench_corpus has set up sys.path
+
+FILES_PER_FOLDER = 50
+
+
+def make_tree_links(rng: random.Random, files: int, links_per_file: int) -> tuple:
+    """(keys, link lists as written in each file) for a tree of `files` files."""
+    keys = [f'area-{i // FILES_PER_FOLDER:05d}/doc-{i % FILES_PER_FOLDER:02d}.md' for i in range(files)]
+    links = []
+    for i in range(files):
+        folder = i // FILES_PER_FOLDER
+        file_links = []
+        for _ in range(links_per_file):
+            # Pareto-distributed target: a few files collect most links
+            target = min(files - 1, int(rng.paretovariate(1.2)) - 1) if rng.random() < 0.3 else rng.randrange(files)
+            if target // FILES_PER_FOLDER == folder:
+                file_links.append(f'doc-{target % FILES_PER_FOLDER:02d}.md#section')
+            else:
+                file_links.append(f'../{keys[target]}')
+        links.append(file_links)
+    return keys, links
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Link graph construction and PageRank on large trees")
+    parser.add_argument('--links-per-file', type=int, default=8)
+    parser.add_argument('--sizes', default='10000,30000,100000')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    for files in (int(size) for size in args.sizes.split(',')):
+        keys, links = make_tree_links(rng, files, args.links_per_file)
+        texts = [' '.join(f'See [this]({target}) for details.' for target in file_links) for file_links in links]
+
+        start = time.perf_counter()
+        extracted = [extract_links(text) for text in texts]
+        extract = time.perf_counter() - start
+        start = time.perf_counter()
+        graph = build_link_graph(keys, extracted, centrality=False)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        ranks = pagerank(graph['offsets'], graph['targets'])
+        rank = time.perf_counter() - start
+
+        edges = len(graph['targets'])
+        top = max(range(len(ranks)), key=ranks.__getitem__)
+        print(f"{files:7d} files, {edges:8d} links: extract {extract:6.2f}s  "
+              f"build {build:6.2f}s ({build / edges * 1e6:4.2f} us/link)  "
+              f"pagerank {rank:6.2f}s  top={graph['nodes'][top]} x{ranks[top] * len(ranks):.0f}")
+
+
+if __name__ == '__main__':
+    main()
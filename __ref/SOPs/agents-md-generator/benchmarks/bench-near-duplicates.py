@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+bench-near-duplicates.py - Duplicate detection benchmark for near_duplicates.py
+
+Purpose: Time MinHash signatures and LSH-banded grouping on a synthetic
+         folder of N files in which some files are exact or lightly edited
+         copies, check that every planted copy is found, and compare with
+         comparing all pairs of signatures (timed on a sample, extrapolated)
+
+Usage:
+    python bench-near-duplicates.py [--files N] [--words N] [--copies FRACTION] [--sample N]
+"""
+
+import argparse
+import random
+import time
+
+from bench_corpus import make_markdown
+
+import near_duplicates  # importable once bench_corpus has set up sys.path
+
+
+def edit(rng: random.Random, content: str, fraction: float) -> str:
+    """Replace `fraction` of the words of `content` with other words."""
+    words = content.split(' ')
+    for _ in range(int(len(words) * fraction)):
+        words[rng.randrange(len(words))] = f'edit{rng.randrange(1000)}'
+    return ' '.join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Duplicate detection benchmark")
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--words', type=int, default=800)
+    parser.add_argument('--copies', type=float, default=0.05)
+    parser.add_argument('--sample', type=int, default=1500)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    originals = int(args.files * (1 - args.copies))
+    contents = [make_markdown(rng, args.words, f'Document {i}') for i in range(originals)]
+    planted = []
+    while len(contents) < args.files:
+        source = rng.randrange(originals)
+        exact = rng.random() < 0.5
+        planted.append((source, len(contents)))
+        contents.append(contents[source] if exact else edit(rng, contents[source], 0.01))
+
+    start = time.perf_counter()
+    signatures = [near_duplicates.minhash_signature(content) for content in contents]
+    sign = time.perf_counter() - start
+
+    records = [{'name': f'doc-{i:05d}.md', 'content_hash': str(hash(content)), 'minhash': signature,
+                'last_modified': ''} for i, (content, signature) in enumerate(zip(contents, signatures))]
+    start = time.perf_counter()
+    groups = near_duplicates.find_duplicate_groups(records)
+    group = time.perf_counter() - start
+
+    grouped = {}
+    for g in groups:
+        for name in [g['canonical']] + [d['name'] for d in g['duplicates']]:
+            grouped[name] = g['canonical']
+    found = sum(1 for a, b in planted
+                if grouped.get(records[a]['name']) is not None
+                and grouped.get(records[a]['name']) == grouped.get(records[b]['name']))
+
+    sample = signatures[:args.sample]
+    start = time.perf_counter()
+    for i in range(len(sample)):
+        for j in range(i):
+            near_duplicates.similarity(sample[i], sample[j])
+    pairs = time.perf_counter() - start
+    all_pairs = pairs * (args.files / len(sample)) ** 2
+
+    print(f"{args.files} files, {len(planted)} planted copies")
+    print(f"  signatures:        {sign:6.2f}s  ({args.files / sign:8.0f} files/s)")
+    print(f"  LSH grouping:      {group:6.2f}s  ({len(groups)} groups, {found}/{len(planted)} copies found)")
+    print(f"  all pairs:         {all_pairs:6.1f}s  (extrapolated from {len(sample)} files, "
+          f"{all_pairs / group:.0f}x slower)")
+
+
+if __name__ == '__main__':
+    main()
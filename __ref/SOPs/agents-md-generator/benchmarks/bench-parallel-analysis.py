@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+bench-parallel-analysis.py - Worker scaling benchmark for recursive analysis
+
+Purpose: Time analyze_tree() on a synthetic tree with 1/2/4/8 workers and
+         verify the output is identical for every worker count
+
+Usage:
+    python bench-parallel-analysis.py [--folders N] [--files N] [--words N] [--executor process|thread]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from bench_corpus import load_execution, make_corpus
+
+
+def strip_volatile(analysis: dict) -> dict:
+    """Drop timestamps so results of different runs can be compared."""
+    analysis = dict(analysis)
+    analysis.pop('analysis_date', None)
+    analysis['folders'] = [{k: v for k, v in f.items() if k != 'analysis_date'}
+                           for f in analysis['folders']]
+    return analysis
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker scaling benchmark for analyze_tree()")
+    parser.add_argument('--folders', type=int, default=200)
+    parser.add_argument('--files', type=int, default=10)
+    parser.add_argument('--words', type=int, default=1500)
+    parser.add_argument('--executor', choices=['process', 'thread'], default='process')
+    args = parser.parse_args()
+    
+    analyzer = load_execution('analyze-folder.py')
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = make_corpus(Path(tmp), args.folders, args.files, args.words)
+        print(f"Corpus: {args.folders} folders x {args.files} files (~{args.words} words each), "
+              f"executor={args.executor}")
+        
+        reference = None
+        baseline = None
+        for workers in (1, 2, 4, 8):
+            start = time.perf_counter()
+            analysis = analyzer.analyze_tree(str(root), workers=workers, executor=args.executor)
+            elapsed = time.perf_counter() - start
+            
+            result = strip_volatile(analysis)
+            if reference is None:
+                reference, baseline = result, elapsed
+            identical = result == reference
+            print(f"  workers={workers}: {elapsed:7.3f}s  speedup={baseline / elapsed:5.2f}x  "
+                  f"identical={'yes' if identical else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+bench_corpus.py - Shared helpers for the benchmark scripts
+
+Purpose: Generate synthetic markdown corpora and load the hyphen-named
+         execution scripts as modules
+"""
+
+import random
+import sys
+from pathlib import Path
+
+EXECUTIONS_DIR = Path(__file__).resolve().parent.parent / 'executions'
+
+# Make shared execution modules (md_document.py, ...) importable
+if str(EXECUTIONS_DIR) not in sys.path:
+    sys.path.insert(0, str(EXECUTIONS_DIR))
+
+from script_loader import load_execution  # noqa: E402  (re-exported for benchmarks)
+
+VOCABULARY = (
+    'agent context loading tier progressive snippet keyword template '
+    'validation checklist framework protocol execution guide summary '
+    'overview reference archive mission objective workflow phase output '
+    'frontmatter inventory document section heading paragraph analysis'
+).split()
+
+
+def make_markdown(rng: random.Random, words: int, title: str) -> str:
+    """Build one synthetic markdown document of roughly `words` words."""
+    lines = [
+        '---',
+        f'title: "{title}"',
+        f'keywords: [{", ".join(rng.sample(VOCABULARY, 4))}]',
+        '---',
+        '',
+        f'# {title}',
+        '',
+    ]
+    written = 0
+    section = 1
+    while written < words:
+        lines.append(f'## Section {section}: {" ".join(rng.sample(VOCABULARY, 3)).title()}')
+        lines.append('')
+        paragraph = ' '.join(rng.choice(VOCABULARY) for _ in range(60)) + '.'
+        lines.append(paragraph)
+        lines.append('')
+        written += 65
+        section += 1
+    return '\n'.join(lines)
+
+
+def make_corpus(root: Path, folders: int, files_per_folder: int, words: int = 800,
+                seed: int = 42) -> Path:
+    """Write a synthetic tree of `folders` x `files_per_folder` markdown files."""
+    rng = random.Random(seed)
+    names = ['README', 'quick-start', 'guide', 'template', 'sop', 'clog', 'summary', 'notes']
+    for i in range(folders):
+        folder = root / f'group-{i // 20:03d}' / f'folder-{i:04d}'
+        folder.mkdir(parents=True, exist_ok=True)
+        for j in range(files_per_folder):
+            name = f'{names[j % len(names)]}-{j:03d}.md'
+            (folder / name).write_text(make_markdown(rng, words, f'Document {i}-{j}'), encoding='utf-8')
+    return root
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+agents-md.py - Run the AGENTS.md pipeline in a single process
+
+Purpose: Run analyze -> extract -> check-existing -> generate -> validate for
+         a folder in one Python process, handing the analysis and context
+         from phase to phase in memory (each file is read once). The
+         intermediate [TARGET_FOLDER]_analysis.json / _context.json files are
+         only written on request. Reports how long each phase took.
+
+         `schedule` runs the pipeline for many folders with bounded
+         parallelism, largest folders first, recording each finished job in
+         a journal so an interrupted run can be resumed.
+
+Usage:
+    python agents-md.py run [TARGET_FOLDER_PATH] [--write-json] [--output-dir DIR]
+                            [--cache] [--cache-file PATH] [--no-generate] [--force]
+    python agents-md.py schedule [FOLDER_OR_GLOB ...] [--from-file LIST] [--jobs N]
+                            [--journal FILE] [--resume] [--write-json] [--output-dir DIR]
+                            [--cache] [--no-generate] [--force]
+
+    --write-json   Also write [TARGET_FOLDER]_analysis.json and _context.json
+    --output-dir   Where the JSON files (and the cache) go (default: .)
+    --cache        Reuse results for unchanged files (default: [TARGET_FOLDER]_cache.json)
+    --no-generate  Skip generation; only validate an existing AGENTS.md
+    --force        Overwrite a manually created AGENTS.md (a backup is written first)
+
+    schedule:
+    --from-file    Read target folders (or globs) from a file, one per line
+    --jobs         Folders processed in parallel (default: 1)
+    --journal      Job journal, one JSON line per finished folder (default: agents-md-jobs.jsonl)
+    --resume       Skip folders the journal already lists as finished (status pass or
+                   manually_created); failed, not_exists and error jobs are retried.
+                   Skipped folders still count towards the results and exit code
+
+Exit codes:
+    0 = AGENTS.md generated (or present) and validation passed (for every folder,
+        including those --resume skips)
+    1 = Error or validation failed (for any folder); also when --no-generate
+        finds no AGENTS.md to validate (status "not_exists"), and with
+        schedule for manually created files
+    2 = AGENTS.md exists and was manually created (not overwritten; run only)
+"""
+
+import glob
+import json
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from analysis_cache import AnalysisCache
+from script_loader import load_execution
+
+
+class PhaseTimer:
+    """Record wall-clock time per pipeline phase."""
+
+    def __init__(self):
+        self.timings: List[Tuple[str, float]] = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((name, time.perf_counter() - start))
+
+    def total(self) -> float:
+        return time.perf_counter() - self._started
+
+    def print_report(self):
+        print("  Phase timings:")
+        for name, seconds in self.timings:
+            print(f"    {name:<16} {seconds * 1000:8.1f} ms")
+        print(f"    {'total':<16} {self.total() * 1000:8.1f} ms")
+
+
+def write_json(output_file: Path, data: Dict[str, Any]):
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def run_pipeline(folder_path: str, write_intermediate: bool = False, output_dir: str = '.',
+                 cache_file: Optional[str] = None, generate: bool = True,
+                 force: bool = False, output_stem: Optional[str] = None) -> Dict[str, Any]:
+    """Run every phase for one folder and return the results of each.
+
+    Intermediate JSON is named `<output_stem>_analysis.json` (default: the
+    folder name). Raises FileNotFoundError/ValueError if the folder cannot
+    be analyzed.
+    """
+    analyzer = load_execution('analyze-folder.py')
+    extractor = load_execution('extract-context.py')
+    checker = load_execution('check-existing-agents-md.py')
+    generator = load_execution('generate-agents-md.py')
+    validator = load_execution('validate-agents-md.py')
+
+    timer = PhaseTimer()
+    output_dir = Path(output_dir)
+    folder_name = output_stem or Path(folder_path).name
+    run = {'folder_path': folder_path, 'timer': timer, 'outputs': []}
+
+    # Phase 1 + 2: documents parsed during analysis are reused by extraction.
+    # Both phases share one cache file, so each cache is saved before the
+    # next one is opened (as when the scripts run one after the other).
+    documents = {}
+    with timer.phase('analyze'):
+        cache = (AnalysisCache(cache_file, 'analysis', analyzer.ANALYZER_VERSION, refresh=analyzer.refresh_mtime)
+                 if cache_file else None)
+        analysis = analyzer.analyze_folder(folder_path, documents, cache)
+        if cache:
+            cache.save()
+            run['cache'] = {'analysis': cache.summary()}
+    with timer.phase('extract'):
+        cache = AnalysisCache(cache_file, 'context', extractor.EXTRACTOR_VERSION) if cache_file else None
+        context = extractor.extract_context(folder_path, analysis, documents, cache)
+        if cache:
+            cache.save()
+            run['cache']['context'] = cache.summary()
+    run['analysis'], run['context'] = analysis, context
+
+    if write_intermediate:
+        with timer.phase('write-json'):
+            for suffix, data in (('analysis', analysis), ('context', context)):
+                output_file = output_dir / f"{folder_name}_{suffix}.json"
+                write_json(output_file, data)
+                run['outputs'].append(str(output_file))
+
+    # Phase 3: pre-write check, then render AGENTS.md from the in-memory context
+    with timer.phase('check-existing'):
+        existing = checker.check_existing_agents_md(folder_path)
+    run['existing'] = existing
+    if existing.get('status') == 'error':
+        raise FileNotFoundError(existing.get('error'))
+
+    agents_md_file = Path(folder_path) / 'AGENTS.md'
+    run['generated'] = None
+    if generate:
+        if existing['status'] == 'manually_created' and not force:
+            run['status'] = 'manually_created'
+            return run
+        with timer.phase('generate'):
+            run['generated'] = generator.generate_agents_md(folder_path, context, analysis, force=force)
+
+    # Phase 4: validate
+    run['validation'] = None
+    if agents_md_file.exists():
+        with timer.phase('validate'):
+            run['validation'] = validator.run_all_checks(str(agents_md_file), folder_path)
+        run['status'] = 'fail' if run['validation'].failed else 'pass'
+    else:
+        run['status'] = 'not_exists'
+    return run
+
+
+# Journal statuses that count as finished; every other job is retried on resume
+# (a manually created AGENTS.md stays as it is until the run is given --force)
+FINISHED_STATUSES = ('pass', 'manually_created')
+
+
+def expand_targets(patterns: Iterable[str]) -> List[str]:
+    """Expand folder paths and glob patterns into unique existing folders, sorted."""
+    folders = {}
+    for pattern in patterns:
+        pattern = pattern.strip()
+        if not pattern or pattern.startswith('#'):
+            continue
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            if os.path.isdir(match):
+                folders.setdefault(os.path.realpath(match), os.path.normpath(match))
+    return sorted(folders.values())
+
+
+def job_stem(folder_path: str) -> str:
+    """Unique, file-name-safe stem for one folder's outputs in a shared directory."""
+    stem = re.sub(r'[^A-Za-z0-9._-]+', '__', os.path.normpath(folder_path).strip('/.'))
+    return stem or Path(os.path.realpath(folder_path)).name
+
+
+def folder_size(folder_path: str) -> int:
+    """total_size_bytes the analysis will report, from a stat-only pass."""
+    try:
+        markdown_files = load_execution('analyze-folder.py').list_markdown_files(Path(folder_path))
+    except (OSError, ValueError):
+        return 0
+    total = 0
+    for md_file in markdown_files:
+        try:
+            total += md_file.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+def run_folder_job(folder_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the pipeline for one scheduled folder; never raises (worker entry point)."""
+    started = time.perf_counter()
+    result = {'folder': folder_path}
+    try:
+        stem = job_stem(folder_path)
+        cache_file = str(Path(options['output_dir']) / f"{stem}_cache.json") if options['cache'] else None
+        run = run_pipeline(folder_path, options['write_json'], options['output_dir'], cache_file,
+                           options['generate'], options['force'], output_stem=stem)
+        result['status'] = run['status']
+        result['total_size_bytes'] = run['analysis']['total_size_bytes']
+        result['file_count'] = run['analysis']['file_count']
+        if run.get('validation') is not None:
+            result['failed_checks'] = [name for name, _ in run['validation'].failed]
+        result['timings'] = {name: round(seconds, 6) for name, seconds in run['timer'].timings}
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['duration'] = round(time.perf_counter() - started, 6)
+    return result
+
+
+class JobJournal:
+    """Append-only JSON Lines record of finished jobs, used to resume a run."""
+
+    def __init__(self, journal_file: str, resume: bool = False):
+        self.journal_file = Path(journal_file)
+        self.finished = self._load() if resume else {}
+        self._file = open(self.journal_file, 'a' if resume else 'w', encoding='utf-8')
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Last record per folder; a torn final line from an interrupted run is ignored."""
+        finished = {}
+        try:
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get('record') == 'job':
+                        finished[os.path.realpath(record['folder'])] = record
+        except OSError:
+            pass
+        return {k: v for k, v in finished.items() if v.get('status') in FINISHED_STATUSES}
+
+    def is_finished(self, folder_path: str) -> bool:
+        return os.path.realpath(folder_path) in self.finished
+
+    def previous(self, folder_path: str) -> Dict[str, Any]:
+        """Journal record of a folder is_finished() reports as finished."""
+        return self.finished[os.path.realpath(folder_path)]
+
+    def record(self, result: Dict[str, Any]):
+        """Append one finished job and force it to disk before moving on."""
+        entry = dict(result, record='job', finished_at=datetime.now().isoformat(timespec='seconds'))
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+def schedule_folders(folders: List[str], options: Dict[str, Any], jobs: int = 1,
+                     journal: Optional[JobJournal] = None, progress=None) -> Dict[str, Any]:
+    """Run the pipeline for many folders, largest (by total_size_bytes) first.
+
+    At most `jobs` folders run at once (in worker processes when jobs > 1)
+    and at most 2 * jobs are queued, so the largest remaining folder is
+    always the next one started. A failing folder is recorded as 'error'
+    and does not stop the others. Finished jobs are appended to `journal`;
+    folders it already lists as finished are skipped, their journal status
+    still counted in 'counts'.
+    """
+    started = time.perf_counter()
+    skipped = [f for f in folders if journal is not None and journal.is_finished(f)]
+    pending = [f for f in folders if journal is None or not journal.is_finished(f)]
+    sizes = {f: folder_size(f) for f in pending}
+    queue = sorted(pending, key=lambda f: (-sizes[f], f))
+    results = []
+
+    def finish(result):
+        results.append(result)
+        if journal is not None:
+            journal.record(result)
+        if progress:
+            progress(len(results), len(queue), result)
+
+    if jobs <= 1:
+        for folder in queue:
+            finish(run_folder_job(folder, options))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            waiting = iter(queue)
+            running = {}
+            while True:
+                while len(running) < jobs * 2:
+                    folder = next(waiting, None)
+                    if folder is None:
+                        break
+                    running[pool.submit(run_folder_job, folder, options)] = folder
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    folder = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # The worker itself died (e.g. killed); isolate it to this folder
+                        result = {'folder': folder, 'status': 'error', 'error': f"{type(e).__name__}: {e}",
+                                  'duration': 0.0}
+                    finish(result)
+
+    counts = {}
+    for result in results + [journal.previous(f) for f in skipped]:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    return {
+        'total': len(folders),
+        'run': len(results),
+        'skipped': len(skipped),
+        'counts': counts,
+        'duration': time.perf_counter() - started,
+        'results': results
+    }
+
+
+def main():
+    """Main execution function."""
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='agents-md', description="AGENTS.md generator pipeline")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    run_parser = commands.add_parser('run', help="Run every phase for one folder in a single process")
+    run_parser.add_argument('folder_path', nargs='?', metavar='TARGET_FOLDER_PATH')
+    run_parser.add_argument('--write-json', action='store_true',
+                            help="Also write [TARGET_FOLDER]_analysis.json and _context.json")
+    run_parser.add_argument('--output-dir', default='.', help="Directory for JSON and cache files (default: .)")
+    run_parser.add_argument('--cache', action='store_true', help="Reuse results for unchanged files")
+    run_parser.add_argument('--cache-file', metavar='PATH',
+                            help="Cache file (default: [TARGET_FOLDER]_cache.json in --output-dir)")
+    run_parser.add_argument('--no-generate', action='store_true',
+                            help="Skip generation and only validate an existing AGENTS.md")
+    run_parser.add_argument('--force', action='store_true', help="Overwrite a manually created AGENTS.md")
+    schedule_parser = commands.add_parser('schedule', help="Run the pipeline for many folders, largest first")
+    schedule_parser.add_argument('targets', nargs='*', metavar='FOLDER_OR_GLOB')
+    schedule_parser.add_argument('--from-file', metavar='LIST', help="File listing target folders or globs")
+    schedule_parser.add_argument('--jobs', type=int, default=1, help="Folders processed in parallel (default: 1)")
+    schedule_parser.add_argument('--journal', default='agents-md-jobs.jsonl',
+                                 help="Job journal file (default: agents-md-jobs.jsonl)")
+    schedule_parser.add_argument('--resume', action='store_true',
+                                 help="Skip folders the journal lists as passed or manually created")
+    schedule_parser.add_argument('--write-json', action='store_true',
+                                 help="Also write each folder's _analysis.json and _context.json")
+    schedule_parser.add_argument('--output-dir', default='.', help="Directory for JSON and cache files (default: .)")
+    schedule_parser.add_argument('--cache', action='store_true', help="Keep an incremental cache per folder")
+    schedule_parser.add_argument('--no-generate', action='store_true',
+                                 help="Skip generation and only validate existing AGENTS.md files")
+    schedule_parser.add_argument('--force', action='store_true', help="Overwrite manually created AGENTS.md files")
+    args = parser.parse_args()
+
+    if args.command == 'schedule':
+        schedule_main(args)
+    if args.command != 'run':
+        parser.print_help(sys.stderr)
+        sys.exit(1)
+    if not args.folder_path:
+        print("Error: Target folder path required", file=sys.stderr)
+        print("Usage: python agents-md.py run [TARGET_FOLDER_PATH]", file=sys.stderr)
+        sys.exit(1)
+
+    cache_file = None
+    if args.cache or args.cache_file:
+        cache_file = args.cache_file or str(Path(args.output_dir) / f"{Path(args.folder_path).name}_cache.json")
+
+    try:
+        run = run_pipeline(args.folder_path, args.write_json, args.output_dir, cache_file,
+                           generate=not args.no_generate, force=args.force)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error: Pipeline failed: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+    timer = run['timer']
+    if run['status'] == 'manually_created':
+        print(f"Error: {run['existing']['path']} exists and was manually created - not overwritten "
+              f"(use --force to back it up and overwrite)", file=sys.stderr)
+        timer.print_report()
+        sys.exit(2)
+
+    if run['validation'] is not None:
+        run['validation'].print_report()
+        print()
+
+    print(f"Pipeline complete: {args.folder_path}")
+    print(f"  Files: {run['context']['total_files']}  Key concepts: {len(run['context']['key_concepts'])}")
+    generated = run['generated']
+    if generated:
+        print(f"  AGENTS.md generated: {generated['path']} ({generated['lines']} lines)")
+        if generated.get('backup'):
+            print(f"  Backup: {generated['backup']}")
+    elif run['status'] == 'not_exists':
+        print("  AGENTS.md: not found (generation skipped)")
+    for output_file in run['outputs']:
+        print(f"  Wrote: {output_file}")
+    if 'cache' in run:
+        print(f"  Cache: analysis {run['cache']['analysis']}; context {run['cache']['context']}")
+    timer.print_report()
+    sys.exit(0 if run['status'] == 'pass' else 1)
+
+
+def schedule_main(args):
+    """`agents-md.py schedule`: run many folders and report per-status counts."""
+    import sys
+
+    targets = list(args.targets)
+    if args.from_file:
+        try:
+            with open(args.from_file, 'r', encoding='utf-8') as f:
+                targets.extend(f.read().splitlines())
+        except OSError as e:
+            print(f"Error: Cannot read folder list: {e}", file=sys.stderr)
+            sys.exit(1)
+    folders = expand_targets(targets)
+    if not folders:
+        print("Error: No target folders found", file=sys.stderr)
+        print("Usage: python agents-md.py schedule [FOLDER_OR_GLOB ...] [--from-file LIST]", file=sys.stderr)
+        sys.exit(1)
+
+    options = {
+        'write_json': args.write_json,
+        'output_dir': args.output_dir,
+        'cache': args.cache,
+        'generate': not args.no_generate,
+        'force': args.force
+    }
+
+    def progress(done: int, total: int, result: Dict[str, Any]):
+        size_kb = result.get('total_size_bytes', 0) / 1024
+        detail = result.get('error') or ', '.join(result.get('failed_checks', []))
+        print(f"[{done}/{total}] {result['status']:<16} {result['folder']}  "
+              f"({size_kb:.0f} KB, {result['duration'] * 1000:.0f} ms){'  ' + detail if detail else ''}")
+        sys.stdout.flush()
+
+    journal = JobJournal(args.journal, args.resume)
+    try:
+        summary = schedule_folders(folders, options, args.jobs, journal, progress)
+    except KeyboardInterrupt:
+        print(f"Interrupted - finished jobs are in {args.journal}; continue with --resume", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        journal.close()
+
+    counts = ', '.join(f"{count} {status}" for status, count in sorted(summary['counts'].items())) or 'nothing to do'
+    print(f"Schedule complete: {summary['run']} folder(s) run, {summary['skipped']} skipped (journal)")
+    print(f"  Results: {counts}")
+    print(f"  Journal: {args.journal}")
+    print(f"  Duration: {summary['duration']:.2f} s with {args.jobs} job(s)")
+    failed = sum(n for status, n in summary['counts'].items() if status != 'pass')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+agents_md_patch.py - Patch the per-file entries of an existing AGENTS.md
+
+Purpose: Compare a freshly rendered AGENTS.md with the one on disk and keep
+         everything except the entries of files whose frontmatter data
+         changed, so updating one file of a large folder rewrites a handful
+         of lines and prose refined by hand survives
+
+An AGENTS.md is split into plain text and keyed regions whose entries
+belong to one file each:
+    files                frontmatter inventory entries ("  - name: ...")
+    contextual_snippets  frontmatter snippet entries (keyed by "file:")
+    guide                Document Guide blocks ("### N. **name**")
+    tier_list            "**Tier N Files ...**" lists ("- `name` (~...")
+    quick_links          "- **Tier N:** [`name`](name)" lines
+
+A file counts as changed when its `files` or `contextual_snippets`
+frontmatter values differ (or it is new). Changed entries come from the new
+rendering, unchanged ones keep their text on disk, removed files lose
+theirs, and Document Guide blocks are renumbered. Plain text (overview,
+principles) is kept as it is on disk, except lines that differ from the new
+rendering only in their numbers (file counts, word and token totals), which
+are refreshed. When the region layout of the two documents differs (e.g. a
+new template) no patch is possible.
+
+Usage:
+    from agents_md_patch import merge_documents
+
+    merged = merge_documents(old_lines, new_lines)
+    if merged is not None:
+        lines, changes = merged
+"""
+
+import difflib
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+FRONTMATTER_LISTS = ('files', 'contextual_snippets')
+# Frontmatter field that names the file of an entry, per list
+ENTRY_KEYS = {'files': 'name', 'contextual_snippets': 'file'}
+
+FRONTMATTER_LIST = re.compile(r'^(files|contextual_snippets):\s*$')
+GUIDE_HEADING = re.compile(r'^### (\d+)\. \*\*(.+?)\*\*')
+TIER_HEADER = re.compile(r'^\*\*Tier [123] Files\b')
+TIER_LINE = re.compile(r'^- `([^`]+)` \(~')
+QUICK_LINK = re.compile(r'^- \*\*Tier \d:\*\* \[`([^`]+)`\]')
+GUIDE_SEPARATOR = ['', '---', '']
+EMPTY_TIER = '- None'
+NUMBER = re.compile(r'\d[\d,.]*')
+
+# A segment is ('text', lines) or (region, [(key, lines), ...])
+Segment = Tuple[str, Any]
+
+
+def entry_fields(lines: List[str]) -> Dict[str, Any]:
+    """Values of a frontmatter list entry ("  - name: ...", "    tier: 2", ...)."""
+    fields = {}
+    for line in lines:
+        key, sep, value = line.strip().lstrip('- ').partition(':')
+        if not sep:
+            continue
+        value = value.strip()
+        try:
+            fields[key.strip()] = json.loads(value)
+        except ValueError:
+            fields[key.strip()] = value
+    return fields
+
+
+def _frontmatter_entries(lines: List[str], list_name: str) -> List[Tuple[str, List[str]]]:
+    entries = []
+    for line in lines:
+        if line.startswith('  - ') or not entries:
+            entries.append([line])
+        else:
+            entries[-1].append(line)
+    keyed = []
+    for position, entry in enumerate(entries):
+        key = entry_fields(entry).get(ENTRY_KEYS[list_name])
+        keyed.append((key if isinstance(key, str) else f'#{position}', entry))
+    return keyed
+
+
+def _guide_entries(lines: List[str], start: int) -> Tuple[List[Tuple[str, List[str]]], int]:
+    """Document Guide blocks from lines[start]; returns the entries and the end index."""
+    entries = []
+    i = start
+    while True:
+        block_start = i
+        i += 1
+        while i < len(lines) and lines[i].strip() != '---' and not GUIDE_HEADING.match(lines[i]):
+            i += 1
+        block = lines[block_start:i]
+        while block and not block[-1].strip():
+            block.pop()
+        entries.append((GUIDE_HEADING.match(block[0]).group(2), block))
+        if i < len(lines) and GUIDE_HEADING.match(lines[i]):
+            continue
+        following = i + 1
+        while following < len(lines) and not lines[following].strip():
+            following += 1
+        if i < len(lines) and following < len(lines) and GUIDE_HEADING.match(lines[following]):
+            i = following
+            continue
+        return entries, block_start + len(block)
+
+
+def split_document(lines: List[str]) -> List[Segment]:
+    """Split AGENTS.md lines into plain text and keyed per-file regions."""
+    segments = []
+    text = []
+
+    def region(name: str, entries: List[Tuple[str, List[str]]]):
+        segments.append(('text', text[:]))
+        segments.append((name, entries))
+        text.clear()
+
+    i = 0
+    frontmatter_end = 0
+    if lines and lines[0].strip() == '---':
+        frontmatter_end = next((j for j in range(1, len(lines)) if lines[j].strip() == '---'), 0)
+    while i < len(lines):
+        line = lines[i]
+        list_start = FRONTMATTER_LIST.match(line) if i < frontmatter_end else None
+        if list_start:
+            name = list_start.group(1)
+            text.append(line)
+            i += 1
+            start = i
+            while i < frontmatter_end and lines[i].startswith((' ', '\t')):
+                i += 1
+            region(name, _frontmatter_entries(lines[start:i], name))
+        elif i > frontmatter_end and GUIDE_HEADING.match(line):
+            entries, i = _guide_entries(lines, i)
+            region('guide', entries)
+        elif i > frontmatter_end and TIER_HEADER.match(line):
+            text.append(line)
+            i += 1
+            start = i
+            while i < len(lines) and lines[i].startswith('- '):
+                i += 1
+            items = lines[start:i]
+            if items == [EMPTY_TIER]:
+                items = []
+            if not all(TIER_LINE.match(item) for item in items):
+                text.extend(lines[start:i])
+                continue
+            region('tier_list', [(TIER_LINE.match(item).group(1), [item]) for item in items])
+        elif i > frontmatter_end and QUICK_LINK.match(line):
+            start = i
+            while i < len(lines) and QUICK_LINK.match(lines[i]):
+                i += 1
+            region('quick_links', [(QUICK_LINK.match(item).group(1), [item]) for item in lines[start:i]])
+        else:
+            text.append(line)
+            i += 1
+    segments.append(('text', text))
+    return segments
+
+
+def file_fields(segments: List[Segment]) -> Dict[str, Dict[str, Any]]:
+    """Frontmatter values per file: {name: {'files': {...}, 'contextual_snippets': {...}}}."""
+    fields = {}
+    for name, entries in segments:
+        if name in FRONTMATTER_LISTS:
+            for key, lines in entries:
+                fields.setdefault(key, {})[name] = entry_fields(lines)
+    return fields
+
+
+def join_region(name: str, entries: List[List[str]]) -> List[str]:
+    lines = []
+    if name == 'guide':
+        for index, entry in enumerate(entries, 1):
+            if index > 1:
+                lines.extend(GUIDE_SEPARATOR)
+            lines.append(GUIDE_HEADING.sub(lambda m: f'### {index}. **{m.group(2)}**', entry[0], count=1))
+            lines.extend(entry[1:])
+        return lines
+    for entry in entries:
+        lines.extend(entry)
+    if name == 'tier_list' and not lines:
+        lines.append(EMPTY_TIER)
+    return lines
+
+
+def merge_text(old: List[str], new: List[str]) -> List[str]:
+    """Old plain text with the lines whose numbers changed taken from new."""
+    merged = []
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    for op, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if op == 'replace' and old_end - old_start == new_end - new_start:
+            merged.extend(new_line if NUMBER.sub('#', old_line) == NUMBER.sub('#', new_line) else old_line
+                          for old_line, new_line in zip(old[old_start:old_end], new[new_start:new_end]))
+        else:
+            merged.extend(old[old_start:old_end])
+    return merged
+
+
+def merge_documents(old_lines: List[str],
+                    new_lines: List[str]) -> Optional[Tuple[List[str], Dict[str, List[str]]]]:
+    """Patch old_lines with the entries of changed files from new_lines.
+
+    Returns (merged lines, {'changed': [...], 'added': [...], 'removed': [...]})
+    or None when the two documents do not have the same region layout.
+    """
+    old_segments = split_document(old_lines)
+    new_segments = split_document(new_lines)
+    if [name for name, _ in old_segments] != [name for name, _ in new_segments]:
+        return None
+
+    old_fields = file_fields(old_segments)
+    new_fields = file_fields(new_segments)
+    changed = {key for key, fields in new_fields.items() if old_fields.get(key) != fields}
+    changes = {
+        'changed': sorted(key for key in changed if key in old_fields),
+        'added': sorted(key for key in changed if key not in old_fields),
+        'removed': sorted(key for key in old_fields if key not in new_fields)
+    }
+
+    merged = []
+    for (name, old), (_, new) in zip(old_segments, new_segments):
+        if name == 'text':
+            merged.extend(merge_text(old, new))
+            continue
+        kept = dict(old)
+        entries = [lines if key in changed or key not in kept else kept[key] for key, lines in new]
+        merged.extend(join_region(name, entries))
+    return merged, changes
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+analysis_cache.py - Incremental cache for analysis and context records
+
+Purpose: Persist per-file analysis/context results in a compact JSON index
+         (`<folder>_cache.json`, next to `<folder>_analysis.json`) so files
+         whose size/mtime or content hash are unchanged are not re-analyzed
+
+Each phase uses its own namespace ("analysis", "context") tagged with the
+phase's version string; bumping the version drops that namespace's entries.
+Values holding stat-derived fields (e.g. a modification date) pass a
+`refresh` callable, applied when a file's mtime changed but its content did
+not.
+lookup() may run in several threads at once (overlapped reads); store() and
+save() belong to the thread that consumes the results.
+
+Usage:
+    from analysis_cache import AnalysisCache
+
+    cache = AnalysisCache('docs_cache.json', 'analysis', ANALYZER_VERSION)
+    record = cache.lookup(path)
+    if record is None:
+        record = analyze_file(path)
+        cache.store(path, record, record['content_hash'])
+    cache.save()
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+CACHE_FORMAT = 1
+
+
+def hash_bytes(data: bytes) -> str:
+    """Content hash used for cache validation."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(file_path: Path) -> str:
+    """Hash a file's raw bytes (same digest as hash_bytes, read in chunks)."""
+    hasher = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class AnalysisCache:
+    """Per-file result cache keyed on (size, mtime) with a content-hash fallback."""
+
+    def __init__(self, cache_file: str, namespace: str, version: str,
+                 refresh: Optional[Callable[[Any, os.stat_result], Any]] = None):
+        self.cache_file = Path(cache_file)
+        self.namespace = namespace
+        self.version = version
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self.rehashed = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._data = self._load()
+        section = self._data['namespaces'].get(namespace)
+        if not section or section.get('version') != version:
+            # Extractor changed (or first run) - discard stale entries
+            section = {'version': version, 'entries': {}}
+            self._data['namespaces'][namespace] = section
+        self._entries = section['entries']
+
+    def _load(self) -> Dict[str, Any]:
+        """Load the cache file, starting empty if missing or unreadable."""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('format') == CACHE_FORMAT and isinstance(data.get('namespaces'), dict):
+                return data
+        except (OSError, ValueError):
+            pass
+        return {'format': CACHE_FORMAT, 'namespaces': {}}
+
+    @staticmethod
+    def key(file_path: Path) -> str:
+        return str(Path(file_path).resolve())
+
+    def lookup(self, file_path: Path) -> Optional[Any]:
+        """Return the cached value for file_path, or None on a miss.
+
+        A matching size and mtime is a hit without reading the file. If the
+        stat differs but the content hash still matches, the entry is
+        refreshed (its value through `refresh`) and counted as a hit.
+        """
+        key = self.key(file_path)
+        self._seen.add(key)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._count(False)
+            return None
+
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            self._count(False)
+            return None
+
+        if entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            self._count(True)
+            return entry['value']
+
+        if entry['size'] == stat.st_size:
+            try:
+                content_hash = hash_file(file_path)
+            except OSError:
+                content_hash = None
+            if content_hash == entry['hash']:
+                entry['mtime_ns'] = stat.st_mtime_ns
+                if self.refresh is not None:
+                    entry['value'] = self.refresh(entry['value'], stat)
+                self._count(True, rehashed=True)
+                return entry['value']
+
+        self._count(False)
+        return None
+
+    def _count(self, hit: bool, rehashed: bool = False):
+        """Update the hit/miss counters (lookups may run in several threads)."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+                if rehashed:
+                    self.rehashed += 1
+            else:
+                self.misses += 1
+
+    def store(self, file_path: Path, value: Any, content_hash: Optional[str] = None):
+        """Record a freshly computed value for file_path."""
+        key = self.key(file_path)
+        self._seen.add(key)
+        try:
+            stat = os.stat(file_path)
+            if content_hash is None:
+                content_hash = hash_file(file_path)
+        except OSError:
+            return
+        self._entries[key] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'hash': content_hash,
+            'value': value
+        }
+
+    def save(self, prune: bool = True):
+        """Write the cache atomically; by default drop entries not seen this run."""
+        if prune:
+            for key in [k for k in self._entries if k not in self._seen]:
+                del self._entries[key]
+        tmp_file = self.cache_file.with_name(self.cache_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_file, self.cache_file)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for reporting."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'rehashed': self.rehashed,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0
+        }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        return (f"{stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate'] * 100:.1f}% hit rate)")
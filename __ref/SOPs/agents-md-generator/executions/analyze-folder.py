@@ -3,10 +3,42 @@
 analyze-folder.py - Deep analysis of folder structure and files
 
 Purpose: Extract file metadata, structure, relationships, and file types
-Output: JSON file with file analysis results
+Output: JSON file with file analysis results, including groups of duplicate
+        files ("duplicates"; near duplicates with --near-duplicates, see
+        near_duplicates.py) and the graph of links between markdown files
+        ("link_graph": adjacency arrays and PageRank centrality, see
+        link_graph.py; with --recursive it spans the whole tree)
 
 Usage:
     python analyze-folder.py [TARGET_FOLDER_PATH]
+    python analyze-folder.py [TARGET_FOLDER_PATH] --recursive [--workers N] [--executor process|thread] [--combined]
+    python analyze-folder.py [TARGET_FOLDER_PATH] --cache [--cache-file PATH]
+    python analyze-folder.py [TARGET_FOLDER_PATH] --format ndjson|columnar
+    python analyze-folder.py [TARGET_FOLDER_PATH] --large-file-mb 8 --sniff-kb 256
+    python analyze-folder.py [TARGET_FOLDER_PATH] --near-duplicates
+    python analyze-folder.py [TARGET_FOLDER_PATH] --in-flight 32
+
+    --recursive  Walk the whole tree below TARGET_FOLDER_PATH and analyze
+                 every folder that contains markdown files
+    --workers    Number of parallel workers for file analysis (default: 1)
+    --executor   Worker pool type: "process" (default) or "thread"
+    --combined   Write one combined analysis for the whole tree instead of
+                 one analysis file per folder
+    --cache      Reuse results for unchanged files from an incremental cache
+                 (default: [TARGET_FOLDER]_cache.json, shared with extract-context.py)
+    --format     "json" (default) writes [TARGET_FOLDER]_analysis.json; "ndjson"
+                 streams one compact record per file to [TARGET_FOLDER]_analysis.ndjson
+                 followed by a summary record; "columnar" writes the compact,
+                 memory-mappable [TARGET_FOLDER]_analysis.mdcol (see
+                 columnar_store.py; both single folder only)
+    --large-file-mb  Files above this size (default: 8) are streamed in chunks:
+                 counts and headings cover the whole file, everything else
+                 is sniffed from the first --sniff-kb KB (default: 256)
+    --near-duplicates  Store a MinHash signature per file and group edited
+                 copies too (identical files are always grouped)
+    --in-flight  Files read at the same time (default: 1). Raise it on NFS/SMB
+                 shares where per-file latency, not CPU, dominates; with
+                 --recursive use --workers instead
 
 Exit codes:
     0 = Success
@@ -15,37 +47,28 @@ Exit codes:
 
 import os
 import json
-import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any
-
-
-def count_words(text: str) -> int:
-    """Count words in text (simple whitespace-based count)."""
-    return len(text.split())
+from functools import partial
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 
+from analysis_cache import AnalysisCache
+from async_reader import IN_FLIGHT, read_ahead
+from columnar_store import COLUMNAR_SUFFIX, write_columnar
+from link_graph import build_link_graph, extract_links, folder_view
+from md_document import MarkdownDocument, configure_reading, read_document, reading_config
+from near_duplicates import find_duplicate_groups, minhash_signature
 
-def extract_frontmatter(content: str) -> Dict[str, Any]:
-    """Extract YAML frontmatter from markdown file."""
-    frontmatter = {}
-    if content.startswith('---'):
-        parts = content.split('---', 2)
-        if len(parts) >= 3:
-            yaml_content = parts[1].strip()
-            # Simple YAML parsing (basic key-value pairs)
-            for line in yaml_content.split('\n'):
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    key = key.strip()
-                    value = value.strip().strip('"').strip("'")
-                    frontmatter[key] = value
-    return frontmatter
+# Bump when the analysis record format or logic changes (invalidates caches)
+ANALYZER_VERSION = '1.3.0'
 
 
 def identify_file_type(filename: str, content: str) -> str:
     """Identify file type based on filename and content."""
     filename_lower = filename.lower()
+    # Only the start of the content is sniffed; lowercase just that once
+    head_lower = content[:1000].lower()
     
     # Check filename patterns
     if 'readme' in filename_lower:
@@ -56,7 +79,7 @@ def identify_file_type(filename: str, content: str) -> str:
         return 'template'
     elif 'guide' in filename_lower:
         return 'guide'
-    elif 'example' in filename_lower or 'example' in content.lower()[:500]:
+    elif 'example' in filename_lower or 'example' in head_lower[:500]:
         return 'example'
     elif 'sop' in filename_lower:
         return 'sop'
@@ -70,62 +93,70 @@ def identify_file_type(filename: str, content: str) -> str:
         return 'attachment'
     else:
         # Check content for clues
-        content_lower = content.lower()[:1000]
-        if 'overview' in content_lower or 'introduction' in content_lower:
+        if 'overview' in head_lower or 'introduction' in head_lower:
             return 'overview'
-        elif 'execution' in content_lower or 'step' in content_lower:
+        elif 'execution' in head_lower or 'step' in head_lower:
             return 'execution-guide'
         else:
             return 'documentation'
 
 
-def extract_headings(content: str) -> List[str]:
-    """Extract markdown headings from content."""
-    headings = []
-    for line in content.split('\n'):
-        if line.strip().startswith('#'):
-            # Remove markdown heading markers
-            heading = re.sub(r'^#+\s*', '', line.strip())
-            headings.append(heading)
-    return headings[:10]  # Limit to first 10 headings
+def analyze_file(file_path: Path, documents: Optional[Dict[str, MarkdownDocument]] = None,
+                 near_duplicates: bool = False) -> Dict[str, Any]:
+    """Analyze a single markdown file.
 
-
-def analyze_file(file_path: Path) -> Dict[str, Any]:
-    """Analyze a single markdown file."""
+    If `documents` is given, the parsed document record is stored in it
+    (keyed by file name) so later phases can reuse it without re-reading.
+    With `near_duplicates`, the record also gets a MinHash signature.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        doc = read_document(file_path)
     except Exception as e:
         return {
             'error': f"Cannot read file: {str(e)}",
             'name': file_path.name
         }
     
-    # Get file stats
-    stat = file_path.stat()
-    
-    # Extract metadata
-    frontmatter = extract_frontmatter(content)
-    word_count = count_words(content)
-    file_type = identify_file_type(file_path.name, content)
-    headings = extract_headings(content)
+    if documents is not None:
+        documents[doc.name] = doc
     
-    return {
-        'name': file_path.name,
+    return analyze_document(doc, near_duplicates)
+
+
+def refresh_mtime(record: Dict[str, Any], stat: os.stat_result) -> Dict[str, Any]:
+    """Cached record of a file touched without changing (AnalysisCache refresh hook)."""
+    return dict(record, last_modified=datetime.fromtimestamp(stat.st_mtime).isoformat())
+
+
+def analyze_document(doc: MarkdownDocument, near_duplicates: bool = False) -> Dict[str, Any]:
+    """Build the analysis record for an already parsed document."""
+    file_path = doc.path
+    record = {
+        'name': doc.name,
         'path': str(file_path.relative_to(file_path.parent.parent)),
-        'size_bytes': stat.st_size,
-        'word_count': word_count,
-        'last_modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-        'file_type': file_type,
-        'has_frontmatter': len(frontmatter) > 0,
-        'frontmatter': frontmatter,
-        'headings': headings,
-        'line_count': len(content.split('\n'))
+        'size_bytes': doc.size_bytes,
+        'word_count': doc.word_count,
+        'last_modified': datetime.fromtimestamp(doc.mtime).isoformat(),
+        'file_type': identify_file_type(doc.name, doc.content),
+        'has_frontmatter': len(doc.frontmatter) > 0,
+        'frontmatter': doc.frontmatter,
+        'headings': doc.headings[:10],  # Limit to first 10 headings
+        'line_count': doc.line_count,
+        'content_hash': doc.content_hash,
+        'links': extract_links(doc.content)
     }
+    if near_duplicates:
+        record['minhash'] = minhash_signature(doc.content)
+    return record
+
+
+def analysis_version(near_duplicates: bool = False) -> str:
+    """Cache version of the analysis records (signatures change the records)."""
+    return f"{ANALYZER_VERSION}+minhash" if near_duplicates else ANALYZER_VERSION
 
 
-def analyze_folder(folder_path: str) -> Dict[str, Any]:
-    """Analyze folder structure and all markdown files."""
+def check_folder(folder_path: str) -> Path:
+    """Return folder_path as a Path, raising if it is not a directory."""
     folder = Path(folder_path)
     
     if not folder.exists():
@@ -134,21 +165,120 @@ def analyze_folder(folder_path: str) -> Dict[str, Any]:
     if not folder.is_dir():
         raise ValueError(f"Path is not a directory: {folder_path}")
     
+    return folder
+
+
+def list_markdown_files(folder: Path) -> List[Path]:
+    """Sorted markdown files of a folder, excluding AGENTS.md."""
     # Find all markdown files
     markdown_files = list(folder.glob('*.md'))
     
     if not markdown_files:
-        raise ValueError(f"No markdown files found in: {folder_path}")
+        raise ValueError(f"No markdown files found in: {folder}")
+    
+    # Skip AGENTS.md if it already exists (don't analyze output)
+    return [md_file for md_file in sorted(markdown_files) if md_file.name != 'AGENTS.md']
+
+
+def iter_folder_files(markdown_files: List[Path], documents: Optional[Dict[str, MarkdownDocument]] = None,
+                      cache: Optional[AnalysisCache] = None, near_duplicates: bool = False,
+                      in_flight: int = IN_FLIGHT) -> Iterator[Dict[str, Any]]:
+    """Yield the analysis record of each file as it is produced.
+    
+    With `in_flight` > 1, up to that many files are looked up in the cache
+    and read at the same time (see async_reader.py); records are still
+    yielded in file order.
+    """
+    def analyze(md_file: Path) -> Tuple[Dict[str, Any], bool]:
+        cached = cache.lookup(md_file) if cache else None
+        if cached is not None:
+            return cached, True
+        return analyze_file(md_file, documents, near_duplicates), False
+    
+    for md_file, (file_data, hit) in read_ahead(markdown_files, analyze, in_flight):
+        if not hit and cache and 'error' not in file_data:
+            cache.store(md_file, file_data, file_data['content_hash'])
+        yield file_data
+
+
+def analyze_folder(folder_path: str, documents: Optional[Dict[str, MarkdownDocument]] = None,
+                   cache: Optional[AnalysisCache] = None, near_duplicates: bool = False,
+                   in_flight: int = IN_FLIGHT) -> Dict[str, Any]:
+    """Analyze folder structure and all markdown files.
+
+    Pass a dict as `documents` to collect the parsed document records;
+    extract_context() accepts the same dict and then skips re-reading files.
+    With a `cache`, files unchanged since the last run are not re-read; its
+    version must be analysis_version(near_duplicates).
+    With `near_duplicates`, duplicate groups also include edited copies.
+    `in_flight` > 1 overlaps the reads of that many files (slow or network
+    filesystems).
+    """
+    folder = check_folder(folder_path)
+    markdown_files = list_markdown_files(folder)
     
     # Analyze each file
-    files = []
-    for md_file in sorted(markdown_files):
-        # Skip AGENTS.md if it already exists (don't analyze output)
-        if md_file.name == 'AGENTS.md':
-            continue
-        file_data = analyze_file(md_file)
-        files.append(file_data)
+    files = list(iter_folder_files(markdown_files, documents, cache, near_duplicates, in_flight))
+    
+    return summarize_folder(folder, files)
+
+
+def write_analysis_ndjson(folder_path: str, output_file: str, cache: Optional[AnalysisCache] = None,
+                          near_duplicates: bool = False, in_flight: int = IN_FLIGHT) -> Dict[str, Any]:
+    """Stream the folder analysis to `output_file` as NDJSON.
+    
+    Writes a header record, one compact record per file as it is analyzed,
+    and a trailing summary record with the folder statistics, so memory use
+    does not grow with the number of files. Returns the summary record.
+    """
+    folder = check_folder(folder_path)
+    markdown_files = list_markdown_files(folder)
+    file_count = total_words = total_size = 0
+    # Just what duplicate grouping and the link graph need, so memory stays small
+    fingerprints = []
+    names = []
+    links = []
     
+    with open(output_file, 'w', encoding='utf-8') as f:
+        header = {
+            'record': 'header',
+            'folder_path': str(folder.absolute()),
+            'folder_name': folder.name,
+            'analysis_date': datetime.now().isoformat()
+        }
+        f.write(json.dumps(header, ensure_ascii=False, separators=(',', ':')) + '\n')
+        for file_data in iter_folder_files(markdown_files, cache=cache, near_duplicates=near_duplicates,
+                                           in_flight=in_flight):
+            f.write(json.dumps(dict(file_data, record='file'), ensure_ascii=False, separators=(',', ':')) + '\n')
+            file_count += 1
+            total_words += file_data.get('word_count', 0)
+            total_size += file_data.get('size_bytes', 0)
+            names.append(file_data['name'])
+            links.append(file_data.get('links', []))
+            if 'error' not in file_data:
+                fingerprints.append({k: file_data.get(k) for k in
+                                     ('name', 'content_hash', 'minhash', 'last_modified')})
+        summary = {
+            'record': 'summary',
+            'file_count': file_count,
+            'total_words': total_words,
+            'total_size_bytes': total_size,
+            'duplicates': find_duplicate_groups(fingerprints),
+            'link_graph': build_link_graph(names, links)
+        }
+        f.write(json.dumps(summary, ensure_ascii=False, separators=(',', ':')) + '\n')
+    
+    return summary
+
+
+def summarize_folder(folder: Path, files: List[Dict[str, Any]], key: str = 'name',
+                     link_graph: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build the folder-level analysis dict from per-file results.
+    
+    Duplicate groups and link graph nodes identify files by `key` ('path'
+    when files come from several folders). A `link_graph` built elsewhere
+    (the folder's view of a tree graph) is used as it is.
+    """
     # Calculate folder statistics
     total_words = sum(f.get('word_count', 0) for f in files)
     total_size = sum(f.get('size_bytes', 0) for f in files)
@@ -160,34 +290,277 @@ def analyze_folder(folder_path: str) -> Dict[str, Any]:
         'file_count': len(files),
         'total_words': total_words,
         'total_size_bytes': total_size,
-        'files': files
+        'files': files,
+        'duplicates': find_duplicate_groups(files, key),
+        'link_graph': link_graph if link_graph is not None else
+                      build_link_graph([f[key] for f in files], [f.get('links', []) for f in files])
+    }
+
+
+def scan_markdown_tree(root: Path) -> List[Tuple[Path, List[Path]]]:
+    """Walk `root` with os.scandir and collect markdown files per folder.
+    
+    Returns (folder, files) pairs for every folder that has at least one
+    markdown file besides AGENTS.md. Folders and files are sorted by name so
+    the result does not depend on directory listing order. Hidden folders
+    and symlinked folders are skipped.
+    """
+    result = []
+    pending = [root]
+    while pending:
+        folder = pending.pop()
+        md_files = []
+        subfolders = []
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith('.'):
+                            subfolders.append(entry.name)
+                    elif entry.name.endswith('.md') and entry.name != 'AGENTS.md' and entry.is_file():
+                        md_files.append(entry.name)
+        except OSError:
+            continue
+        if md_files:
+            result.append((folder, [folder / name for name in sorted(md_files)]))
+        # Push in reverse so folders are visited in sorted (pre-order) order
+        for name in sorted(subfolders, reverse=True):
+            pending.append(folder / name)
+    return result
+
+
+def map_files(paths: List[Path], workers: int = 1, executor: str = 'process',
+              near_duplicates: bool = False) -> List[Dict[str, Any]]:
+    """Run analyze_file() over `paths`, optionally in a worker pool.
+    
+    Results are returned in the order of `paths` regardless of worker count.
+    """
+    analyze = partial(analyze_file, near_duplicates=near_duplicates)
+    if workers <= 1 or len(paths) <= 1:
+        return [analyze(p) for p in paths]
+    
+    if executor == 'thread':
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(analyze, paths))
+    elif executor == 'process':
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=configure_reading,
+                                 initargs=reading_config()) as pool:
+            return list(pool.map(analyze, paths, chunksize=chunksize))
+    else:
+        raise ValueError(f"Unknown executor: {executor} (expected 'process' or 'thread')")
+
+
+def analyze_tree(root_path: str, workers: int = 1, executor: str = 'process', combined: bool = False,
+                 cache: Optional[AnalysisCache] = None, near_duplicates: bool = False) -> Dict[str, Any]:
+    """Recursively analyze every folder with markdown files below root_path.
+    
+    All files of the tree are fanned out over a single worker pool. With
+    `combined=False` the result holds one analysis per folder under
+    'folders'; with `combined=True` all files are merged into one analysis
+    whose file 'path' entries are relative to the root. With a `cache`,
+    only changed files are sent to the pool.
+    """
+    root = check_folder(root_path)
+    tree = scan_markdown_tree(root)
+    
+    if not tree:
+        raise ValueError(f"No markdown files found in: {root_path}")
+    
+    all_paths = [p for _, paths in tree for p in paths]
+    if cache:
+        all_files = [cache.lookup(p) for p in all_paths]
+        stale = [i for i, f in enumerate(all_files) if f is None]
+        fresh = map_files([all_paths[i] for i in stale], workers, executor, near_duplicates)
+        for i, file_data in zip(stale, fresh):
+            all_files[i] = file_data
+            if 'error' not in file_data:
+                cache.store(all_paths[i], file_data, file_data['content_hash'])
+        # Records are shared with the cache; keep its copies root-independent
+        all_files = [dict(f) for f in all_files]
+    else:
+        all_files = map_files(all_paths, workers, executor, near_duplicates)
+    
+    # One link graph for the whole tree, so links between folders count
+    keys = [path.relative_to(root).as_posix() for path in all_paths]
+    graph = build_link_graph(keys, [f.get('links', []) for f in all_files])
+    
+    if combined:
+        for key, file_data in zip(keys, all_files):
+            file_data['path'] = key
+        analysis = summarize_folder(root, all_files, key='path', link_graph=graph)
+        analysis['recursive'] = True
+        analysis['folder_count'] = len(tree)
+        return analysis
+    
+    folders = []
+    offset = 0
+    for folder, paths in tree:
+        relative_path = folder.relative_to(root).as_posix()
+        members = range(offset, offset + len(paths))
+        view = folder_view(graph, members, '' if relative_path == '.' else relative_path)
+        folder_analysis = summarize_folder(folder, all_files[offset:offset + len(paths)], link_graph=view)
+        folder_analysis['relative_path'] = relative_path
+        folders.append(folder_analysis)
+        offset += len(paths)
+    
+    return {
+        'root_path': str(root.absolute()),
+        'analysis_date': datetime.now().isoformat(),
+        'folder_count': len(folders),
+        'file_count': len(all_files),
+        'total_words': sum(f['total_words'] for f in folders),
+        'folders': folders,
+        'link_graph': graph
     }
 
 
+def describe_duplicates(groups: List[Dict[str, Any]]) -> str:
+    """"2 groups (3 files could be collapsed)" for the summary line."""
+    return f"{len(groups)} groups ({sum(len(g['duplicates']) for g in groups)} files could be collapsed)"
+
+
+def describe_links(graph: Dict[str, Any]) -> str:
+    """"42 between 17 files (most linked: README.md), 2 broken" for the summary line."""
+    offsets = graph['offsets']
+    linked = set(graph['targets']).union(i for i in range(len(graph['nodes'])) if offsets[i + 1] > offsets[i])
+    text = f"{len(graph['targets'])} between {len(linked)} files"
+    if graph['targets'] and graph.get('centrality'):
+        top = max(range(len(graph['nodes'])), key=graph['centrality'].__getitem__)
+        text += f" (most linked: {graph['nodes'][top]})"
+    if graph.get('broken_links'):
+        text += f", {len(graph['broken_links'])} broken"
+    return text
+
+
+def folder_output_name(root: Path, relative_path: str) -> str:
+    """Output file name for one folder of a recursive analysis."""
+    if relative_path in ('', '.'):
+        return f"{root.name}_analysis.json"
+    return f"{root.name}__{relative_path.replace('/', '__')}_analysis.json"
+
+
 def main():
     """Main execution function."""
     import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Deep analysis of folder structure and files")
+    parser.add_argument('folder_path', nargs='?', metavar='TARGET_FOLDER_PATH')
+    parser.add_argument('--recursive', action='store_true',
+                        help="Analyze every folder with markdown files below the target")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of parallel workers (default: 1)")
+    parser.add_argument('--executor', choices=['process', 'thread'], default='process',
+                        help="Worker pool type (default: process)")
+    parser.add_argument('--combined', action='store_true',
+                        help="With --recursive, write one combined analysis file")
+    parser.add_argument('--cache', action='store_true',
+                        help="Reuse results for unchanged files from an incremental cache")
+    parser.add_argument('--cache-file', metavar='PATH',
+                        help="Cache file (default: [TARGET_FOLDER]_cache.json)")
+    parser.add_argument('--format', choices=['json', 'ndjson', 'columnar'], default='json',
+                        help="Output format (default: json)")
+    parser.add_argument('--near-duplicates', action='store_true',
+                        help="Also group edited copies (MinHash signatures), not just identical files")
+    parser.add_argument('--in-flight', type=int, default=IN_FLIGHT, metavar='N',
+                        help=f"Files read at the same time, for slow or network filesystems (default: {IN_FLIGHT})")
+    parser.add_argument('--large-file-mb', type=float, metavar='MB',
+                        help="Stream files larger than this (default: 8)")
+    parser.add_argument('--sniff-kb', type=int, metavar='KB',
+                        help="Content kept from streamed files for sniffing (default: 256)")
+    args = parser.parse_args()
     
-    if len(sys.argv) < 2:
+    if not args.folder_path:
         print("Error: Target folder path required", file=sys.stderr)
         print("Usage: python analyze-folder.py [TARGET_FOLDER_PATH]", file=sys.stderr)
         sys.exit(1)
     
-    folder_path = sys.argv[1]
+    if args.recursive and args.format != 'json':
+        print(f"Error: --format {args.format} is not supported with --recursive", file=sys.stderr)
+        sys.exit(1)
+    
+    folder_path = args.folder_path
+    
+    configure_reading(
+        large_file_bytes=int(args.large_file_mb * 1024 * 1024) if args.large_file_mb else None,
+        sniff_chars=args.sniff_kb * 1024 if args.sniff_kb else None
+    )
+    
+    cache = None
+    if args.cache or args.cache_file:
+        cache_file = args.cache_file or f"{Path(folder_path).name}_cache.json"
+        cache = AnalysisCache(cache_file, 'analysis', analysis_version(args.near_duplicates),
+                              refresh=refresh_mtime)
     
     try:
-        analysis = analyze_folder(folder_path)
+        if args.recursive:
+            root = Path(folder_path)
+            analysis = analyze_tree(folder_path, args.workers, args.executor, args.combined, cache,
+                                    args.near_duplicates)
+            if cache:
+                cache.save()
+            
+            if args.combined:
+                outputs = [(f"{root.name}_analysis.json", analysis)]
+            else:
+                outputs = [(folder_output_name(root, f['relative_path']), f)
+                           for f in analysis['folders']]
+            
+            for output_file, data in outputs:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+            
+            print(f"Recursive analysis complete: {len(outputs)} file(s) written")
+            print(f"  Folders analyzed: {analysis['folder_count']}")
+            print(f"  Files analyzed: {analysis['file_count']}")
+            print(f"  Total words: {analysis['total_words']}")
+            groups = analysis['duplicates'] if args.combined else [
+                g for f in analysis['folders'] for g in f['duplicates']]
+            print(f"  Duplicates: {describe_duplicates(groups)}")
+            print(f"  Links: {describe_links(analysis['link_graph'])}")
+            if cache:
+                print(f"  Cache: {cache.summary()}")
+            sys.exit(0)
         
-        # Output JSON to file
-        folder_name = Path(folder_path).name
-        output_file = f"{folder_name}_analysis.json"
+        if args.format == 'ndjson':
+            output_file = f"{Path(folder_path).name}_analysis.ndjson"
+            summary = write_analysis_ndjson(folder_path, output_file, cache, args.near_duplicates,
+                                            args.in_flight)
+            if cache:
+                cache.save()
+            
+            print(f"Analysis complete: {output_file}")
+            print(f"  Files analyzed: {summary['file_count']}")
+            print(f"  Total words: {summary['total_words']}")
+            print(f"  Duplicates: {describe_duplicates(summary['duplicates'])}")
+            print(f"  Links: {describe_links(summary['link_graph'])}")
+            if cache:
+                print(f"  Cache: {cache.summary()}")
+            sys.exit(0)
+        
+        analysis = analyze_folder(folder_path, cache=cache, near_duplicates=args.near_duplicates,
+                                  in_flight=args.in_flight)
+        if cache:
+            cache.save()
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(analysis, f, indent=2, ensure_ascii=False)
+        # Output JSON (or columnar) to file
+        folder_name = Path(folder_path).name
+        if args.format == 'columnar':
+            output_file = f"{folder_name}_analysis{COLUMNAR_SUFFIX}"
+            write_columnar(output_file, {k: v for k, v in analysis.items() if k != 'files'}, analysis['files'])
+        else:
+            output_file = f"{folder_name}_analysis.json"
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(analysis, f, indent=2, ensure_ascii=False)
         
         print(f"Analysis complete: {output_file}")
         print(f"  Files analyzed: {analysis['file_count']}")
         print(f"  Total words: {analysis['total_words']}")
+        print(f"  Duplicates: {describe_duplicates(analysis['duplicates'])}")
+        print(f"  Links: {describe_links(analysis['link_graph'])}")
+        if cache:
+            print(f"  Cache: {cache.summary()}")
         sys.exit(0)
         
     except FileNotFoundError as e:
@@ -7,59 +7,135 @@ Purpose: Detect existing AGENTS.md files and determine if they were generated by
 
 Usage:
     python check-existing-agents-md.py [TARGET_FOLDER_PATH]
+    python check-existing-agents-md.py [TARGET_FOLDER_PATH] --restore BACKUP_FILE
+    python check-existing-agents-md.py --scan ROOT_PATH [--workers N]
+
+Detection reads only the frontmatter (stopping at the
+`generator: "agents-md-generator/N"` signature that generated files carry)
+plus the first and last 16 KB, so multi-MB files cost the same as small ones.
+
+--scan finds every AGENTS.md below ROOT_PATH (hidden and symlinked folders
+are skipped), checks them on N threads (default: 8) and prints one JSON
+report: per folder its status and generator version, plus status counts.
+
+Backups written before an overwrite are reverse deltas
+(`AGENTS.md.backup.<timestamp>.diff`, a unified diff from the new file back
+to the old one) instead of full copies. --restore rebuilds the version saved
+in BACKUP_FILE by undoing the newer backups one by one (full
+`AGENTS.md.backup.<timestamp>` copies from older versions are used as they
+are), backs up the current file as a delta and writes the restored version.
 
 Exit codes:
     0 = No AGENTS.md exists (safe to proceed)
     1 = AGENTS.md exists and was generated by this tool (can backup and overwrite)
     2 = AGENTS.md exists and was manually created (should not overwrite)
     3 = Error (folder not found, cannot read file)
+
+    With --restore: 0 = restored, 3 = error (unknown backup, broken delta chain)
+    With --scan:    0 = report written, 3 = error (root not found)
 """
 
+import difflib
+import hashlib
 import os
 import sys
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
 
+# Bytes of the body (and of the end of the file) read by the detection
+HEAD_BYTES = 16 * 1024
+# Frontmatter read at most; a generated one holds an entry per file
+FRONTMATTER_LIMIT = 4 * 1024 * 1024
+# Signature written by generate-agents-md.py: generator: "agents-md-generator/1"
+GENERATOR_FIELD = re.compile(r'^generator:\s*["\']?(agents-md-generator)(?:/([\w.+-]+))?["\']?\s*$')
+# "**Generated:** 2025-12-23" footer; bounded so long lines cannot backtrack
+GENERATED_DATE = re.compile(r'Generated[^\n]{0,80}?\d{4}-\d{2}-\d{2}')
+# Threads used by --scan (detection is I/O bound)
+SCAN_WORKERS = 8
 
-def is_generated_by_tool(agents_md_path: Path) -> bool:
-    """Check if AGENTS.md was generated by this tool."""
-    try:
-        with open(agents_md_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Check for tool signature in frontmatter
-        # Look for patterns that indicate tool generation:
-        # 1. "Generated by agents-md-generator" or similar
-        # 2. Specific frontmatter structure
-        # 3. "Progressive Context Loading Protocol" section (tool-specific)
-        
-        # Check frontmatter for tool signature
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 2:
-                frontmatter = parts[1]
-                # Look for tool-specific markers
-                if 'agents-md-generator' in frontmatter.lower():
-                    return True
-                if 'progressive context loading' in frontmatter.lower():
-                    return True
-        
-        # Check for tool-specific sections
-        if '## 🎯 CONTEXT: Progressive Context Loading Protocol' in content:
-            return True
-        if 'Level 1: Front Matter' in content and 'Level 2: AGENTS.md Content' in content:
-            return True
-        
-        # Check for generated timestamp pattern
-        if re.search(r'Generated.*\d{4}-\d{2}-\d{2}', content):
-            return True
-        
-        return False
+BACKUP_PREFIX = 'AGENTS.md.backup.'
+DELTA_SUFFIX = '.diff'
+DELTA_HASH = re.compile(r'sha256:([0-9a-f]{64})')
+DELTA_HUNK = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@')
+NO_NEWLINE = '\\ No newline at end of file\n'
+
+
+def read_head(agents_md_path: Path) -> Dict[str, str]:
+    """The parts of an AGENTS.md the detection looks at, without reading it all.
+    
+    Returns the frontmatter (up to FRONTMATTER_LIMIT bytes), the first
+    HEAD_BYTES of the body and the last HEAD_BYTES of the file. Reading stops
+    at the first line of the frontmatter that carries the generator signature.
+    """
+    head = {'frontmatter': '', 'body': '', 'tail': ''}
+    with open(agents_md_path, 'rb') as f:
+        first = f.readline(FRONTMATTER_LIMIT)
+        if first.strip() == b'---':
+            lines = []
+            size = 0
+            for line in iter(lambda: f.readline(FRONTMATTER_LIMIT), b''):
+                if line.strip() == b'---':
+                    break
+                lines.append(line)
+                size += len(line)
+                if GENERATOR_FIELD.match(line.decode('utf-8', 'replace')) or size >= FRONTMATTER_LIMIT:
+                    head['frontmatter'] = b''.join(lines).decode('utf-8', 'replace')
+                    return head
+            head['frontmatter'] = b''.join(lines).decode('utf-8', 'replace')
+            body = f.read(HEAD_BYTES)
+        else:
+            body = first + f.read(HEAD_BYTES)
+        head['body'] = body.decode('utf-8', 'replace')
+        position = f.tell()
+        end = f.seek(0, os.SEEK_END)
+        if end > position:
+            f.seek(max(end - HEAD_BYTES, position))
+            head['tail'] = f.read().decode('utf-8', 'replace')
+    return head
+
+
+def detect_generator(agents_md_path: Path) -> Dict[str, Any]:
+    """Whether an AGENTS.md was generated by this tool, and by which version.
     
+    Files written by generate-agents-md.py carry `generator: agents-md-generator/N`
+    in their frontmatter. Older files are recognised by the markers this check
+    has always used, looked for in the frontmatter, the first HEAD_BYTES of the
+    body (the protocol section) and the last HEAD_BYTES (the Generated date).
+    Returns {'tool_generated': bool, 'generator': str or None, 'version': str or None}
+    (plus 'error' if the file could not be read).
+    """
+    result = {'tool_generated': False, 'generator': None, 'version': None}
+    try:
+        head = read_head(agents_md_path)
     except Exception as e:
         print(f"Error reading AGENTS.md: {e}", file=sys.stderr)
-        return False
+        result['error'] = str(e)
+        return result
+    
+    for line in head['frontmatter'].splitlines():
+        signature = GENERATOR_FIELD.match(line)
+        if signature:
+            result.update(tool_generated=True, generator=signature.group(1), version=signature.group(2))
+            return result
+    
+    frontmatter = head['frontmatter'].lower()
+    content = head['body']
+    result['tool_generated'] = (
+        'agents-md-generator' in frontmatter
+        or 'progressive context loading' in frontmatter
+        or '## 🎯 CONTEXT: Progressive Context Loading Protocol' in content
+        or ('Level 1: Front Matter' in content and 'Level 2: AGENTS.md Content' in content)
+        or any(GENERATED_DATE.search(part) for part in (content, head['tail']))
+    )
+    return result
+
+
+def is_generated_by_tool(agents_md_path: Path) -> bool:
+    """Check if AGENTS.md was generated by this tool."""
+    return detect_generator(agents_md_path)['tool_generated']
 
 
 def check_existing_agents_md(folder_path: str) -> dict:
@@ -90,15 +166,16 @@ def check_existing_agents_md(folder_path: str) -> dict:
         }
     
     # File exists - check if generated by tool
-    is_tool_generated = is_generated_by_tool(agents_md_path)
+    generator = detect_generator(agents_md_path)
     
-    if is_tool_generated:
+    if generator['tool_generated']:
         return {
             'exists': True,
             'status': 'tool_generated',
             'path': str(agents_md_path),
             'message': 'AGENTS.md exists and was generated by this tool - can backup and overwrite',
-            'can_overwrite': True
+            'can_overwrite': True,
+            'generator_version': generator['version']
         }
     else:
         return {
@@ -110,10 +187,88 @@ def check_existing_agents_md(folder_path: str) -> dict:
         }
 
 
+def find_agents_md(root: Path) -> Iterator[Path]:
+    """Every AGENTS.md below root, in sorted folder order (hidden and symlinked folders skipped)."""
+    pending = [root]
+    while pending:
+        folder = pending.pop()
+        subfolders = []
+        found = False
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith('.'):
+                            subfolders.append(entry.name)
+                    elif entry.name == 'AGENTS.md' and entry.is_file():
+                        found = True
+        except OSError:
+            continue
+        if found:
+            yield folder / 'AGENTS.md'
+        pending.extend(folder / name for name in sorted(subfolders, reverse=True))
+
+
+def scan_tree(root_path: str, workers: int = SCAN_WORKERS) -> Dict[str, Any]:
+    """Check every AGENTS.md below root_path in parallel; one report for the tree."""
+    root = Path(root_path)
+    if not root.is_dir():
+        return {'status': 'error', 'error': f"Folder not found: {root_path}"}
+    
+    def check(path: Path) -> Dict[str, Any]:
+        generator = detect_generator(path)
+        entry = {
+            'folder': path.parent.relative_to(root).as_posix(),
+            'status': 'tool_generated' if generator['tool_generated'] else 'manually_created',
+            'generator_version': generator['version']
+        }
+        if 'error' in generator:
+            entry.update(status='error', error=generator['error'])
+        return entry
+    
+    paths = list(find_agents_md(root))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        entries = list(pool.map(check, paths))
+    
+    counts = {}
+    for entry in entries:
+        counts[entry['status']] = counts.get(entry['status'], 0) + 1
+    return {
+        'status': 'scanned',
+        'root_path': str(root.absolute()),
+        'scan_date': datetime.now().isoformat(),
+        'agents_md_count': len(entries),
+        'counts': counts,
+        'folders': entries
+    }
+
+
+def scan_main(args: List[str]):
+    """--scan ROOT_PATH [--workers N]: print the JSON report for a tree."""
+    workers = SCAN_WORKERS
+    if '--workers' in args:
+        i = args.index('--workers')
+        try:
+            workers = int(args[i + 1])
+        except (IndexError, ValueError):
+            print("Error: --workers requires a number", file=sys.stderr)
+            sys.exit(3)
+        args = args[:i] + args[i + 2:]
+    if len(args) != 1:
+        print("Error: --scan requires a root folder path", file=sys.stderr)
+        print("Usage: python check-existing-agents-md.py --scan ROOT_PATH [--workers N]", file=sys.stderr)
+        sys.exit(3)
+    
+    report = scan_tree(args[0], workers)
+    import json
+    print(json.dumps(report, indent=2))
+    sys.exit(3 if report['status'] == 'error' else 0)
+
+
 def create_backup(agents_md_path: Path) -> str:
-    """Create backup of existing AGENTS.md file."""
+    """Create a full backup copy of an existing AGENTS.md file."""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    backup_path = agents_md_path.parent / f'AGENTS.md.backup.{timestamp}'
+    backup_path = agents_md_path.parent / f'{BACKUP_PREFIX}{timestamp}'
     
     try:
         import shutil
@@ -123,6 +278,126 @@ def create_backup(agents_md_path: Path) -> str:
         raise Exception(f"Failed to create backup: {e}")
 
 
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def read_text(path: Path) -> str:
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def create_delta_backup(agents_md_path: Path, new_path: Path) -> Optional[str]:
+    """Back up AGENTS.md as a reverse delta before it is replaced by new_path.
+    
+    Writes `AGENTS.md.backup.<timestamp>.diff`: a unified diff from the new
+    file to the current one, labelled with the sha256 of both. Returns None
+    when the two files are identical (nothing to back up).
+    """
+    try:
+        old_text = read_text(agents_md_path)
+        new_text = read_text(new_path)
+        if old_text == new_text:
+            return None
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        backup_path = agents_md_path.parent / f'{BACKUP_PREFIX}{timestamp}{DELTA_SUFFIX}'
+        diff = difflib.unified_diff(new_text.splitlines(keepends=True), old_text.splitlines(keepends=True),
+                                    f'AGENTS.md sha256:{text_hash(new_text)}',
+                                    f'AGENTS.md sha256:{text_hash(old_text)}')
+        with open(backup_path, 'w', encoding='utf-8', newline='') as f:
+            for line in diff:
+                f.write(line if line.endswith('\n') else line + '\n' + NO_NEWLINE)
+        return str(backup_path)
+    except Exception as e:
+        raise Exception(f"Failed to create backup: {e}")
+
+
+def apply_delta(text: str, delta_path: Path) -> str:
+    """Undo the change a delta backup recorded; returns the backed-up text.
+    
+    Raises ValueError if `text` is not the version the delta was made from.
+    """
+    delta = read_text(delta_path).splitlines(keepends=True)
+    hashes = [DELTA_HASH.search(line) for line in delta[:2]]
+    if len(hashes) < 2 or not all(hashes):
+        raise ValueError(f"Not a delta backup: {delta_path}")
+    if text_hash(text) != hashes[0].group(1):
+        raise ValueError(f"AGENTS.md does not match the version {delta_path.name} was made from "
+                         "(edited since?)")
+    
+    lines = text.splitlines(keepends=True)
+    result = []
+    position = 0
+    previous = ''
+    for line in delta[2:]:
+        hunk = DELTA_HUNK.match(line)
+        if hunk:
+            # 1-based start line in `text`; an empty range names the line before it
+            start = int(hunk.group(1))
+            start = start if hunk.group(2) == '0' else start - 1
+            result.extend(lines[position:start])
+            position = start
+        elif line == NO_NEWLINE:
+            if previous in (' ', '+'):
+                result[-1] = result[-1][:-1]
+        elif line[0] == ' ':
+            result.append(line[1:])
+            position += 1
+        elif line[0] == '-':
+            position += 1
+        elif line[0] == '+':
+            result.append(line[1:])
+        previous = line[0]
+    result.extend(lines[position:])
+    
+    restored = ''.join(result)
+    if text_hash(restored) != hashes[1].group(1):
+        raise ValueError(f"Delta backup {delta_path.name} did not apply cleanly")
+    return restored
+
+
+def list_backups(folder: Path) -> List[Path]:
+    """Full and delta backups of a folder's AGENTS.md, oldest first."""
+    return sorted(folder.glob(f'{BACKUP_PREFIX}*'), key=lambda p: p.name)
+
+
+def restore_backup(agents_md_path: Path, backup_path: Path) -> str:
+    """Text of the AGENTS.md version saved in backup_path.
+    
+    Starting from the current AGENTS.md, the deltas from the newest back to
+    backup_path are undone in turn; a full backup on the way replaces the text.
+    """
+    names = [p.name for p in list_backups(agents_md_path.parent)]
+    if backup_path.name not in names:
+        raise ValueError(f"Not a backup of {agents_md_path}: {backup_path}")
+    text = read_text(agents_md_path)
+    for name in reversed(names[names.index(backup_path.name):]):
+        path = agents_md_path.parent / name
+        text = apply_delta(text, path) if name.endswith(DELTA_SUFFIX) else read_text(path)
+    return text
+
+
+def restore_main(folder_path: str, backup_file: str):
+    """--restore: write the version saved in backup_file back to AGENTS.md."""
+    agents_md_path = Path(folder_path) / 'AGENTS.md'
+    try:
+        text = restore_backup(agents_md_path, Path(backup_file))
+        tmp_path = agents_md_path.with_name(f'.{agents_md_path.name}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        backup = create_delta_backup(agents_md_path, tmp_path)
+        os.replace(tmp_path, agents_md_path)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(3)
+    
+    import json
+    print(json.dumps({'status': 'restored', 'path': str(agents_md_path),
+                      'restored_from': backup_file, 'backup': backup}, indent=2))
+    sys.exit(0)
+
+
 def main():
     """Main execution function."""
     if len(sys.argv) < 2:
@@ -130,8 +405,17 @@ def main():
         print("Usage: python check-existing-agents-md.py [TARGET_FOLDER_PATH]", file=sys.stderr)
         sys.exit(3)
     
+    if sys.argv[1] == '--scan':
+        scan_main(sys.argv[2:])
+    
     folder_path = sys.argv[1]
     
+    if len(sys.argv) > 2 and sys.argv[2] == '--restore':
+        if len(sys.argv) < 4:
+            print("Error: --restore requires a backup file", file=sys.stderr)
+            sys.exit(3)
+        restore_main(folder_path, sys.argv[3])
+    
     result = check_existing_agents_md(folder_path)
     
     # Print result as JSON for programmatic use
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+columnar_store.py - Compact column-oriented analysis/context files
+
+Purpose: Store the per-file records of `_analysis` / `_context` output one
+         column per key (packed integers, dictionary-encoded strings, UTF-8
+         blobs) instead of repeating every key for every file, and read them
+         back through mmap so a single record or a single column can be
+         fetched without parsing the rest of the file
+
+Layout (little-endian):
+    MAGIC, u64 header size, header JSON, column data (8-byte aligned)
+
+The header holds the row count, the folder-level fields (`meta`: folder
+name, key concepts, duplicates, ...) and per column its name, encoding,
+offset and size. Encodings:
+    int    one i64 per row
+    bool   one byte per row
+    enum   u16 code per row into a value table kept in the header
+    str    u64 end offset per row, then the UTF-8 bytes of all rows
+    json   like str, each value as compact JSON; empty means key absent
+Columns whose values are not all of one simple type fall back to `json`,
+so any list of JSON-compatible dicts round-trips (key order aside).
+
+Usage:
+    from columnar_store import ColumnarFile, write_columnar
+
+    write_columnar('docs_analysis.mdcol', {'folder_name': 'docs'}, records)
+    with ColumnarFile('docs_analysis.mdcol') as store:
+        record = store[12]                 # decodes one record
+        words = store.column('word_count') # decodes one column
+"""
+
+import json
+import mmap
+import struct
+from typing import Any, Dict, Iterable, Iterator, List
+
+COLUMNAR_SUFFIX = '.mdcol'
+MAGIC = b'MDCOL\x00\x01\x00'
+# Strings with at most this many distinct values are dictionary-encoded
+MAX_ENUM_VALUES = 0xFFFF
+# Rows decoded per column at a time when iterating over all records
+ITER_BATCH = 1024
+
+_ABSENT = object()
+
+
+def is_columnar(path) -> bool:
+    return str(path).endswith(COLUMNAR_SUFFIX)
+
+
+def _column_type(values: List[Any]) -> str:
+    """Narrowest encoding that holds every value of a column (_ABSENT = key missing)."""
+    if any(v is _ABSENT for v in values):
+        return 'json'
+    if all(type(v) is bool for v in values):
+        return 'bool'
+    if all(type(v) is int and -(1 << 63) <= v < (1 << 63) for v in values):
+        return 'int'
+    if all(type(v) is str for v in values):
+        distinct = len(set(values))
+        return 'enum' if distinct <= MAX_ENUM_VALUES and distinct * 2 <= len(values) else 'str'
+    return 'json'
+
+
+def _pack_blobs(blobs: List[bytes]) -> bytes:
+    ends = []
+    end = 0
+    for blob in blobs:
+        end += len(blob)
+        ends.append(end)
+    return struct.pack(f'<{len(ends)}Q', *ends) + b''.join(blobs)
+
+
+def _pack_column(kind: str, values: List[Any], column: Dict[str, Any]) -> bytes:
+    if kind == 'int':
+        return struct.pack(f'<{len(values)}q', *values)
+    if kind == 'bool':
+        return bytes(values)
+    if kind == 'enum':
+        table = sorted(set(values))
+        codes = {value: code for code, value in enumerate(table)}
+        column['values'] = table
+        return struct.pack(f'<{len(values)}H', *(codes[v] for v in values))
+    if kind == 'str':
+        return _pack_blobs([v.encode('utf-8') for v in values])
+    return _pack_blobs([b'' if v is _ABSENT else
+                        json.dumps(v, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                        for v in values])
+
+
+def write_columnar(output_file: str, meta: Dict[str, Any], records: Iterable[Dict[str, Any]]):
+    """Write `records` (dicts) and the folder-level `meta` fields to `output_file`."""
+    records = list(records)
+    names = list(dict.fromkeys(key for record in records for key in record))
+    columns = []
+    chunks = []
+    offset = 0
+    for name in names:
+        values = [record.get(name, _ABSENT) for record in records]
+        kind = _column_type(values)
+        column = {'name': name, 'type': kind}
+        data = _pack_column(kind, values, column)
+        column['offset'] = offset
+        column['size'] = len(data)
+        columns.append(column)
+        chunks.append(data + b'\0' * (-len(data) % 8))
+        offset += len(chunks[-1])
+
+    header = json.dumps({'rows': len(records), 'meta': meta, 'columns': columns},
+                        ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    header += b' ' * (-(len(MAGIC) + 8 + len(header)) % 8)
+    with open(output_file, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        for chunk in chunks:
+            f.write(chunk)
+
+
+class ColumnarFile:
+    """Memory-mapped reader: a read-only sequence of record dicts.
+
+    Records and columns are decoded on access; nothing is cached, so memory
+    use stays at what the caller keeps.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not a columnar file: {self.path}")
+        (header_size,) = struct.unpack_from('<Q', self._mm, len(MAGIC))
+        data_start = len(MAGIC) + 8 + header_size
+        header = json.loads(self._mm[len(MAGIC) + 8:data_start].decode('utf-8'))
+        self.rows = header['rows']
+        self.meta = header['meta']
+        self.columns = {c['name']: dict(c, offset=c['offset'] + data_start) for c in header['columns']}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __enter__(self) -> 'ColumnarFile':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._mm.close()
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        if i < 0:
+            i += self.rows
+        if not 0 <= i < self.rows:
+            raise IndexError(i)
+        record = {}
+        for name, column in self.columns.items():
+            value = self._decode(column, i, i + 1, _ABSENT)[0]
+            if value is not _ABSENT:
+                record[name] = value
+        return record
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # Decode ITER_BATCH rows of every column at a time instead of cell by cell
+        for start in range(0, self.rows, ITER_BATCH):
+            stop = min(start + ITER_BATCH, self.rows)
+            names = list(self.columns)
+            columns = [self._decode(self.columns[name], start, stop, _ABSENT) for name in names]
+            for values in zip(*columns):
+                yield {name: value for name, value in zip(names, values) if value is not _ABSENT}
+
+    def _decode(self, column: Dict[str, Any], start: int, stop: int, default: Any) -> List[Any]:
+        """Values of rows start..stop-1 of a column."""
+        kind = column['type']
+        offset = column['offset']
+        count = stop - start
+        if kind == 'int':
+            return list(struct.unpack_from(f'<{count}q', self._mm, offset + 8 * start))
+        if kind == 'bool':
+            return [bool(b) for b in self._mm[offset + start:offset + stop]]
+        if kind == 'enum':
+            table = column['values']
+            return [table[code] for code in struct.unpack_from(f'<{count}H', self._mm, offset + 2 * start)]
+        ends = struct.unpack_from(f'<{count}Q', self._mm, offset + 8 * start)
+        base = offset + 8 * self.rows
+        previous = struct.unpack_from('<Q', self._mm, offset + 8 * (start - 1))[0] if start else 0
+        blobs = []
+        for end in ends:
+            blobs.append(self._mm[base + previous:base + end])
+            previous = end
+        if kind == 'str':
+            return [blob.decode('utf-8') for blob in blobs]
+        # One json.loads() per slice instead of one per value
+        decoded = iter(json.loads(b'[' + b','.join(blob for blob in blobs if blob) + b']'))
+        return [next(decoded) if blob else default for blob in blobs]
+
+    def column(self, name: str, default: Any = None) -> List[Any]:
+        """All values of one column (`default` where a record lacks the key)."""
+        column = self.columns.get(name)
+        if column is None:
+            return [default] * self.rows
+        return self._decode(column, 0, self.rows, default)
@@ -3,10 +3,45 @@
 extract-context.py - Extract contextual snippets and keywords from files
 
 Purpose: Extract contextual snippets, keywords, determine tier assignments,
-         generate file purposes and use_when statements
+         generate file purposes and use_when statements. When the analysis
+         has a link graph, every record gets its link centrality and the
+         files it links to ("links", to prefetch with it); files far more
+         linked than average go to tier 1
 
 Usage:
     python extract-context.py [TARGET_FOLDER_PATH] [ANALYSIS_JSON_FILE]
+    python extract-context.py [TARGET_FOLDER_PATH] [ANALYSIS_JSON_FILE] --cache [--cache-file PATH]
+    python extract-context.py [TARGET_FOLDER_PATH] [ANALYSIS_NDJSON_FILE] --format ndjson|columnar
+    python extract-context.py [TARGET_FOLDER_PATH] [ANALYSIS_JSON_FILE] --large-file-mb 8 --sniff-kb 256
+    python extract-context.py [TARGET_FOLDER_PATH] [ANALYSIS_JSON_FILE] --index [--index-file PATH]
+    python extract-context.py [TARGET_FOLDER_PATH] [ANALYSIS_JSON_FILE] --tier-budget 8000,40000 [--tokenizer pieces]
+    python extract-context.py [TARGET_FOLDER_PATH] [ANALYSIS_JSON_FILE] --sections
+    python extract-context.py [TARGET_FOLDER_PATH] [ANALYSIS_JSON_FILE] --collapse-duplicates
+    python extract-context.py [TARGET_FOLDER_PATH] [ANALYSIS_JSON_FILE] --in-flight 32
+
+    --cache      Reuse context records for unchanged files from an incremental
+                 cache (default: [TARGET_FOLDER]_cache.json, shared with analyze-folder.py)
+    --format     "json" (default) writes [TARGET_FOLDER]_context.json; "ndjson"
+                 streams one compact record per file to [TARGET_FOLDER]_context.ndjson;
+                 "columnar" writes [TARGET_FOLDER]_context.mdcol (see columnar_store.py).
+                 Analysis input ending in .ndjson or .mdcol is always read lazily.
+    --large-file-mb  Files above this size (default: 8) are streamed in chunks:
+                 counts and headings cover the whole file, everything else
+                 is sniffed from the first --sniff-kb KB (default: 256)
+    --index      Also write a keyword search index (default: [TARGET_FOLDER]_index.json)
+                 for query-context.py
+    --tier-budget  Token budgets for tier 1 and tier 2 (comma-separated):
+                 files are packed into the budgets (knapsack) instead of
+                 demoting every file above 10,000 words to tier 3
+    --tokenizer  Token estimate recorded per file: "words" (default),
+                 "chars" or "pieces" (see tier_planner.py)
+    --sections   Also split every file into heading-delimited sections with
+                 file byte offsets, tokens and keywords (see md_sections.py)
+    --collapse-duplicates  List each group of exact/near-duplicate files
+                 found by analyze-folder.py once, as its canonical file with
+                 the copies under "aliases"
+    --in-flight  Files read at the same time (default: 1). Raise it on NFS/SMB
+                 shares where per-file latency, not CPU, dominates
 
 Exit codes:
     0 = Success
@@ -14,93 +49,83 @@ Exit codes:
 """
 
 import os
+import heapq
 import json
 import re
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Any
-
-
-def extract_first_paragraph(content: str) -> str:
-    """Extract first meaningful paragraph for Level 1 snippet."""
-    # Remove frontmatter if present
-    if content.startswith('---'):
-        parts = content.split('---', 2)
-        if len(parts) >= 3:
-            content = parts[2]
-    
-    # Split into paragraphs
-    paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
-    
-    # Find first non-empty paragraph that's not a heading
-    for para in paragraphs:
-        if para and not para.startswith('#'):
-            # Remove markdown formatting
-            para = re.sub(r'[#*_`]', '', para)
-            para = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', para)  # Remove links
-            if len(para) > 20:  # Meaningful length
-                # Limit to first sentence or 200 chars
-                sentences = para.split('.')
-                if sentences:
-                    first_sentence = sentences[0].strip()
-                    if len(first_sentence) > 200:
-                        return first_sentence[:200] + '...'
-                    return first_sentence
-                return para[:200] + '...' if len(para) > 200 else para
-    
-    return "Documentation file"
-
-
-def extract_keywords(content: str, filename: str) -> List[str]:
-    """Extract keywords from file content and name."""
-    keywords = set()
-    
-    # Extract from filename
-    filename_lower = filename.lower().replace('.md', '').replace('-', ' ').replace('_', ' ')
-    for word in filename_lower.split():
-        if len(word) > 3:  # Meaningful words only
-            keywords.add(word)
-    
-    # Extract from frontmatter if present
-    if content.startswith('---'):
-        parts = content.split('---', 2)
-        if len(parts) >= 2:
-            yaml_content = parts[1]
-            # Look for keywords field
-            for line in yaml_content.split('\n'):
-                if 'keywords:' in line.lower() or 'keyword:' in line.lower():
-                    # Extract keywords from YAML array
-                    keywords_match = re.search(r'\[([^\]]+)\]', line)
-                    if keywords_match:
-                        keywords_str = keywords_match.group(1)
-                        for kw in keywords_str.split(','):
-                            keywords.add(kw.strip().strip('"').strip("'"))
-    
-    # Extract from headings
-    headings = re.findall(r'^#+\s+(.+)$', content, re.MULTILINE)
-    for heading in headings[:5]:  # First 5 headings
-        heading_lower = heading.lower()
-        # Extract meaningful words
-        for word in re.findall(r'\b[a-z]{4,}\b', heading_lower):
-            keywords.add(word)
-    
-    # Extract from first paragraph (common terms)
-    first_para = extract_first_paragraph(content)
-    first_para_lower = first_para.lower()
-    common_terms = ['guide', 'template', 'example', 'framework', 'protocol', 
-                    'execution', 'validation', 'checklist', 'summary', 'overview']
-    for term in common_terms:
-        if term in first_para_lower:
-            keywords.add(term)
-    
-    # Limit to 10 keywords, prioritize longer words
-    keywords_list = sorted(keywords, key=lambda x: (-len(x), x))[:10]
-    return keywords_list if keywords_list else ['documentation', 'markdown', 'file']
-
-
-def determine_tier(filename: str, file_type: str, word_count: int) -> int:
-    """Determine tier assignment based on file characteristics."""
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple, Union
+
+from analysis_cache import AnalysisCache
+from async_reader import IN_FLIGHT, read_ahead
+from columnar_store import COLUMNAR_SUFFIX, ColumnarFile, is_columnar, write_columnar
+from keyword_engine import KeywordIndex, term_vector
+from link_graph import linked_files, node_index
+from search_index import build_search_index, write_search_index
+from md_document import MarkdownDocument, configure_reading, read_document
+from md_sections import split_sections
+from tier_planner import (TOKENIZERS, configure_tokenizer, estimate_tokens, parse_budgets,
+                          plan_tiers, tier_loads, tokenizer_name)
+
+# Bump when the context record format or logic changes (invalidates caches)
+EXTRACTOR_VERSION = '1.5.0'
+
+
+KEYWORD_COUNT = 10
+FALLBACK_KEYWORDS = ['documentation', 'markdown', 'file']
+# Without tier budgets, files above this many words go to tier 3
+LARGE_FILE_WORDS = 10000
+# Files with at least this link centrality (x the average PageRank) are tier 1
+HUB_CENTRALITY = 3.0
+
+
+def frontmatter_keywords(doc: MarkdownDocument) -> List[str]:
+    """Keywords listed in the file's frontmatter (`keywords: [a, b]`)."""
+    keywords = []
+    if doc.frontmatter_text:
+        # Look for keywords field
+        for line in doc.frontmatter_text.split('\n'):
+            if 'keywords:' in line.lower() or 'keyword:' in line.lower():
+                # Extract keywords from YAML array
+                keywords_match = re.search(r'\[([^\]]+)\]', line)
+                if keywords_match:
+                    keywords_str = keywords_match.group(1)
+                    for kw in keywords_str.split(','):
+                        keywords.append(kw.strip().strip('"').strip("'"))
+    return [kw for kw in keywords if kw]
+
+
+def keyword_vector(doc: MarkdownDocument) -> Dict[str, Any]:
+    """Term vector of a file for the folder's keyword index (see keyword_engine.py)."""
+    filename_words = doc.name.lower().replace('.md', '').replace('-', ' ').replace('_', ' ')
+    explicit = frontmatter_keywords(doc)
+    return term_vector([
+        (filename_words, 3),
+        (' '.join(explicit), 3),
+        ('\n'.join(doc.headings), 2),
+        (doc.body, 1)
+    ], explicit)
+
+
+def file_keywords(index: KeywordIndex, key) -> List[str]:
+    """Top keywords of one file, ranked by BM25 against the whole folder."""
+    return index.top_keywords(key, KEYWORD_COUNT) or list(FALLBACK_KEYWORDS)
+
+
+def determine_tier(filename: str, file_type: str, word_count: int,
+                   large_file_words: Optional[int] = LARGE_FILE_WORDS,
+                   centrality: Optional[float] = None) -> int:
+    """Determine tier assignment based on file characteristics.
+    
+    Pass large_file_words=None to ignore file size (tier budgets handle it).
+    A file whose link `centrality` reaches HUB_CENTRALITY is tier 1.
+    """
     filename_lower = filename.lower()
     
+    # Tier 1: Files many others link to
+    if centrality is not None and centrality >= HUB_CENTRALITY:
+        return 1
+    
     # Tier 1: Essential files (always load first)
     tier1_patterns = ['readme', 'quick', 'start', 'overview', 'summary', 'index']
     if any(pattern in filename_lower for pattern in tier1_patterns):
@@ -114,14 +139,39 @@ def determine_tier(filename: str, file_type: str, word_count: int) -> int:
         return 3
     if file_type in ['log']:
         return 3
-    if word_count > 10000:  # Very large files are reference
+    if large_file_words is not None and word_count > large_file_words:  # Very large files are reference
         return 3
     
     # Tier 2: Core execution files (default)
     return 2
 
 
-def generate_file_purpose(filename: str, file_type: str, content: str, frontmatter: Dict) -> str:
+def planning_item(record: Dict[str, Any]) -> Tuple[int, int]:
+    """(tokens, preferred tier) of a context record for plan_tiers()."""
+    preferred = determine_tier(record['name'], record.get('file_type', 'documentation'),
+                               record.get('word_count', 0), large_file_words=None,
+                               centrality=record.get('centrality'))
+    return record.get('tokens', 0), preferred
+
+
+def planning_values(records: Iterable[Dict[str, Any]]) -> Optional[List[float]]:
+    """Knapsack values for plan_tiers(): link centrality when known (else None, one per file)."""
+    values = [record.get('centrality') for record in records]
+    return None if None in values else values
+
+
+def apply_links(record: Dict[str, Any], graph: Optional[Dict[str, Any]], index: Dict[str, int], key: str):
+    """Add the link centrality and linked files of the analysis' link graph to a record."""
+    i = index.get(key)
+    if i is None:
+        return
+    record['centrality'] = graph['centrality'][i]
+    record['links'] = linked_files(graph, i)
+    record['tier'] = determine_tier(record['name'], record.get('file_type', 'documentation'),
+                                    record.get('word_count', 0), centrality=record['centrality'])
+
+
+def generate_file_purpose(filename: str, file_type: str, first_para: str, frontmatter: Dict) -> str:
     """Generate specific, actionable file purpose statement."""
     # Try to extract from frontmatter first
     if 'purpose' in frontmatter:
@@ -130,8 +180,6 @@ def generate_file_purpose(filename: str, file_type: str, content: str, frontmatt
         return frontmatter['description']
     
     # Generate based on file type and content
-    first_para = extract_first_paragraph(content)
-    
     if file_type == 'readme':
         return f"Overview and quick start guide for the entire package - explains what the package does, how to use it, and where to start"
     elif file_type == 'quick-start':
@@ -151,7 +199,7 @@ def generate_file_purpose(filename: str, file_type: str, content: str, frontmatt
         return f"{file_type.replace('-', ' ').title()} file: {first_para[:150]}"
 
 
-def generate_use_when(filename: str, file_type: str, content: str) -> str:
+def generate_use_when(filename: str, file_type: str) -> str:
     """Generate scenario-based use_when statement."""
     filename_lower = filename.lower()
     
@@ -177,132 +225,563 @@ def generate_use_when(filename: str, file_type: str, content: str) -> str:
         return "Need reference material for specific task or topic"
 
 
-def extract_key_concepts(content: str, all_files: List[Dict]) -> List[str]:
-    """Extract key concepts from folder content."""
-    concepts = set()
-    
-    # Extract from frontmatter
-    if content.startswith('---'):
-        parts = content.split('---', 2)
-        if len(parts) >= 2:
-            yaml_content = parts[1]
-            # Look for key_concepts field
-            for line in yaml_content.split('\n'):
-                if 'key_concepts:' in line.lower() or 'concept:' in line.lower():
-                    # Extract concepts from YAML array
-                    concepts_match = re.findall(r'["\']([^"\']+)["\']', line)
-                    concepts.update(concepts_match)
-    
-    # Extract from headings (H1, H2)
-    headings = re.findall(r'^#+\s+(.+)$', content, re.MULTILINE)
-    for heading in headings[:10]:
-        if heading and len(heading) > 10:
-            concepts.add(heading.strip())
+FRAMEWORK_TERMS = {
+    'progressive context loading': 'progressive context loading',
+    'context loading': 'progressive context loading',
+    'tier': 'tiered file loading',
+    'agent': 'AI agent',
+    'llm': 'LLM context management'
+}
+
+
+def collect_concept_signals(doc: MarkdownDocument) -> Dict[str, List[str]]:
+    """Collect the per-file inputs for key concept extraction.
+    
+    The result is small and JSON-serializable, so it can be cached and
+    merged later without keeping the file content around.
+    """
+    frontmatter_concepts = []
+    if doc.frontmatter_text:
+        # Look for key_concepts field
+        for line in doc.frontmatter_text.split('\n'):
+            if 'key_concepts:' in line.lower() or 'concept:' in line.lower():
+                # Extract concepts from YAML array
+                frontmatter_concepts.extend(re.findall(r'["\']([^"\']+)["\']', line))
+    
+    # Headings (H1, H2, ...) - the first 10 of each file
+    headings = [heading.text for heading in doc.scan.headings if heading.text][:10]
     
     # Common framework concepts
-    content_lower = content.lower()
-    framework_terms = {
-        'progressive context loading': 'progressive context loading',
-        'context loading': 'progressive context loading',
-        'tier': 'tiered file loading',
-        'agent': 'AI agent',
-        'llm': 'LLM context management'
+    content_lower = doc.content.lower()
+    terms = [concept for term, concept in FRAMEWORK_TERMS.items() if term in content_lower]
+    
+    return {
+        'frontmatter': frontmatter_concepts,
+        'headings': headings,
+        'terms': terms
     }
-    for term, concept in framework_terms.items():
-        if term in content_lower:
-            concepts.add(concept)
+
+
+class ConceptAggregator:
+    """Merge per-file concept signals incrementally, in folder order.
+    
+    Each concept is counted once per file that mentions it, so memory grows
+    with the number of distinct concepts, not with the folder's content.
+    """
+    
+    def __init__(self, limit: int = 10):
+        self.limit = limit
+        self.counts = Counter()
+        self.first_seen = {}
+    
+    def add(self, signals: Dict[str, List[str]]):
+        candidates = list(signals['frontmatter'])
+        # Headings (H1, H2) long enough to name a concept
+        candidates.extend(h.strip() for h in signals['headings'] if h and len(h) > 10)
+        # Common framework concepts
+        candidates.extend(signals['terms'])
+        
+        for concept in dict.fromkeys(candidates):
+            if concept not in self.first_seen:
+                self.first_seen[concept] = len(self.first_seen)
+            self.counts[concept] += 1
     
-    return sorted(list(concepts))[:10]  # Limit to 10 concepts
+    def key_concepts(self) -> List[str]:
+        """The `limit` concepts found in the most files; ties keep folder order."""
+        return heapq.nlargest(self.limit, self.counts,
+                              key=lambda concept: (self.counts[concept], -self.first_seen[concept]))
 
 
-def extract_context(folder_path: str, analysis_file: str) -> Dict[str, Any]:
-    """Extract context from files based on analysis."""
-    folder = Path(folder_path)
+def extract_key_concepts(signals: Iterable[Dict[str, List[str]]]) -> List[str]:
+    """Extract key concepts from the per-file signals of a folder."""
+    aggregator = ConceptAggregator()
+    for file_signals in signals:
+        aggregator.add(file_signals)
+    return aggregator.key_concepts()
+
+
+def read_analysis_ndjson(analysis_file: str) -> Dict[str, Any]:
+    """Open a streamed `<folder>_analysis.ndjson` lazily.
     
-    # Load analysis JSON
-    with open(analysis_file, 'r', encoding='utf-8') as f:
-        analysis = json.load(f)
+    Returns the header fields plus a 'files' iterator that reads one record
+    per line as it is consumed; the fields of the trailing summary record
+    (e.g. 'duplicates') are added to the dict once the iterator reaches it.
+    """
+    f = open(analysis_file, 'r', encoding='utf-8')
+    header = json.loads(f.readline() or '{}')
+    if header.pop('record', None) != 'header':
+        f.close()
+        raise ValueError(f"Not an NDJSON analysis stream: {analysis_file}")
     
-    files_context = []
-    all_content = []
+    def iter_files():
+        with f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                kind = record.pop('record', 'file')
+                if kind == 'file':
+                    yield record
+                elif kind == 'summary':
+                    header.update(record)
     
-    for file_data in analysis['files']:
-        filename = file_data['name']
-        file_path = folder / filename
+    header['files'] = iter_files()
+    return header
+
+
+def load_analysis(analysis: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the analysis dict, loading it from JSON if given a path.
+    
+    `.ndjson` files are opened lazily (see read_analysis_ndjson); so are
+    columnar `.mdcol` files, whose records are decoded one at a time while
+    'files' is iterated. The file is mapped only during that pass and
+    unmapped once it ends.
+    """
+    if isinstance(analysis, dict):
+        return analysis
+    if str(analysis).endswith(('.ndjson', '.jsonl')):
+        return read_analysis_ndjson(analysis)
+    if is_columnar(analysis):
+        with ColumnarFile(analysis) as store:
+            meta = store.meta
         
-        if not file_path.exists():
-            continue
+        def iter_files():
+            with ColumnarFile(analysis) as store:
+                yield from store
         
-        # Read file content
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception:
-            content = ""
+        return dict(meta, files=iter_files())
+    with open(analysis, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def duplicate_aliases(analysis: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Canonical file name -> names of its duplicates, from the analysis' duplicate groups.
+    
+    For streamed (.ndjson) analyses the groups are only known once all file
+    records have been read.
+    """
+    if analysis.get('recursive'):
+        raise ValueError("Collapsing duplicates needs a single-folder analysis")
+    return {group['canonical']: [d['name'] for d in group['duplicates']]
+            for group in analysis.get('duplicates', [])}
+
+
+def collapsed_positions(names: List[str], aliases: Dict[str, List[str]]) -> List[int]:
+    """Positions of the records to keep: all but the duplicates of a listed canonical file."""
+    present = set(names)
+    dropped = {alias for canonical, group in aliases.items() if canonical in present for alias in group}
+    return [position for position, name in enumerate(names) if name not in dropped]
+
+
+def build_file_context(doc: MarkdownDocument, file_data: Dict[str, Any],
+                       sections: bool = False) -> Tuple[Dict[str, Any], Dict[str, List[str]], Dict[str, Any]]:
+    """Build the context record, concept signals and keyword vector for one parsed file.
+    
+    The record's `keywords` depend on the whole folder; they are filled in
+    with file_keywords() once every file's vector is in the KeywordIndex.
+    With `sections`, the record also lists the file's sections (split_sections).
+    """
+    filename = file_data['name']
+    file_type = file_data.get('file_type', 'documentation')
+    word_count = file_data.get('word_count', 0)
+    
+    # Extract context data
+    snippet = doc.first_paragraph
+    tier = determine_tier(filename, file_type, word_count)
+    purpose = generate_file_purpose(filename, file_type, doc.first_paragraph,
+                                    file_data.get('frontmatter', {}))
+    use_when = generate_use_when(filename, file_type)
+    
+    record = {
+        'name': filename,
+        'snippet': snippet,
+        'keywords': [],
+        'tier': tier,
+        'purpose': purpose,
+        'use_when': use_when,
+        'word_count': word_count,
+        'tokens': estimate_tokens(doc),
+        'file_type': file_type
+    }
+    if sections:
+        record['sections'] = split_sections(doc)
+    return record, collect_concept_signals(doc), keyword_vector(doc)
+
+
+def iter_file_contexts(folder: Path, analysis: Dict[str, Any],
+                       documents: Optional[Dict[str, MarkdownDocument]] = None,
+                       cache: Optional[AnalysisCache] = None,
+                       concepts: Optional[ConceptAggregator] = None,
+                       keywords: Optional[KeywordIndex] = None,
+                       sections: bool = False,
+                       in_flight: int = IN_FLIGHT,
+                       keys: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield one context record per analyzed file, in analysis order.
+    
+    Records are fresh dicts the caller may update; the cache keeps its own
+    copy of the per-file record. Concept signals of every file are fed to
+    `concepts` and keyword vectors to `keywords` (keyed by record position)
+    as they are produced, and the analysis key of every record (its link
+    graph node) to `keys`. With `in_flight` > 1, up to that many files are
+    looked up in the cache and read at the same time (see async_reader.py).
+    """
+    documents = documents if documents is not None else {}
+    position = 0
+    
+    # Combined recursive analyses list files by path relative to the root
+    recursive = analysis.get('recursive', False)
+    
+    items = ((file_data, folder / (file_data['path'] if recursive else file_data['name']))
+             for file_data in analysis['files'])
+    
+    def load(item: Tuple[Dict[str, Any], Path]) -> Tuple[Optional[Dict[str, Any]], Optional[MarkdownDocument]]:
+        file_data, file_path = item
+        cached = cache.lookup(file_path) if cache else None
+        if (cached and cached['file_type'] == file_data.get('file_type', 'documentation')
+                and cached['word_count'] == file_data.get('word_count', 0)
+                and cached.get('tokenizer') == tokenizer_name()
+                and ('sections' in cached['record']) == sections):
+            return cached, None
+        doc = None if recursive else documents.get(file_data['name'])
+        if doc is None:
+            if not file_path.exists():
+                return None, None
+            
+            # Read file content
+            try:
+                doc = read_document(file_path)
+            except Exception:
+                doc = MarkdownDocument(file_path, "", 0, 0.0)
+        return None, doc
+    
+    for (file_data, file_path), (cached, doc) in read_ahead(items, load, in_flight):
+        if keys is not None and (cached is not None or doc is not None):
+            keys.append(file_data['path'] if recursive else file_data['name'])
+        if cached is not None:
+            if concepts is not None:
+                concepts.add(cached['concepts'])
+            if keywords is not None:
+                keywords.add(position, cached['keywords'])
+            position += 1
+            # Folder-level steps (tiers, keywords, links, aliases) write into the
+            # yielded record; the cached one stays as build_file_context() made it
+            yield dict(cached['record'])
+            continue
+        if doc is None:
+            continue
         
-        all_content.append(content)
+        file_type = file_data.get('file_type', 'documentation')
+        word_count = file_data.get('word_count', 0)
+        record, signals, vector = build_file_context(doc, file_data, sections)
+        if concepts is not None:
+            concepts.add(signals)
+        if keywords is not None:
+            keywords.add(position, vector)
         
-        # Extract context data
-        snippet = extract_first_paragraph(content)
-        keywords = extract_keywords(content, filename)
-        tier = determine_tier(filename, file_data.get('file_type', 'documentation'), 
-                            file_data.get('word_count', 0))
-        purpose = generate_file_purpose(filename, file_data.get('file_type', 'documentation'), 
-                                        content, file_data.get('frontmatter', {}))
-        use_when = generate_use_when(filename, file_data.get('file_type', 'documentation'), content)
+        if cache and doc.content_hash:
+            cache.store(file_path, {
+                'file_type': file_type,
+                'word_count': word_count,
+                'tokenizer': tokenizer_name(),
+                'record': dict(record),
+                'concepts': signals,
+                'keywords': vector
+            }, doc.content_hash)
         
-        files_context.append({
-            'name': filename,
-            'snippet': snippet,
-            'keywords': keywords,
-            'tier': tier,
-            'purpose': purpose,
-            'use_when': use_when,
-            'word_count': file_data.get('word_count', 0),
-            'file_type': file_data.get('file_type', 'documentation')
-        })
-    
-    # Extract key concepts from all content
-    combined_content = '\n\n'.join(all_content)
-    key_concepts = extract_key_concepts(combined_content, files_context)
+        position += 1
+        yield record
+
+
+def extract_context(folder_path: str, analysis_file: Union[str, Dict[str, Any]],
+                    documents: Optional[Dict[str, MarkdownDocument]] = None,
+                    cache: Optional[AnalysisCache] = None,
+                    keywords: Optional[KeywordIndex] = None,
+                    tier_budgets: Optional[List[int]] = None,
+                    sections: bool = False,
+                    collapse_duplicates: bool = False,
+                    in_flight: int = IN_FLIGHT) -> Dict[str, Any]:
+    """Extract context from files based on analysis.
+
+    `analysis_file` may be a path to `<folder>_analysis.json` (or a streamed
+    `.ndjson`) or the dict returned by analyze_folder(). Documents already
+    parsed during analysis can be passed in `documents` (keyed by file name)
+    to avoid reading the files a second time. With a `cache`, unchanged
+    files are not read at all. Pass an empty `keywords` index to keep the
+    folder's keyword index (e.g. for build_search_index()). With
+    `tier_budgets` (tokens for tier 1, tier 2), tiers are packed into the
+    budgets by plan_tiers(). With `sections`, every record lists the
+    file's heading-delimited sections. With `collapse_duplicates`, files
+    the analysis grouped as duplicates are listed once (see duplicate_aliases).
+    `in_flight` > 1 overlaps the reads of that many files (slow or network
+    filesystems). The analysis' link graph adds centrality and links to the
+    records (see apply_links).
+    """
+    folder = Path(folder_path)
+    
+    # Load analysis JSON
+    analysis = load_analysis(analysis_file)
+    
+    concepts = ConceptAggregator()
+    keywords = keywords if keywords is not None else KeywordIndex()
+    keys = []
+    files_context = list(iter_file_contexts(folder, analysis, documents, cache, concepts, keywords,
+                                            sections, in_flight, keys))
+    # Known once every analysis record has been read (streamed analyses)
+    graph = analysis.get('link_graph')
+    index = node_index(graph)
+    for record, key in zip(files_context, keys):
+        apply_links(record, graph, index, key)
+    if collapse_duplicates:
+        aliases = duplicate_aliases(analysis)
+        keep = collapsed_positions([record['name'] for record in files_context], aliases)
+        keywords.compact(keep)
+        files_context = [files_context[position] for position in keep]
+        for record in files_context:
+            if record['name'] in aliases:
+                record['aliases'] = aliases[record['name']]
+    for position, record in enumerate(files_context):
+        record['keywords'] = file_keywords(keywords, position)
+    if tier_budgets is not None:
+        tiers = plan_tiers([planning_item(record) for record in files_context], tier_budgets,
+                           planning_values(files_context))
+        for record, tier in zip(files_context, tiers):
+            record['tier'] = tier
     
     return {
         'folder_path': folder_path,
         'folder_name': analysis.get('folder_name', folder.name),
         'files': files_context,
-        'key_concepts': key_concepts,
+        'key_concepts': concepts.key_concepts(),
         'total_files': len(files_context)
     }
 
 
+def write_context_ndjson(folder_path: str, analysis_file: Union[str, Dict[str, Any]],
+                         output_file: str, cache: Optional[AnalysisCache] = None,
+                         keywords: Optional[KeywordIndex] = None,
+                         tier_budgets: Optional[List[int]] = None,
+                         sections: bool = False,
+                         collapse_duplicates: bool = False,
+                         in_flight: int = IN_FLIGHT) -> Dict[str, Any]:
+    """Stream context records to `output_file` as NDJSON.
+    
+    Writes a header record, one compact record per file and a trailing
+    summary record with the key concepts. Records are spooled to a
+    `.part` file until the keyword index and tier plan are complete, so
+    memory only grows with the index (one sparse term vector per file).
+    Returns the summary.
+    """
+    folder = Path(folder_path)
+    analysis = load_analysis(analysis_file)
+    concepts = ConceptAggregator()
+    keywords = keywords if keywords is not None else KeywordIndex()
+    names = []
+    keys = []
+    # What planning_item() needs of each record
+    planning = []
+    spool_file = f"{output_file}.part"
+    
+    try:
+        with open(spool_file, 'w', encoding='utf-8') as spool:
+            for record in iter_file_contexts(folder, analysis, cache=cache, concepts=concepts,
+                                             keywords=keywords, sections=sections,
+                                             in_flight=in_flight, keys=keys):
+                spool.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+                names.append(record['name'])
+                if tier_budgets is not None:
+                    planning.append({k: record.get(k) for k in ('name', 'file_type', 'word_count', 'tokens')
+                                     if k in record})
+        
+        graph = analysis.get('link_graph')
+        index = node_index(graph)
+        for planned, key in zip(planning, keys):
+            apply_links(planned, graph, index, key)
+        
+        aliases = {}
+        keep = list(range(len(names)))
+        if collapse_duplicates:
+            aliases = duplicate_aliases(analysis)
+            keep = collapsed_positions(names, aliases)
+            keywords.compact(keep)
+        tiers = None
+        if tier_budgets is not None:
+            planned = [planning[position] for position in keep]
+            planning = [planning_item(record) for record in planned]
+            tiers = plan_tiers(planning, tier_budgets, planning_values(planned))
+        kept = set(keep)
+        
+        with open(output_file, 'w', encoding='utf-8') as f, open(spool_file, 'r', encoding='utf-8') as spool:
+            header = {
+                'record': 'header',
+                'folder_path': folder_path,
+                'folder_name': analysis.get('folder_name', folder.name)
+            }
+            f.write(json.dumps(header, ensure_ascii=False, separators=(',', ':')) + '\n')
+            position = 0
+            for spooled, line in enumerate(spool):
+                if spooled not in kept:
+                    continue
+                record = json.loads(line)
+                apply_links(record, graph, index, keys[spooled])
+                record['keywords'] = file_keywords(keywords, position)
+                if tiers is not None:
+                    record['tier'] = tiers[position]
+                if record['name'] in aliases:
+                    record['aliases'] = aliases[record['name']]
+                position += 1
+                f.write(json.dumps(dict(record, record='file'), ensure_ascii=False, separators=(',', ':')) + '\n')
+            summary = {
+                'record': 'summary',
+                'key_concepts': concepts.key_concepts(),
+                'total_files': len(keep)
+            }
+            if tiers is not None:
+                summary['tier_tokens'] = tier_loads(planning, tiers)
+            f.write(json.dumps(summary, ensure_ascii=False, separators=(',', ':')) + '\n')
+    finally:
+        if os.path.exists(spool_file):
+            os.remove(spool_file)
+    
+    return summary
+
+
+def format_tier_loads(loads: Dict[int, int], budgets: List[int]) -> str:
+    """"tier 1 7,512/8,000, tier 2 ..." for the summary line."""
+    parts = []
+    for tier, tokens in sorted(loads.items()):
+        budget = f"/{budgets[tier - 1]:,}" if tier <= len(budgets) else ''
+        parts.append(f"tier {tier} {tokens:,}{budget}")
+    return ', '.join(parts)
+
+
 def main():
     """Main execution function."""
     import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Extract contextual snippets and keywords from files")
+    parser.add_argument('folder_path', nargs='?', metavar='TARGET_FOLDER_PATH')
+    parser.add_argument('analysis_file', nargs='?', metavar='ANALYSIS_JSON_FILE')
+    parser.add_argument('--cache', action='store_true',
+                        help="Reuse context records for unchanged files from an incremental cache")
+    parser.add_argument('--cache-file', metavar='PATH',
+                        help="Cache file (default: [TARGET_FOLDER]_cache.json)")
+    parser.add_argument('--format', choices=['json', 'ndjson', 'columnar'], default='json',
+                        help="Output format (default: json)")
+    parser.add_argument('--large-file-mb', type=float, metavar='MB',
+                        help="Stream files larger than this (default: 8)")
+    parser.add_argument('--sniff-kb', type=int, metavar='KB',
+                        help="Content kept from streamed files for sniffing (default: 256)")
+    parser.add_argument('--index', action='store_true',
+                        help="Also write a keyword search index for query-context.py")
+    parser.add_argument('--index-file', metavar='PATH',
+                        help="Search index file (default: [TARGET_FOLDER]_index.json)")
+    parser.add_argument('--tier-budget', metavar='TOKENS',
+                        help="Token budgets for tier 1 and tier 2, e.g. 8000,40000")
+    parser.add_argument('--tokenizer', choices=sorted(TOKENIZERS), default='words',
+                        help="Token estimate per file (default: words)")
+    parser.add_argument('--sections', action='store_true',
+                        help="Split files into heading-delimited sections with byte offsets")
+    parser.add_argument('--collapse-duplicates', action='store_true',
+                        help="List duplicate files once, with the copies as aliases")
+    parser.add_argument('--in-flight', type=int, default=IN_FLIGHT, metavar='N',
+                        help=f"Files read at the same time, for slow or network filesystems (default: {IN_FLIGHT})")
+    args = parser.parse_args()
     
-    if len(sys.argv) < 3:
+    if not args.folder_path or not args.analysis_file:
         print("Error: Target folder path and analysis JSON file required", file=sys.stderr)
         print("Usage: python extract-context.py [TARGET_FOLDER_PATH] [ANALYSIS_JSON_FILE]", file=sys.stderr)
         sys.exit(1)
     
-    folder_path = sys.argv[1]
-    analysis_file = sys.argv[2]
+    folder_path = args.folder_path
+    analysis_file = args.analysis_file
+    
+    configure_reading(
+        large_file_bytes=int(args.large_file_mb * 1024 * 1024) if args.large_file_mb else None,
+        sniff_chars=args.sniff_kb * 1024 if args.sniff_kb else None
+    )
+    
+    configure_tokenizer(args.tokenizer)
+    tier_budgets = None
+    if args.tier_budget:
+        try:
+            tier_budgets = parse_budgets(args.tier_budget)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+    
+    cache = None
+    if args.cache or args.cache_file:
+        cache_file = args.cache_file or f"{Path(folder_path).name}_cache.json"
+        cache = AnalysisCache(cache_file, 'context', EXTRACTOR_VERSION)
+    
+    folder_name = Path(folder_path).name
+    index_file = None
+    keywords = None
+    if args.index or args.index_file:
+        index_file = args.index_file or f"{folder_name}_index.json"
+        keywords = KeywordIndex()
     
     try:
-        context = extract_context(folder_path, analysis_file)
+        if args.format == 'ndjson':
+            output_file = f"{folder_name}_context.ndjson"
+            summary = write_context_ndjson(folder_path, analysis_file, output_file, cache, keywords,
+                                           tier_budgets, args.sections, args.collapse_duplicates,
+                                           args.in_flight)
+            if cache:
+                cache.save()
+            if index_file:
+                with open(output_file, 'r', encoding='utf-8') as f:
+                    records = (json.loads(line) for line in f if line.strip())
+                    index = build_search_index(keywords, (r for r in records if r.get('record') == 'file'),
+                                               folder_name)
+                write_search_index(index_file, index)
+            
+            print(f"Context extraction complete: {output_file}")
+            print(f"  Files processed: {summary['total_files']}")
+            print(f"  Key concepts: {len(summary['key_concepts'])}")
+            if cache:
+                print(f"  Cache: {cache.summary()}")
+            if index_file:
+                print(f"  Search index: {index_file} ({len(index['postings'])} terms)")
+            if tier_budgets is not None:
+                print(f"  Tier tokens: {format_tier_loads(summary['tier_tokens'], tier_budgets)}")
+            sys.exit(0)
+        
+        context = extract_context(folder_path, analysis_file, cache=cache, keywords=keywords,
+                                  tier_budgets=tier_budgets, sections=args.sections,
+                                  collapse_duplicates=args.collapse_duplicates,
+                                  in_flight=args.in_flight)
+        if cache:
+            cache.save()
         
-        # Output JSON to file
-        folder_name = Path(folder_path).name
-        output_file = f"{folder_name}_context.json"
+        # Output JSON (or columnar) to file
+        if args.format == 'columnar':
+            output_file = f"{folder_name}_context{COLUMNAR_SUFFIX}"
+            write_columnar(output_file, {k: v for k, v in context.items() if k != 'files'}, context['files'])
+        else:
+            output_file = f"{folder_name}_context.json"
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(context, f, indent=2, ensure_ascii=False)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(context, f, indent=2, ensure_ascii=False)
+        if index_file:
+            index = build_search_index(keywords, context['files'], folder_name)
+            write_search_index(index_file, index)
         
         print(f"Context extraction complete: {output_file}")
         print(f"  Files processed: {context['total_files']}")
         print(f"  Key concepts: {len(context['key_concepts'])}")
+        if cache:
+            print(f"  Cache: {cache.summary()}")
+        if index_file:
+            print(f"  Search index: {index_file} ({len(index['postings'])} terms)")
+        if tier_budgets is not None:
+            loads = tier_loads([(r.get('tokens', 0), r['tier']) for r in context['files']],
+                               [r['tier'] for r in context['files']])
+            print(f"  Tier tokens: {format_tier_loads(loads, tier_budgets)}")
         sys.exit(0)
         
-    except FileNotFoundError as e:
+    except (FileNotFoundError, ValueError) as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
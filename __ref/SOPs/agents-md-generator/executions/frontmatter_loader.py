@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+frontmatter_loader.py - Fast YAML frontmatter loader for AGENTS.md files
+
+Purpose: Load AGENTS.md frontmatter with PyYAML's libyaml-backed CSafeLoader
+         when it is available, and otherwise with a purpose-built parser for
+         the YAML subset the template produces (nested mappings, lists of
+         mappings such as `files:` and `contextual_snippets:`, flow lists,
+         quoted strings, block scalars and comments)
+
+The subset parser resolves scalars the way yaml.safe_load does (ints,
+floats, booleans, nulls, dates). Syntax outside the subset (anchors, tags,
+multi-line plain scalars) raises FrontmatterSyntaxError; if pure-Python
+PyYAML is installed the loader then falls back to yaml.safe_load.
+
+Usage:
+    from frontmatter_loader import load_frontmatter
+
+    frontmatter = load_frontmatter(yaml_text)
+    print(frontmatter['files'][0]['name'])
+"""
+
+import datetime
+import re
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import yaml
+    HAS_YAML = True
+    try:
+        from yaml import CSafeLoader
+        HAS_LIBYAML = True
+    except ImportError:
+        HAS_LIBYAML = False
+except ImportError:
+    HAS_YAML = False
+    HAS_LIBYAML = False
+
+# Which loader load_frontmatter() tries first ('libyaml' or 'subset'); set
+# it to 'subset' to use the subset parser even where libyaml is installed
+LOADER = 'libyaml' if HAS_LIBYAML else 'subset'
+
+
+class FrontmatterSyntaxError(ValueError):
+    """YAML outside the supported frontmatter subset, or malformed YAML."""
+
+    def __init__(self, message: str, line: Optional[int] = None):
+        if line is not None:
+            message = f"line {line}: {message}"
+        super().__init__(message)
+        self.line = line
+
+
+# Scalar resolution (YAML 1.1 core types, as resolved by PyYAML's SafeLoader)
+NULL_VALUES = {'', '~', 'null', 'Null', 'NULL'}
+BOOL_VALUES = {
+    'yes': True, 'Yes': True, 'YES': True, 'true': True, 'True': True, 'TRUE': True,
+    'on': True, 'On': True, 'ON': True,
+    'no': False, 'No': False, 'NO': False, 'false': False, 'False': False, 'FALSE': False,
+    'off': False, 'Off': False, 'OFF': False
+}
+INT_PATTERN = re.compile(r'[-+]?(?:0|[1-9][0-9_]*)$')
+OCTAL_PATTERN = re.compile(r'[-+]?0[0-7_]+$')
+HEX_PATTERN = re.compile(r'[-+]?0x[0-9a-fA-F_]+$')
+FLOAT_PATTERN = re.compile(r'[-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+][0-9]+)?$'
+                           r'|\.[0-9_]+(?:[eE][-+][0-9]+)?$')
+SPECIAL_FLOATS = {
+    '.inf': float('inf'), '.Inf': float('inf'), '.INF': float('inf'),
+    '+.inf': float('inf'), '+.Inf': float('inf'), '+.INF': float('inf'),
+    '-.inf': float('-inf'), '-.Inf': float('-inf'), '-.INF': float('-inf'),
+    '.nan': float('nan'), '.NaN': float('nan'), '.NAN': float('nan')
+}
+DATE_PATTERN = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})$')
+DOUBLE_QUOTE_ESCAPES = re.compile(r'\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|.)')
+ESCAPE_CHARS = {
+    '0': '\0', 'a': '\a', 'b': '\b', 't': '\t', '\t': '\t', 'n': '\n', 'v': '\v',
+    'f': '\f', 'r': '\r', 'e': '\x1b', ' ': ' ', '"': '"', '/': '/', '\\': '\\',
+    'N': '\x85', '_': '\xa0', 'L': ' ', 'P': ' '
+}
+# Plain scalars may not start with these (anchors, aliases, tags, directives...)
+UNSUPPORTED_INDICATORS = set('&*!%@`|>')
+
+
+def resolve_plain(text: str) -> Any:
+    """Resolve a plain (unquoted) scalar to its Python value."""
+    if text in NULL_VALUES:
+        return None
+    first = text[0]
+    if first.isdigit() or first in '-+.':
+        if INT_PATTERN.match(text):
+            return int(text.replace('_', ''))
+        if FLOAT_PATTERN.match(text):
+            return float(text.replace('_', ''))
+        if text in SPECIAL_FLOATS:
+            return SPECIAL_FLOATS[text]
+        if HEX_PATTERN.match(text):
+            return int(text.replace('_', ''), 16)
+        if OCTAL_PATTERN.match(text):
+            return int(text.replace('_', ''), 8)
+        date = DATE_PATTERN.match(text)
+        if date:
+            return datetime.date(int(date.group(1)), int(date.group(2)), int(date.group(3)))
+        return text
+    return BOOL_VALUES.get(text, text)
+
+
+def _unescape(match) -> str:
+    code = match.group(1)
+    if len(code) > 1:
+        return chr(int(code[1:], 16))
+    if code not in ESCAPE_CHARS:
+        raise FrontmatterSyntaxError(f"unknown escape sequence \\{code}")
+    return ESCAPE_CHARS[code]
+
+
+def read_quoted(text: str, pos: int, line: int) -> Tuple[str, int]:
+    """Read a quoted scalar starting at text[pos]; return (value, end position)."""
+    quote = text[pos]
+    i = pos + 1
+    if quote == "'":
+        while True:
+            end = text.find("'", i)
+            if end < 0:
+                raise FrontmatterSyntaxError("unterminated single-quoted string", line)
+            if text.startswith("''", end):
+                i = end + 2
+                continue
+            return text[pos + 1:end].replace("''", "'"), end + 1
+    while True:
+        end = text.find('"', i)
+        if end < 0:
+            raise FrontmatterSyntaxError("unterminated double-quoted string", line)
+        backslashes = 0
+        while text[end - 1 - backslashes] == '\\':
+            backslashes += 1
+        if backslashes % 2 == 0:
+            raw = text[pos + 1:end]
+            if '\\' in raw:
+                raw = DOUBLE_QUOTE_ESCAPES.sub(_unescape, raw)
+            return raw, end + 1
+        i = end + 1
+
+
+def strip_comment(text: str) -> str:
+    """Drop a trailing ` # comment`, ignoring '#' inside quoted scalars."""
+    if '#' not in text:
+        return text
+    i = 0
+    n = len(text)
+    token_start = True
+    while i < n:
+        ch = text[i]
+        if token_start and ch in '"\'':
+            try:
+                _, i = read_quoted(text, i, 0)
+            except FrontmatterSyntaxError:
+                return text  # reported with a line number by the caller
+            token_start = False
+            continue
+        if ch == '#' and (i == 0 or text[i - 1] in ' \t'):
+            return text[:i].rstrip()
+        token_start = ch in ' \t:-[{,'
+        i += 1
+    return text
+
+
+def parse_flow(text: str, pos: int, line: int) -> Tuple[Any, int]:
+    """Parse a flow collection (`[a, b]` or `{k: v}`) starting at text[pos]."""
+    opening = text[pos]
+    closing = ']' if opening == '[' else '}'
+    items = [] if opening == '[' else {}
+    i = pos + 1
+    n = len(text)
+    while True:
+        while i < n and text[i] in ' \t':
+            i += 1
+        if i >= n:
+            raise FrontmatterSyntaxError(f"unterminated flow collection '{opening}'", line)
+        if text[i] == closing:
+            return items, i + 1
+        value, i = _parse_flow_item(text, i, line, ':' + closing if opening == '{' else closing)
+        if opening == '{':
+            while i < n and text[i] in ' \t':
+                i += 1
+            if i < n and text[i] == ':':
+                key = value
+                i += 1
+                while i < n and text[i] in ' \t':
+                    i += 1
+                value, i = _parse_flow_item(text, i, line, closing)
+            else:
+                key, value = value, None
+            items[key] = value
+        else:
+            items.append(value)
+        while i < n and text[i] in ' \t':
+            i += 1
+        if i < n and text[i] == ',':
+            i += 1
+        elif i >= n or text[i] != closing:
+            raise FrontmatterSyntaxError(f"expected ',' or '{closing}' in flow collection", line)
+
+
+def _parse_flow_item(text: str, i: int, line: int, stops: str) -> Tuple[Any, int]:
+    """Parse one scalar or nested collection inside a flow collection."""
+    ch = text[i]
+    if ch in '[{':
+        return parse_flow(text, i, line)
+    if ch in '"\'':
+        return read_quoted(text, i, line)
+    start = i
+    n = len(text)
+    while i < n and text[i] not in ',' + stops:
+        if text[i] == ':' and i + 1 < n and text[i + 1] not in ' \t' and ':' in stops:
+            i += 1  # "a:b" is a plain scalar, only ": " separates a key
+            continue
+        i += 1
+    return resolve_plain(text[start:i].strip()), i
+
+
+def parse_scalar(text: str, line: int) -> Any:
+    """Parse an inline value: quoted, flow collection or plain scalar."""
+    first = text[0]
+    if first in '"\'':
+        value, end = read_quoted(text, 0, line)
+    elif first in '[{':
+        value, end = parse_flow(text, 0, line)
+    elif first in UNSUPPORTED_INDICATORS:
+        raise FrontmatterSyntaxError(f"unsupported YAML syntax '{first}'", line)
+    else:
+        return resolve_plain(text)
+    if text[end:].strip():
+        raise FrontmatterSyntaxError(f"unexpected text after value: {text[end:].strip()!r}", line)
+    return value
+
+
+def split_key(text: str, line: int) -> Optional[Tuple[Any, str]]:
+    """Split `key: value` into (key, value text); None if text is not a mapping entry."""
+    if text[0] in '"\'':
+        key, end = read_quoted(text, 0, line)
+        rest = text[end:].lstrip()
+        if rest.startswith(':') and (len(rest) == 1 or rest[1] in ' \t'):
+            return key, rest[1:].strip()
+        return None
+    if text[0] in '[{':
+        return None
+    index = text.find(': ')
+    if index < 0:
+        index = text.find(':\t')
+    if index < 0:
+        if not text.endswith(':'):
+            return None
+        index = len(text) - 1
+    return resolve_plain(text[:index].rstrip()), text[index + 1:].strip()
+
+
+class SubsetParser:
+    """Indentation-driven parser for the AGENTS.md frontmatter YAML subset."""
+
+    def __init__(self, text: str):
+        self.raw = text.split('\n')
+        # (indent, text without comment, 1-based line number) for content lines
+        self.lines = []
+        for number, raw in enumerate(self.raw, 1):
+            stripped = raw.lstrip(' ')
+            if not stripped or stripped.startswith('#'):
+                continue
+            if stripped[0] == '\t' or not stripped.strip():
+                if stripped.strip():
+                    raise FrontmatterSyntaxError("tabs are not allowed for indentation", number)
+                continue
+            if raw.rstrip() in ('---', '...'):
+                raise FrontmatterSyntaxError("multiple YAML documents are not supported", number)
+            self.lines.append((len(raw) - len(stripped), strip_comment(stripped.rstrip()), number))
+
+    def parse(self) -> Any:
+        if not self.lines:
+            return None
+        value, i = self.parse_block(0, self.lines[0][0])
+        if i < len(self.lines):
+            raise FrontmatterSyntaxError("unexpected indentation", self.lines[i][2])
+        return value
+
+    @staticmethod
+    def is_sequence_item(text: str) -> bool:
+        return text == '-' or text.startswith('- ')
+
+    def parse_block(self, i: int, indent: int) -> Tuple[Any, int]:
+        text = self.lines[i][1]
+        if self.is_sequence_item(text):
+            return self.parse_sequence(i, indent)
+        if split_key(text, self.lines[i][2]) is None:
+            # A lone scalar (e.g. a document that is just a string)
+            if i + 1 < len(self.lines) and self.lines[i + 1][0] >= indent:
+                raise FrontmatterSyntaxError("multi-line plain scalars are not supported", self.lines[i + 1][2])
+            return parse_scalar(text, self.lines[i][2]), i + 1
+        return self.parse_mapping(i, indent)
+
+    def parse_nested(self, i: int, indent: int, line: int, allow_sequence: bool) -> Tuple[Any, int]:
+        """Value of an entry with nothing after ':' or '-': a nested block or null."""
+        if i < len(self.lines):
+            next_indent, next_text, _ = self.lines[i]
+            if next_indent > indent:
+                return self.parse_block(i, next_indent)
+            if allow_sequence and next_indent == indent and self.is_sequence_item(next_text):
+                # "key:\n- item" - sequences may sit at the key's own indent
+                return self.parse_sequence(i, indent)
+        return None, i
+
+    def parse_mapping(self, i: int, indent: int) -> Tuple[Dict[Any, Any], int]:
+        mapping = {}
+        while i < len(self.lines):
+            line_indent, text, line = self.lines[i]
+            if line_indent < indent:
+                break
+            if line_indent > indent:
+                raise FrontmatterSyntaxError("unexpected indentation", line)
+            if self.is_sequence_item(text):
+                raise FrontmatterSyntaxError("sequence item where a mapping key was expected", line)
+            entry = split_key(text, line)
+            if entry is None:
+                raise FrontmatterSyntaxError(f"expected 'key: value', got {text!r}", line)
+            key, rest = entry
+            if rest:
+                if rest[0] in '|>':
+                    mapping[key], i = self.block_scalar(i, indent, rest)
+                    continue
+                mapping[key] = parse_scalar(rest, line)
+                i += 1
+            else:
+                mapping[key], i = self.parse_nested(i + 1, indent, line, allow_sequence=True)
+        return mapping, i
+
+    def parse_sequence(self, i: int, indent: int) -> Tuple[List[Any], int]:
+        items = []
+        while i < len(self.lines):
+            line_indent, text, line = self.lines[i]
+            if line_indent < indent or not self.is_sequence_item(text):
+                if line_indent > indent:
+                    raise FrontmatterSyntaxError("unexpected indentation", line)
+                break
+            if line_indent > indent:
+                raise FrontmatterSyntaxError("unexpected indentation", line)
+            rest = text[1:].lstrip(' ')
+            if not rest:
+                value, i = self.parse_nested(i + 1, indent, line, allow_sequence=False)
+                items.append(value)
+                continue
+            item_indent = indent + len(text) - len(rest)
+            if self.is_sequence_item(rest) or split_key(rest, line) is not None:
+                # "- key: value" starts a mapping (or "- - x" a sequence) at the item's column
+                self.lines[i] = (item_indent, rest, line)
+                value, i = self.parse_block(i, item_indent)
+                items.append(value)
+                continue
+            if rest[0] in '|>':
+                value, i = self.block_scalar(i, indent, rest)
+                items.append(value)
+                continue
+            items.append(parse_scalar(rest, line))
+            i += 1
+        return items, i
+
+    def block_scalar(self, i: int, indent: int, header: str) -> Tuple[str, int]:
+        """Read a literal (|) or folded (>) block scalar belonging to lines[i]."""
+        line = self.lines[i][2]
+        style, indicators = header[0], header[1:].strip()
+        chomping = indicators[0] if indicators[:1] in ('-', '+') else ''
+        if indicators.strip('-+'):
+            raise FrontmatterSyntaxError("block scalar indentation indicators are not supported", line)
+
+        body = []
+        number = line  # raw lines are 0-based, so raw[line] is the next line
+        block_indent = None
+        while number < len(self.raw):
+            raw = self.raw[number]
+            if raw.strip():
+                current = len(raw) - len(raw.lstrip(' '))
+                if current <= indent:
+                    break
+                if block_indent is None:
+                    block_indent = current
+                elif current < block_indent:
+                    raise FrontmatterSyntaxError("bad indentation in block scalar", number + 1)
+                body.append(raw[block_indent:])
+            else:
+                body.append('')
+            number += 1
+
+        trailing = 0
+        while body and not body[-1]:
+            body.pop()
+            trailing += 1
+        if style == '|':
+            value = '\n'.join(body)
+        else:
+            # Folded: single line breaks become spaces, blank lines become
+            # line breaks; more-indented lines keep their breaks
+            value = ''
+            previous = None
+            blank = 0
+            for part in body:
+                if not part:
+                    blank += 1
+                    continue
+                if previous is None or blank:
+                    value += '\n' * blank
+                elif part[0] == ' ' or previous[0] == ' ':
+                    value += '\n'
+                else:
+                    value += ' '
+                value += part
+                previous = part
+                blank = 0
+        if body:
+            if chomping == '+':
+                value += '\n' * (trailing + 1)
+            elif chomping != '-':
+                value += '\n'
+        elif chomping == '+':
+            value = '\n' * trailing
+
+        # Skip the content lines consumed by the block scalar
+        i += 1
+        while i < len(self.lines) and self.lines[i][2] <= number:
+            i += 1
+        return value, i
+
+
+def parse_frontmatter_subset(yaml_content: str) -> Any:
+    """Parse frontmatter with the built-in subset parser (no PyYAML needed)."""
+    return SubsetParser(yaml_content).parse()
+
+
+def load_frontmatter(yaml_content: str) -> Dict[str, Any]:
+    """Load frontmatter YAML into a dict with the loader named by LOADER.
+
+    Raises ValueError (yaml.YAMLError is re-raised as ValueError) on bad YAML.
+    """
+    if LOADER == 'libyaml' and HAS_LIBYAML:
+        try:
+            data = yaml.load(yaml_content, Loader=CSafeLoader)
+        except yaml.YAMLError as e:
+            raise ValueError(str(e))
+    else:
+        try:
+            data = parse_frontmatter_subset(yaml_content)
+        except FrontmatterSyntaxError:
+            if not HAS_YAML:
+                raise
+            try:
+                data = yaml.safe_load(yaml_content)
+            except yaml.YAMLError as e:
+                raise ValueError(str(e))
+    return data or {}
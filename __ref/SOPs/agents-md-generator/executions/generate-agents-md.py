@@ -0,0 +1,745 @@
+#!/usr/bin/env python3
+"""
+generate-agents-md.py - Render AGENTS.md from the template and context JSON
+
+Purpose: Fill directives/AGENTS-MD-TEMPLATE.md deterministically from
+         [TARGET_FOLDER]_context.json (Phase 3): frontmatter `files`,
+         `contextual_snippets`, `key_concepts` and `outcomes`, the tier file
+         lists, the Document Guide (one section per file) and the quick links.
+         Prose is drafted from the data so the agent only has to refine it.
+         Output is rendered line by line and streamed to disk, so large
+         inventories are never held as a single string.
+         With --update an existing AGENTS.md is patched instead: only the
+         entries of files whose frontmatter data changed are rewritten
+         (see agents_md_patch.py), so refined prose elsewhere survives.
+
+Usage:
+    python generate-agents-md.py [TARGET_FOLDER_PATH] [CONTEXT_JSON_FILE] [--analysis FILE]
+                                 [--output FILE] [--template FILE] [--title T] [--version V]
+                                 [--status S] [--force] [--update]
+
+    --analysis   [TARGET_FOLDER]_analysis.json, used for the Key Sections of each file
+    --output     Where to write (default: TARGET_FOLDER_PATH/AGENTS.md, "-" for stdout)
+    --template   Template to render (default: directives/AGENTS-MD-TEMPLATE.md)
+    --force      Overwrite a manually created AGENTS.md (a backup is written first)
+    --update     Patch the changed file entries of an existing AGENTS.md in place
+                 (falls back to a full rewrite if its layout does not match the template)
+
+    AGENTS.md is written to a temp file and renamed over the old one. The old
+    version is kept as a reverse delta, AGENTS.md.backup.<timestamp>.diff
+    (restore with check-existing-agents-md.py --restore).
+
+    CONTEXT_JSON_FILE may also be a streamed [TARGET_FOLDER]_context.ndjson or a
+    columnar [TARGET_FOLDER]_context.mdcol (and --analysis likewise).
+
+Exit codes:
+    0 = Success
+    1 = Error (file not found, rendering failure)
+    2 = AGENTS.md exists and was manually created (not overwritten)
+"""
+
+import ast
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Sequence, Union
+
+from agents_md_patch import merge_documents
+from columnar_store import ColumnarFile, is_columnar
+from tier_planner import count_tokens
+
+TEMPLATE_FILE = Path(__file__).resolve().parent.parent / 'directives' / 'AGENTS-MD-TEMPLATE.md'
+
+GENERATOR_NAME = 'agents-md-generator'
+# Layout version written to the `generator:` frontmatter field ("agents-md-generator/1");
+# bump it when the generated structure changes
+GENERATOR_VERSION = '1'
+
+# Placeholders look like [NAME] or [NAME - hint for the agent]
+PLACEHOLDER = re.compile(r'\[([A-Z][A-Z0-9_]*)(?: - [^\]]*)?\]')
+
+# Template instruction comments that are never delivered
+INSTRUCTION_PREFIXES = ('# REPLACE:', '# EXTRACT:', '# FORMAT:', '# GENERATE:', '# REPEAT:',
+                        '# ADD MORE', '# Use the same format')
+GUIDE_MARKER = '# PLACEHOLDER REPLACEMENT GUIDE'
+
+# The Document Guide block repeated for every file starts with this heading
+GUIDE_BLOCK_START = re.compile(r'^### 1\. \*\*\[FILE_NAME\]\*\*')
+# Numbered list items inside the guide block (CONTAINS_ITEM_1, KEY_SECTION_2, ...)
+GUIDE_LIST_ITEM = re.compile(r'^- \[(CONTAINS_ITEM|USE_WHEN_SCENARIO|KEY_SECTION|ADD_MORE)(?:_(\d+))?\b')
+
+TIER_DESCRIPTIONS = {
+    1: 'Essential - load first',
+    2: 'Core - load on demand',
+    3: 'Reference - load only when needed'
+}
+TIER_SCENARIOS = {
+    1: 'Starting work in this folder and deciding which files to load next',
+    2: 'Executing the task this file describes',
+    3: 'Looking up background or historical detail'
+}
+
+# Key Sections listed per file when the context has sections (--sections)
+MAX_GUIDE_SECTIONS = 12
+
+# validate-agents-md.py expects at least this many key concepts
+MIN_KEY_CONCEPTS = 3
+
+
+class ContextFiles:
+    """Re-iterable view of the file records in a context JSON, NDJSON or columnar file.
+
+    NDJSON and columnar input is re-read on every pass instead of being held
+    in memory; a columnar file is mapped only while a pass runs.
+    """
+
+    def __init__(self, records: Optional[Sequence[Dict[str, Any]]] = None, ndjson_file: Optional[str] = None,
+                 columnar_file: Optional[str] = None):
+        self.records = records
+        self.ndjson_file = ndjson_file
+        self.columnar_file = columnar_file
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self.records is not None:
+            return iter(self.records)
+        if self.columnar_file is not None:
+            return self._read_columnar()
+        return self._read()
+
+    def _read_columnar(self) -> Iterator[Dict[str, Any]]:
+        with ColumnarFile(self.columnar_file) as store:
+            yield from store
+
+    def _read(self) -> Iterator[Dict[str, Any]]:
+        with open(self.ndjson_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.pop('record', 'file') == 'file':
+                    yield record
+
+
+def load_context(context: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the context dict with a re-iterable 'files' entry.
+
+    Accepts the dict returned by extract_context(), a path to
+    `<folder>_context.json`, a streamed `<folder>_context.ndjson` or a
+    columnar `<folder>_context.mdcol` (records decoded on each pass).
+    """
+    if isinstance(context, dict):
+        return dict(context, files=ContextFiles(context.get('files', [])))
+    if is_columnar(context):
+        with ColumnarFile(context) as store:
+            meta = store.meta
+        return dict(meta, files=ContextFiles(columnar_file=str(context)))
+    if str(context).endswith(('.ndjson', '.jsonl')):
+        header, summary = {}, {}
+        with open(context, 'r', encoding='utf-8') as f:
+            first = f.readline()
+            header = json.loads(first) if first.strip() else {}
+            for line in f:
+                if line.startswith('{"record":"summary"'):
+                    summary = json.loads(line)
+        if header.pop('record', None) != 'header':
+            raise ValueError(f"Not an NDJSON context stream: {context}")
+        summary.pop('record', None)
+        return dict(header, **summary, files=ContextFiles(ndjson_file=str(context)))
+    with open(context, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return dict(data, files=ContextFiles(data.get('files', [])))
+
+
+def load_headings(analysis: Union[str, Dict[str, Any], None]) -> Dict[str, List[str]]:
+    """Map file name -> headings from the analysis (empty without analysis)."""
+    if analysis is None:
+        return {}
+    if not isinstance(analysis, dict):
+        if is_columnar(analysis):
+            # Only the two columns needed are decoded
+            with ColumnarFile(analysis) as store:
+                return dict(zip(store.column('name'), store.column('headings', [])))
+        if str(analysis).endswith(('.ndjson', '.jsonl')):
+            headings = {}
+            with open(analysis, 'r', encoding='utf-8') as f:
+                for line in f:
+                    record = json.loads(line) if line.strip() else {}
+                    if record.get('record') == 'file':
+                        headings[record['name']] = record.get('headings', [])
+            return headings
+        with open(analysis, 'r', encoding='utf-8') as f:
+            analysis = json.load(f)
+    return {f['name']: f.get('headings', []) for f in analysis.get('files', [])}
+
+
+def record_tokens(record: Dict[str, Any]) -> int:
+    """Token estimate from extract-context.py, or from the word count for older context files."""
+    tokens = record.get('tokens')
+    return tokens if tokens is not None else count_tokens(record.get('word_count', 0))
+
+
+def section_links(record: Dict[str, Any]) -> List[str]:
+    """`file.md#anchor` links with byte ranges for a record's sections (see md_sections.py)."""
+    links = []
+    for section in record.get('sections', []):
+        if section['anchor'] and len(links) < MAX_GUIDE_SECTIONS:
+            # Brackets would end the link text early
+            label = section['heading'].replace('[', '').replace(']', '')
+            links.append(f"[{label}]({record['name']}#{section['anchor']}) - "
+                         f"bytes {section['start']}-{section['end']}, ~{section['tokens']:,} tokens")
+    return links
+
+
+def inline(text: Any) -> str:
+    """Collapse a value onto one line for use in markdown text."""
+    return ' '.join(str(text).split())
+
+
+def yaml_string(value: Any) -> str:
+    """Quote a value as a YAML scalar (JSON strings are valid YAML)."""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def script_purpose(script: Path) -> str:
+    """First line of a Python script's module docstring ("name.py - purpose")."""
+    try:
+        docstring = ast.get_docstring(ast.parse(script.read_text(encoding='utf-8'))) or ''
+    except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+        docstring = ''
+    first = docstring.strip().split('\n')[0].strip()
+    if ' - ' in first and first.split(' - ', 1)[0].endswith('.py'):
+        first = first.split(' - ', 1)[1].strip()
+    return first or 'Python script'
+
+
+class TemplateRenderer:
+    """Render AGENTS-MD-TEMPLATE.md for one folder's context, line by line."""
+
+    def __init__(self, context: Union[str, Dict[str, Any]], analysis: Union[str, Dict[str, Any], None] = None,
+                 metadata: Optional[Dict[str, str]] = None):
+        self.context = load_context(context)
+        self.files = self.context['files']
+        self.headings = load_headings(analysis)
+        self.folder = Path(self.context.get('folder_path') or '.')
+        self.folder_name = self.context.get('folder_name') or self.folder.name
+        self._collect_stats()
+        self.key_concepts = self._key_concepts()
+        self.values = self._scalar_values(metadata or {})
+
+    def _collect_stats(self):
+        """One streaming pass for counts, totals and each tier's lead file."""
+        self.total_files = 0
+        self.total_words = 0
+        self.total_tokens = 0
+        self.tier_counts = {1: 0, 2: 0, 3: 0}
+        self.tier_tokens = {1: 0, 2: 0, 3: 0}
+        self.tier_leads = {}
+        self.first_file = None
+        self.readme = None
+        # Keyword -> number of files listing it, in first-seen order
+        self.keyword_counts = {}
+        for record in self.files:
+            self.total_files += 1
+            for keyword in record.get('keywords', []):
+                self.keyword_counts[keyword] = self.keyword_counts.get(keyword, 0) + 1
+            self.total_words += record.get('word_count', 0)
+            tokens = record_tokens(record)
+            self.total_tokens += tokens
+            tier = record.get('tier', 3)
+            self.tier_counts[tier] = self.tier_counts.get(tier, 0) + 1
+            self.tier_tokens[tier] = self.tier_tokens.get(tier, 0) + tokens
+            self.tier_leads.setdefault(tier, record)
+            if self.first_file is None:
+                self.first_file = record
+            if self.readme is None and Path(record['name']).stem.lower() == 'readme':
+                self.readme = record
+
+    def _key_concepts(self) -> List[str]:
+        """The context's key concepts, padded to MIN_KEY_CONCEPTS.
+
+        Short lists are filled with the keywords most files list, then the
+        folder name and file names.
+        """
+        concepts = list(self.context.get('key_concepts') or [])
+        if len(concepts) >= MIN_KEY_CONCEPTS:
+            return concepts
+        keywords = sorted(self.keyword_counts, key=lambda k: -self.keyword_counts[k])
+        stems = [Path(record['name']).stem for record in self.files]
+        seen = {concept.lower() for concept in concepts}
+        for candidate in keywords + [self.folder_name] + stems:
+            if len(concepts) >= MIN_KEY_CONCEPTS:
+                break
+            if candidate and candidate.lower() not in seen:
+                seen.add(candidate.lower())
+                concepts.append(candidate)
+        return concepts
+
+    def first_tier(self) -> Optional[int]:
+        """The tier an agent loads first: tier 1, or the lowest tier with files."""
+        return min((tier for tier, count in self.tier_counts.items() if count), default=None)
+
+    def lead(self, tier: int, exclude: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """First file of a tier, falling back to the nearest other tier."""
+        for candidate in [tier] + [t for t in (1, 2, 3) if t != tier]:
+            record = self.tier_leads.get(candidate)
+            if record is not None and record['name'] != exclude:
+                return record
+        return self.first_file
+
+    def _scalar_values(self, metadata: Dict[str, str]) -> Dict[str, str]:
+        title = metadata.get('title') or self._folder_title()
+        max_tokens = self.total_tokens
+        first = self.first_tier()
+        typical_tokens = self.tier_tokens[first] if first is not None else 0
+        savings = max(0, int(round(100 * (1 - typical_tokens / max_tokens)))) if max_tokens else 0
+        if first is None:
+            typical = "~0 tokens (no files)"
+        else:
+            typical = (f"~{typical_tokens:,} tokens (the {self.tier_counts[first]} tier {first} file(s), "
+                       "loaded first)")
+        concepts = ', '.join(self.key_concepts[:5]) or 'the documents in this folder'
+        description = (f"{self.total_files} markdown files (~{self.total_words:,} words) "
+                       f"covering {concepts}")
+        if self.readme and self.readme.get('snippet') and self.readme['snippet'] != 'Documentation file':
+            description = self.readme['snippet']
+        tiers = ', '.join(f"{count} tier {tier}" for tier, count in sorted(self.tier_counts.items()) if count)
+        overview = (f"This folder contains {self.total_files} markdown files with about "
+                    f"{self.total_words:,} words in total ({tiers}). "
+                    f"The main topics are {concepts}. "
+                    "Files are grouped into loading tiers so an agent reads the essential files first "
+                    "and loads reference material only when a task needs it.")
+        date = datetime.now().strftime('%Y-%m-%d')
+        return {
+            'FOLDER_TITLE': title,
+            'VERSION': metadata.get('version') or '1.0.0',
+            'AUTHOR': GENERATOR_NAME,
+            'GENERATOR': f'{GENERATOR_NAME}/{GENERATOR_VERSION}',
+            'DATE': date,
+            'STATUS': metadata.get('status') or 'Draft',
+            'FRAMEWORK': 'Not specified',
+            'PROJECT_NAME': self.folder_name,
+            'OUTPUT_EXPECTED': f"Progressive-loading index of {self.total_files} markdown files",
+            'EXECUTION_TIME': f"~{max(1, -(-self.total_words // 2000))} minutes to read everything; "
+                              "Level 1 + 2 load instantly",
+            'FOLDER_DESCRIPTION': description,
+            'BRIEF_DESCRIPTION': description,
+            'OVERVIEW_TEXT': overview,
+            'CORE_PURPOSE': description,
+            'KEY_OUTCOME': "AI agents find and load only the files a task needs",
+            'TARGET': f"AI/LLM agents working in {self.folder_name}",
+            'MAX_TOKENS': f"{max_tokens:,}",
+            'TYPICAL_CONTEXT': typical,
+            'SAVINGS_PERCENT': str(savings),
+            'PERCENT': str(savings),
+            'OUTPUT_STRUCTURE': f"{self.folder_name} contains {self.total_files} markdown files ({tiers}).",
+            'FILE_COUNT': str(self.total_files),
+            'TOTAL_WORDS': f"{self.total_words:,}",
+            'QUALITY_STANDARD': "validated with validate-agents-md.py",
+            'VALIDATION_METHOD': "validate-agents-md.py"
+        }
+
+    def _folder_title(self) -> str:
+        """README's first heading if there is one, otherwise the folder name."""
+        if self.readme:
+            headings = self.headings.get(self.readme['name'])
+            if headings and headings[0]:
+                return headings[0]
+        return re.sub(r'[-_]+', ' ', self.folder_name).strip().title() or self.folder_name
+
+    def outcomes(self) -> List[str]:
+        """Three outcomes; the loading ones only claim what the tier loads support."""
+        max_tokens = self.total_tokens
+        first = self.first_tier()
+        outcomes = ["Pick the right file for a task from its purpose and use_when"]
+        if first is not None and self.tier_counts[first] < self.total_files:
+            outcomes.append(f"Load the {self.tier_counts[first]} tier {first} file(s) first "
+                            "and the rest only on demand")
+            outcomes.append(f"Work with ~{self.tier_tokens[first]:,} tokens of context "
+                            f"instead of ~{max_tokens:,}")
+        else:
+            outcomes.append("Load each file only when a task needs it")
+            outcomes.append(f"Know each file's size before loading it (~{max_tokens:,} tokens in total)")
+        return outcomes
+
+    # Substitution
+
+    def substitute(self, line: str, values: Dict[str, str]) -> str:
+        """Replace known placeholders; unknown ones are left for the agent."""
+        def replace(match):
+            value = values.get(match.group(1))
+            if value is None:
+                return match.group(0)
+            value = inline(value)
+            start, end = match.span()
+            if line[start - 1:start] == '"' and line[end:end + 1] == '"':
+                return yaml_string(value)[1:-1]
+            return value
+        return PLACEHOLDER.sub(replace, line)
+
+    def line_values(self, line: str) -> Dict[str, str]:
+        """Scalar values plus bindings implied by the line (a tier's lead file)."""
+        values = self.values
+        match = re.search(r'\[(TIER_([123])_FILE|ANOTHER_FILE|EXAMPLE_FILE)\]', line)
+        if match:
+            if match.group(2):
+                record = self.lead(int(match.group(2)))
+            elif match.group(1) == 'ANOTHER_FILE':
+                record = self.readme or self.lead(1, exclude=(self.lead(3) or {}).get('name'))
+            else:
+                record = self.lead(1)
+            if record is not None:
+                values = dict(values, **{
+                    match.group(1): record['name'],
+                    'WORD_COUNT': f"{record.get('word_count', 0):,}",
+                    'EXAMPLE_SNIPPET': record.get('snippet', ''),
+                    'EXAMPLE_KEYWORDS': json.dumps(record.get('keywords', [])[:5], ensure_ascii=False)
+                })
+        elif '[EXAMPLE_' in line and self.first_file is not None:
+            record = self.lead(1)
+            values = dict(values, EXAMPLE_SNIPPET=record.get('snippet', ''),
+                          EXAMPLE_KEYWORDS=json.dumps(record.get('keywords', [])[:5], ensure_ascii=False))
+        return values
+
+    # Frontmatter lists
+
+    def frontmatter_list(self, key: str) -> Iterator[str]:
+        if key == 'contextual_snippets':
+            for record in self.files:
+                yield f"  - snippet: {yaml_string(record.get('snippet', ''))}"
+                yield f"    keywords: {json.dumps(record.get('keywords', []), ensure_ascii=False)}"
+                yield f"    file: {yaml_string(record['name'])}"
+                yield f"    tier: {record.get('tier', 3)}"
+        elif key == 'files':
+            for record in self.files:
+                yield f"  - name: {yaml_string(record['name'])}"
+                yield f"    purpose: {yaml_string(record.get('purpose', ''))}"
+                yield f"    use_when: {yaml_string(record.get('use_when', ''))}"
+                yield f"    tier: {record.get('tier', 3)}"
+                yield f"    word_count: {record.get('word_count', 0)}"
+                yield f"    tokens: {record_tokens(record)}"
+                if record.get('aliases'):
+                    yield f"    aliases: {json.dumps(record['aliases'], ensure_ascii=False)}"
+        elif key == 'key_concepts':
+            for concept in self.key_concepts:
+                yield f"  - {yaml_string(concept)}"
+        elif key == 'outcomes':
+            for outcome in self.outcomes():
+                yield f"  - {yaml_string(outcome)}"
+
+    # Body lists
+
+    def body_list(self, name: str) -> Iterator[str]:
+        tier = re.match(r'TIER_([123])_FILES$', name)
+        if tier:
+            found = False
+            for record in self.files:
+                if record.get('tier', 3) == int(tier.group(1)):
+                    found = True
+                    yield (f"- `{record['name']}` (~{record.get('word_count', 0):,} words) - "
+                           f"{inline(record.get('purpose', ''))}")
+            if not found:
+                yield "- None"
+        elif name == 'LIST_SCRIPTS':
+            scripts = sorted(self.folder.glob('*.py')) if self.folder.is_dir() else []
+            for script in scripts:
+                yield f"- `{script.name}` - {script_purpose(script)}"
+            if not scripts:
+                yield "- None (this folder has no Python scripts)"
+        elif name == 'QUICK_LINKS':
+            for record in self.files:
+                yield (f"- **Tier {record.get('tier', 3)}:** [`{record['name']}`]({record['name']}) - "
+                       f"{inline(record.get('purpose', ''))}")
+
+    # Document Guide
+
+    def guide_sections(self, block: List[str]) -> Iterator[str]:
+        """Render the Document Guide block once per file."""
+        for index, record in enumerate(self.files, 1):
+            if index > 1:
+                yield ''
+                yield '---'
+                yield ''
+            tier = record.get('tier', 3)
+            headings = [h for h in self.headings.get(record['name'], []) if h]
+            values = dict(self.values, **{
+                'FILE_NAME': record['name'],
+                'FILE_PURPOSE_SHORT': record.get('file_type', 'documentation').replace('_', ' ').title(),
+                'FILE_PURPOSE': record.get('purpose', ''),
+                'TIER_ASSIGNMENT': str(tier),
+                'TIER_DESCRIPTION': TIER_DESCRIPTIONS.get(tier, ''),
+                'WORD_COUNT': f"{record.get('word_count', 0):,}"
+            })
+            lists = {
+                'CONTAINS_ITEM': [record.get('snippet', '')] +
+                                 [f"Topics: {', '.join(record.get('keywords', [])[:6])}"] +
+                                 headings[1:4],
+                'USE_WHEN_SCENARIO': [record.get('use_when', ''), TIER_SCENARIOS.get(tier, '')],
+                'KEY_SECTION': section_links(record) or headings[:6] or record.get('keywords', [])[:3]
+            }
+            for line in block:
+                item = GUIDE_LIST_ITEM.match(line)
+                if item:
+                    if item.group(2) == '1':
+                        for entry in lists[item.group(1)]:
+                            if entry:
+                                yield f"- {inline(entry)}"
+                    continue
+                if index > 1 and GUIDE_BLOCK_START.match(line):
+                    line = line.replace('### 1.', f'### {index}.', 1)
+                yield self.substitute(line, values)
+
+    # Rendering
+
+    def render(self, template_lines: List[str]) -> Iterator[str]:
+        """Yield the rendered AGENTS.md line by line."""
+        end = len(template_lines)
+        for i, line in enumerate(template_lines):
+            if line.strip() == GUIDE_MARKER:
+                end = i
+                break
+        lines = template_lines[:end]
+        while lines and lines[-1].strip() in ('', '---'):
+            lines.pop()
+
+        i = 0
+        in_frontmatter = bool(lines) and lines[0].strip() == '---'
+        if in_frontmatter:
+            yield '---'
+            i = 1
+        while i < len(lines):
+            line = lines[i]
+            stripped = line.strip()
+            i += 1
+
+            if in_frontmatter:
+                if stripped == '---':
+                    in_frontmatter = False
+                    yield '---'
+                elif stripped.startswith('#'):
+                    continue
+                elif re.match(r'^[a-z_]+:\s*$', line):
+                    key = stripped[:-1]
+                    yield line.rstrip()
+                    while i < len(lines) and (lines[i].startswith((' ', '\t')) or lines[i].strip().startswith('#')):
+                        i += 1
+                    yield from self.frontmatter_list(key)
+                else:
+                    key, sep, value = line.partition(':')
+                    value = value.strip()
+                    match = PLACEHOLDER.fullmatch(value)
+                    if sep and match and match.group(1) in self.values:
+                        yield f"{key}: {yaml_string(self.values[match.group(1)])}"
+                    else:
+                        yield self.substitute(line, self.values)
+                continue
+
+            if stripped.startswith(INSTRUCTION_PREFIXES):
+                continue
+
+            if GUIDE_BLOCK_START.match(line):
+                block = [line]
+                while i < len(lines) and lines[i].strip() != '---':
+                    block.append(lines[i])
+                    i += 1
+                while block and not block[-1].strip():
+                    block.pop()
+                yield from self.guide_sections(block)
+                continue
+
+            header = PLACEHOLDER.fullmatch(stripped)
+            if header and header.group(1) in ('TIER_1_FILES', 'TIER_2_FILES', 'TIER_3_FILES',
+                                              'LIST_SCRIPTS', 'QUICK_LINKS'):
+                while i < len(lines) and lines[i].startswith('- '):
+                    i += 1
+                yield from self.body_list(header.group(1))
+                continue
+
+            yield self.substitute(line, self.line_values(line))
+
+
+def tidy(lines: Iterable[str]) -> Iterator[str]:
+    """Collapse blank-line runs and repeated `---` rules left by removed template text."""
+    previous = None
+    last_content = None
+    for line in lines:
+        if not line.strip():
+            line = ''
+        if not line and previous == '':
+            continue
+        if line == '---' and last_content == '---' and previous is not None:
+            continue
+        if line:
+            last_content = line
+        previous = line
+        yield line
+
+
+def render_agents_md(context: Union[str, Dict[str, Any]], analysis: Union[str, Dict[str, Any], None] = None,
+                     template_file: Union[str, Path, None] = None,
+                     metadata: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    """Yield the lines of AGENTS.md rendered from the template and context."""
+    with open(template_file or TEMPLATE_FILE, 'r', encoding='utf-8') as f:
+        template_lines = f.read().split('\n')
+    renderer = TemplateRenderer(context, analysis, metadata)
+    return tidy(renderer.render(template_lines))
+
+
+def read_agents_md(path: Union[str, Path]) -> List[str]:
+    """Lines of an AGENTS.md as written by write_agents_md()."""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    if lines[-1] == '':
+        lines.pop()
+    return lines
+
+
+def write_agents_md(output_file: Union[str, Path], lines: Iterable[str],
+                    before_replace: Optional[Callable[[Path], Any]] = None) -> int:
+    """Stream rendered lines to output_file atomically; returns the line count.
+
+    before_replace(tmp_file) runs once the new file is complete, just before
+    it is renamed over output_file (used to back up the old version).
+    """
+    output_file = Path(output_file)
+    tmp_file = output_file.with_name(output_file.name + '.tmp')
+    count = 0
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for line in lines:
+                f.write(line + '\n')
+                count += 1
+        if before_replace:
+            before_replace(tmp_file)
+        os.replace(tmp_file, output_file)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+    return count
+
+
+def generate_agents_md(folder_path: str, context: Union[str, Dict[str, Any]],
+                       analysis: Union[str, Dict[str, Any], None] = None,
+                       output_file: Union[str, Path, None] = None, backup: bool = True,
+                       force: bool = False, template_file: Union[str, Path, None] = None,
+                       metadata: Optional[Dict[str, str]] = None, patch: bool = False) -> Dict[str, Any]:
+    """Render and write AGENTS.md for a folder, honouring the pre-write check.
+
+    A manually created AGENTS.md is only overwritten with `force`; an
+    existing file is backed up (as a reverse delta) unless `backup` is False.
+    With `patch`, only the entries of changed files are replaced in the
+    existing file; `mode` in the result is 'full', 'patch' or 'unchanged'
+    (nothing written).
+    """
+    from script_loader import load_execution
+    checker = load_execution('check-existing-agents-md.py')
+
+    output_file = Path(output_file) if output_file else Path(folder_path) / 'AGENTS.md'
+    existing = {'status': 'not_exists'}
+    if output_file.exists():
+        existing = {'status': 'tool_generated' if checker.is_generated_by_tool(output_file) else 'manually_created'}
+    if existing['status'] == 'manually_created' and not force:
+        return {'written': False, 'status': existing['status'], 'path': str(output_file)}
+
+    lines = render_agents_md(context, analysis, template_file, metadata)
+    mode = 'full'
+    changes = None
+    if patch and output_file.exists():
+        old_lines = read_agents_md(output_file)
+        new_lines = list(lines)
+        merged = merge_documents(old_lines, new_lines)
+        if merged is None:
+            lines = new_lines
+        elif merged[0] == old_lines:
+            return {'written': False, 'status': existing['status'], 'path': str(output_file),
+                    'mode': 'unchanged', 'changes': merged[1]}
+        else:
+            lines, changes = merged
+            mode = 'patch'
+
+    backups = []
+    before_replace = None
+    if output_file.exists() and backup:
+        before_replace = lambda tmp_file: backups.append(checker.create_delta_backup(output_file, tmp_file))
+
+    count = write_agents_md(output_file, lines, before_replace)
+    return {
+        'written': True,
+        'status': existing['status'],
+        'path': str(output_file),
+        'backup': backups[0] if backups else None,
+        'lines': count,
+        'mode': mode,
+        'changes': changes
+    }
+
+
+def main():
+    """Main execution function."""
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render AGENTS.md from the template and context JSON")
+    parser.add_argument('folder_path', nargs='?', metavar='TARGET_FOLDER_PATH')
+    parser.add_argument('context_file', nargs='?', metavar='CONTEXT_JSON_FILE')
+    parser.add_argument('--analysis', metavar='FILE', help="Analysis JSON, used for Key Sections")
+    parser.add_argument('--output', metavar='FILE',
+                        help="Output file (default: TARGET_FOLDER_PATH/AGENTS.md, '-' for stdout)")
+    parser.add_argument('--template', metavar='FILE', help="Template (default: directives/AGENTS-MD-TEMPLATE.md)")
+    parser.add_argument('--title', help="Folder title (default: README heading or folder name)")
+    parser.add_argument('--version', help="Package version (default: 1.0.0)")
+    parser.add_argument('--status', help="Package status (default: Draft)")
+    parser.add_argument('--force', action='store_true', help="Overwrite a manually created AGENTS.md")
+    parser.add_argument('--update', action='store_true',
+                        help="Patch only the changed file entries of an existing AGENTS.md")
+    args = parser.parse_args()
+
+    if not args.folder_path or not args.context_file:
+        print("Error: Target folder path and context JSON file required", file=sys.stderr)
+        print("Usage: python generate-agents-md.py [TARGET_FOLDER_PATH] [CONTEXT_JSON_FILE]", file=sys.stderr)
+        sys.exit(1)
+
+    metadata = {'title': args.title, 'version': args.version, 'status': args.status}
+
+    try:
+        if not Path(args.folder_path).is_dir():
+            raise FileNotFoundError(f"Target folder not found: {args.folder_path}")
+
+        if args.output == '-':
+            for line in render_agents_md(args.context_file, args.analysis, args.template, metadata):
+                sys.stdout.write(line + '\n')
+            sys.exit(0)
+
+        result = generate_agents_md(args.folder_path, args.context_file, args.analysis, args.output,
+                                    force=args.force, template_file=args.template, metadata=metadata,
+                                    patch=args.update)
+        if result.get('mode') == 'unchanged':
+            print(f"AGENTS.md up to date: {result['path']} (no file entries changed)")
+            sys.exit(0)
+        if not result['written']:
+            print(f"Error: {result['path']} exists and was manually created - not overwritten "
+                  f"(use --force to back it up and overwrite)", file=sys.stderr)
+            sys.exit(2)
+
+        if result['mode'] == 'patch':
+            changes = result['changes']
+            print(f"AGENTS.md patched: {result['path']} ({len(changes['changed'])} changed, "
+                  f"{len(changes['added'])} added, {len(changes['removed'])} removed)")
+        else:
+            print(f"AGENTS.md generated: {result['path']} ({result['lines']} lines)")
+        if result['backup']:
+            print(f"  Backup: {result['backup']}")
+        print("  Next: review the drafted prose, then run validate-agents-md.py")
+        sys.exit(0)
+
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error: Generation failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+keyword_engine.py - Corpus-level keyword scoring (BM25) for a folder
+
+Purpose: Turn each markdown file into a sparse term vector (weighted by
+         field: file name, explicit keywords, headings, body) and rank its
+         terms by BM25 against the document frequencies of the whole
+         folder, so keywords are the terms that set a file apart rather
+         than the longest words in its headings
+
+Document frequencies are a Counter updated per file (add/remove), so a
+changed file costs one vector update instead of a rebuild. Term vectors
+are plain dicts and can be cached next to the context records.
+
+Usage:
+    from keyword_engine import KeywordIndex, term_vector
+
+    index = KeywordIndex()
+    for key, doc in enumerate(docs):
+        index.add(key, term_vector([(doc.name, 3), (doc.body, 1)]))
+    print(index.top_keywords(0, 10))
+"""
+
+import heapq
+import math
+import string
+import sys
+from collections import Counter
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Candidate terms scored per file (highest weighted term frequency first)
+MAX_TERMS = 64
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Byte translation table: ASCII letters/digits are kept, everything else separates terms
+SEPARATORS = bytes(c if chr(c) in string.ascii_lowercase + string.digits else 32 for c in range(256))
+
+STOPWORDS = frozenset('''
+    about above after again against also although always among another any anything are
+    because been before being below between both but can cannot could did does doing done
+    down during each either else even ever every few for from further get gets had has have
+    having her here hers herself him himself his how however into its itself just least
+    less let like made make many may might more most much must near need needs neither
+    never nor not now off often once one only other our ours ourselves out over own per
+    rather same see she should since some such than that the their theirs them themselves
+    then there these they this those though through thus too under until upon use used
+    uses using very via was way well were what when where whether which while who whom
+    whose why will with within without would yet you your yours yourself yourselves
+    all and nbsp http https www com org html etc
+'''.split())
+
+
+def count_terms(text: str) -> Counter:
+    """Count the terms of `text`: lowercase [a-z][a-z0-9]{2,} runs, stopwords removed.
+    
+    Splits with bytes.translate() instead of a regex and decodes each
+    distinct term once, which is several times cheaper on large files.
+    """
+    counts = Counter()
+    words = text.lower().encode('ascii', 'replace').translate(SEPARATORS).split()
+    for word, count in Counter(words).items():
+        term = word.lstrip(b'0123456789')
+        if len(term) >= 3:
+            counts[term.decode('ascii')] += count
+    for term in STOPWORDS.intersection(counts):
+        del counts[term]
+    return counts
+
+
+def term_vector(fields: Iterable[Tuple[str, int]], explicit: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Sparse term vector of a document from (text, weight) fields.
+
+    Returns a JSON-serializable dict: `terms` (the MAX_TERMS most frequent
+    terms with weighted counts), `rest` (every other distinct term, counted
+    for document frequency only), `length` (weighted term count) and
+    `explicit` (author-supplied keywords, always listed first).
+    """
+    counts = Counter()
+    for text, weight in fields:
+        if not text:
+            continue
+        field_counts = count_terms(text)
+        if weight != 1:
+            for term in field_counts:
+                field_counts[term] *= weight
+        counts.update(field_counts)
+
+    top = counts.most_common(MAX_TERMS)
+    terms = {sys.intern(term): count for term, count in top}
+    return {
+        'terms': terms,
+        'rest': [sys.intern(term) for term in counts if term not in terms],
+        'length': sum(counts.values()),
+        'explicit': list(explicit or [])
+    }
+
+
+class KeywordIndex:
+    """Document frequencies and term vectors of a folder corpus."""
+
+    def __init__(self, k1: float = K1, b: float = B):
+        self.k1 = k1
+        self.b = b
+        self.df = Counter()
+        self.vectors = {}
+        self.total_length = 0
+        self._idf = {}  # memoized per term; cleared whenever the corpus changes
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def add(self, key: Hashable, vector: Dict[str, Any]):
+        """Add (or replace) the vector of document `key`."""
+        if key in self.vectors:
+            self.remove(key)
+        self._idf.clear()
+        self.vectors[key] = vector
+        self.df.update(vector['terms'].keys())
+        self.df.update(vector['rest'])
+        self.total_length += vector['length']
+
+    def remove(self, key: Hashable):
+        """Drop document `key` and its document-frequency contributions."""
+        vector = self.vectors.pop(key, None)
+        if vector is None:
+            return
+        self._idf.clear()
+        for term in list(vector['terms']) + vector['rest']:
+            self.df[term] -= 1
+            if self.df[term] <= 0:
+                del self.df[term]
+        self.total_length -= vector['length']
+
+    def compact(self, keep: List[Hashable]):
+        """Keep only documents `keep`, renumbered 0, 1, ... in that order."""
+        for key in set(self.vectors).difference(keep):
+            self.remove(key)
+        self.vectors = {position: self.vectors[key] for position, key in enumerate(keep)}
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency (never negative)."""
+        idf = self._idf.get(term)
+        if idf is None:
+            df = self.df.get(term, 0)
+            idf = self._idf[term] = math.log(1 + (len(self.vectors) - df + 0.5) / (df + 0.5))
+        return idf
+
+    def scores(self, key: Hashable, include_rest: bool = False) -> Dict[str, float]:
+        """BM25 score of every candidate term of document `key`.
+        
+        With include_rest, the remaining terms are scored too, as if each
+        occurred once (their exact counts are not kept).
+        """
+        vector = self.vectors[key]
+        average = self.total_length / len(self.vectors) or 1
+        norm = self.k1 * (1 - self.b + self.b * vector['length'] / average)
+        scores = {
+            term: self.idf(term) * tf * (self.k1 + 1) / (tf + norm)
+            for term, tf in vector['terms'].items()
+        }
+        if include_rest:
+            saturation = (self.k1 + 1) / (1 + norm)
+            for term in vector['rest']:
+                scores[term] = self.idf(term) * saturation
+        return scores
+
+    def top_keywords(self, key: Hashable, k: int = 10) -> List[str]:
+        """Explicit keywords first, then the k best-scoring terms (ties keep vector order)."""
+        keywords = list(dict.fromkeys(self.vectors[key]['explicit']))[:k]
+        if len(keywords) < k:
+            scores = self.scores(key)
+            taken = set(keywords)
+            ranked = heapq.nlargest(k, (t for t in scores if t not in taken), key=scores.__getitem__)
+            keywords.extend(ranked[:k - len(keywords)])
+        return keywords
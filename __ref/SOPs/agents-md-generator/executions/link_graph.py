@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+link_graph.py - Markdown link graph and link centrality
+
+Purpose: Collect the links between markdown files (`[x](other.md)`,
+         `[x]: ../docs/other.md`), build a directed graph over a folder or a
+         whole tree as adjacency arrays, and rank files by PageRank so that
+         files many others point to can be loaded first
+
+Graph layout (a dict, stored as `link_graph` in the analysis):
+    nodes         file keys (names, or paths relative to the root) of the
+                  analyzed files, in analysis order
+    offsets       len(nodes) + 1 ints; node i links to
+    targets       targets[offsets[i]:offsets[i + 1]] (node indices, no duplicates)
+    centrality    PageRank x node count per node (1.0 = average)
+    broken_links  [source key, target key] pairs of links to no analyzed file
+                  (missing files, or files outside the analysis); they are
+                  not nodes and take no part in the ranking
+
+Building is linear in the number of links; each PageRank iteration is
+linear in nodes + links.
+
+Usage:
+    from link_graph import build_link_graph, extract_links, linked_files
+
+    links = [extract_links(content) for content in contents]
+    graph = build_link_graph(names, links)
+    print(graph['centrality'][0], linked_files(graph, 0))
+"""
+
+import posixpath
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import unquote
+
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+# Stop once the ranks move less than this in total (L1)
+TOLERANCE = 1e-9
+CENTRALITY_DIGITS = 4
+
+# Inline links "](target" and reference definitions "]: target"
+INLINE_LINK = re.compile(r'\]\(\s*<?([^()\s<>]+)')
+REFERENCE_LINK = re.compile(r'\]:[ \t]+<?([^\s<>]+)')
+URL_SCHEME = re.compile(r'^[A-Za-z][A-Za-z0-9+.-]*:')
+
+
+def extract_links(content: str) -> List[str]:
+    """Markdown files a document links to, as written (anchors dropped), in order, once each."""
+    links = {}
+    for pattern in (INLINE_LINK, REFERENCE_LINK):
+        for target in pattern.findall(content):
+            if target.startswith('#') or URL_SCHEME.match(target):
+                continue
+            target = unquote(target.split('#', 1)[0].split('?', 1)[0])
+            if target.lower().endswith('.md'):
+                links[target] = None
+    return list(links)
+
+
+def resolve_link(source: str, target: str) -> str:
+    """Key of the file `target` points to, from the file keyed `source`."""
+    if target.startswith('/'):
+        return posixpath.normpath(target.lstrip('/'))
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source), target.replace('\\', '/')))
+
+
+def build_link_graph(keys: Sequence[str], links: Sequence[Sequence[str]],
+                     centrality: bool = True) -> Dict[str, Any]:
+    """Graph of the links (extract_links() per file) between the files keyed `keys`.
+
+    Links are resolved relative to each file's key; a link to a key outside
+    `keys` goes to 'broken_links' instead of the graph. Self-links are
+    dropped. Pass centrality=False to skip PageRank (the 'centrality' list
+    is then left out).
+    """
+    nodes = list(keys)
+    index = {key: i for i, key in enumerate(nodes)}
+    offsets = [0]
+    targets = []
+    broken = []
+    for source, file_links in zip(nodes, links):
+        own = index[source]
+        seen = set()
+        missing = set()
+        for target in file_links:
+            key = resolve_link(source, target)
+            i = index.get(key)
+            if i is None:
+                if key not in missing:
+                    missing.add(key)
+                    broken.append([source, key])
+            elif i != own and i not in seen:
+                seen.add(i)
+                targets.append(i)
+        offsets.append(len(targets))
+    # Files without links of their own (fewer `links` than `keys`)
+    offsets.extend([len(targets)] * (len(nodes) + 1 - len(offsets)))
+
+    graph = {'nodes': nodes, 'offsets': offsets, 'targets': targets, 'broken_links': broken}
+    if centrality:
+        graph['centrality'] = [round(rank * len(nodes), CENTRALITY_DIGITS)
+                               for rank in pagerank(offsets, targets)]
+    return graph
+
+
+def transpose(offsets: Sequence[int], targets: Sequence[int]) -> Tuple[List[int], List[int]]:
+    """Incoming adjacency arrays (offsets, sources) of a graph, by counting sort."""
+    n = len(offsets) - 1
+    counts = [0] * (n + 1)
+    for target in targets:
+        counts[target + 1] += 1
+    for i in range(n):
+        counts[i + 1] += counts[i]
+    in_offsets = counts[:]
+    sources = [0] * len(targets)
+    for source in range(n):
+        for target in targets[offsets[source]:offsets[source + 1]]:
+            sources[counts[target]] = source
+            counts[target] += 1
+    return in_offsets, sources
+
+
+def pagerank(offsets: Sequence[int], targets: Sequence[int], damping: float = DAMPING,
+             max_iterations: int = MAX_ITERATIONS, tolerance: float = TOLERANCE) -> List[float]:
+    """PageRank of every node (sums to 1); files without links spread their rank evenly."""
+    n = len(offsets) - 1
+    if n <= 0:
+        return []
+    in_offsets, sources = transpose(offsets, targets)
+    degree = [offsets[i + 1] - offsets[i] for i in range(n)]
+    dangling = [i for i in range(n) if not degree[i]]
+    incoming = [sources[in_offsets[i]:in_offsets[i + 1]] for i in range(n)]
+    rank = [1.0 / n] * n
+    for _ in range(max_iterations):
+        share = [r / d if d else 0.0 for r, d in zip(rank, degree)]
+        base = (1.0 - damping + damping * sum(rank[i] for i in dangling)) / n
+        new_rank = [base + damping * sum(map(share.__getitem__, into)) for into in incoming]
+        change = sum(abs(a - b) for a, b in zip(new_rank, rank))
+        rank = new_rank
+        if change < tolerance:
+            break
+    return rank
+
+
+def linked_files(graph: Dict[str, Any], i: int) -> List[str]:
+    """Keys of the files node i links to."""
+    nodes = graph['nodes']
+    offsets = graph['offsets']
+    return [nodes[t] for t in graph['targets'][offsets[i]:offsets[i + 1]]]
+
+
+def folder_view(graph: Dict[str, Any], members: Sequence[int], folder: str) -> Dict[str, Any]:
+    """The part of a tree graph seen from one folder of it.
+
+    `members` are the node indices of the folder's files (keys relative to
+    the tree root, `folder` being their folder). Nodes are re-keyed relative
+    to the folder: its files by name, linked files elsewhere as '../b/x.md'.
+    Centrality stays that of the whole tree; broken links are those of the
+    folder's files.
+    """
+    nodes = graph['nodes']
+    offsets = graph['offsets']
+    local = {}
+    view_nodes = []
+
+    def local_index(i: int) -> int:
+        if i not in local:
+            local[i] = len(view_nodes)
+            view_nodes.append(posixpath.relpath(nodes[i], folder or '.'))
+        return local[i]
+
+    for i in members:
+        local_index(i)
+    view_offsets = [0]
+    view_targets = []
+    for i in members:
+        view_targets.extend(local_index(t) for t in graph['targets'][offsets[i]:offsets[i + 1]])
+        view_offsets.append(len(view_targets))
+    view_offsets.extend([len(view_targets)] * (len(view_nodes) + 1 - len(view_offsets)))
+
+    sources = {nodes[i] for i in members}
+    view_broken = [[posixpath.relpath(source, folder or '.'), posixpath.relpath(target, folder or '.')]
+                   for source, target in graph.get('broken_links', ()) if source in sources]
+    view = {'nodes': view_nodes, 'offsets': view_offsets, 'targets': view_targets,
+            'broken_links': view_broken}
+    if 'centrality' in graph:
+        centrality = graph['centrality']
+        view['centrality'] = [0.0] * len(view_nodes)
+        for i, j in local.items():
+            view['centrality'][j] = centrality[i]
+    return view
+
+
+def node_index(graph: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Node key -> index ({} without a graph)."""
+    return {key: i for i, key in enumerate(graph['nodes'])} if graph else {}
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+md_document.py - Single-pass markdown document reader
+
+Purpose: Read each markdown file once into a reusable document record
+         (frontmatter, body, headings, first paragraph, word count) that is
+         shared by analyze-folder.py and extract-context.py. The content is
+         scanned once by md_scanner.py; everything else is derived from it.
+
+Files larger than LARGE_FILE_BYTES are streamed in chunks instead: words,
+lines and the first MAX_STREAM_HEADINGS headings are counted in one pass,
+and only the first SNIFF_CHARS characters are kept as `content` for
+sniffing (file type, frontmatter, first paragraph, keywords).
+
+Offsets into `content` are character offsets after newline normalization;
+byte_offsets() maps them back to byte positions in the file on disk.
+
+Usage:
+    from md_document import read_document
+
+    doc = read_document(Path('README.md'))
+    print(doc.word_count, doc.headings[:5])
+"""
+
+import codecs
+import hashlib
+import re
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+from md_scanner import MarkdownScan, iter_headings, scan_markdown
+
+# Files above this size are streamed instead of read into memory at once
+LARGE_FILE_BYTES = 8 * 1024 * 1024
+# How much of a streamed file is kept as `content` for content sniffing
+SNIFF_CHARS = 256 * 1024
+# Headings collected from a streamed file (analysis keeps the first 10)
+MAX_STREAM_HEADINGS = 100
+
+CHUNK_BYTES = 1024 * 1024
+# Longest line prefix kept while looking for a line break
+MAX_CARRY_CHARS = 64 * 1024
+
+
+def configure_reading(large_file_bytes: Optional[int] = None, sniff_chars: Optional[int] = None,
+                      max_headings: Optional[int] = None):
+    """Change the large-file threshold, sniff cutoff or heading limit for this process."""
+    global LARGE_FILE_BYTES, SNIFF_CHARS, MAX_STREAM_HEADINGS
+    if large_file_bytes is not None:
+        LARGE_FILE_BYTES = large_file_bytes
+    if sniff_chars is not None:
+        SNIFF_CHARS = sniff_chars
+    if max_headings is not None:
+        MAX_STREAM_HEADINGS = max_headings
+
+
+def reading_config() -> Tuple[int, int, int]:
+    """Current settings, as arguments for configure_reading() (e.g. in worker processes)."""
+    return LARGE_FILE_BYTES, SNIFF_CHARS, MAX_STREAM_HEADINGS
+
+
+def crlf_offsets(text: str) -> List[int]:
+    """Offsets, in the normalized text, of the newlines that were '\\r\\n' in `text`."""
+    offsets = []
+    pos = text.find('\r\n')
+    while pos >= 0:
+        offsets.append(pos - len(offsets))
+        pos = text.find('\r\n', pos + 2)
+    return offsets
+
+
+def text_byte_offsets(content: str, crlf: List[int], offsets: Iterable[int]) -> List[int]:
+    """UTF-8 byte offsets of sorted character offsets into normalized `content`.
+
+    `crlf` lists the newlines that were two bytes in the original (see
+    crlf_offsets).
+    """
+    if not crlf and content.isascii():
+        return list(offsets)
+    result = []
+    pos = nbytes = 0
+    for offset in offsets:
+        nbytes += len(content[pos:offset].encode('utf-8'))
+        pos = offset
+        result.append(nbytes + bisect_left(crlf, offset))
+    return result
+
+
+def stream_byte_offsets(f, offsets: List[int]) -> List[int]:
+    """Byte offsets in binary file `f` of sorted character offsets into its normalized content.
+
+    Decodes in chunks like scan_stream(); offsets past the end map to the file size.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    result = []
+    chars = nbytes = 0
+    pending_cr = False
+    while len(result) < len(offsets):
+        data = f.read(CHUNK_BYTES)
+        final = not data
+        text = decoder.decode(data, final)
+        if pending_cr:
+            text = '\r' + text
+            pending_cr = False
+        if not final and text.endswith('\r'):
+            text = text[:-1]
+            pending_cr = True
+        content = text.replace('\r\n', '\n').replace('\r', '\n')
+        end = len(offsets) if final else bisect_left(offsets, chars + len(content), len(result))
+        if end > len(result):
+            local = [min(offset - chars, len(content)) for offset in offsets[len(result):end]]
+            result.extend(nbytes + offset for offset in text_byte_offsets(content, crlf_offsets(text), local))
+        chars += len(content)
+        nbytes += len(text.encode('utf-8'))
+    return result
+
+
+def split_frontmatter(content: str) -> Tuple[Optional[str], str]:
+    """Split markdown content into (frontmatter text, body).
+
+    Returns (None, content) when the file has no frontmatter block.
+    """
+    if content.startswith('---'):
+        parts = content.split('---', 2)
+        if len(parts) >= 3:
+            return parts[1], parts[2]
+    return None, content
+
+
+def parse_frontmatter_fields(yaml_content: Optional[str]) -> Dict[str, Any]:
+    """Simple YAML parsing (basic key-value pairs)."""
+    frontmatter = {}
+    if not yaml_content:
+        return frontmatter
+    for line in yaml_content.strip().split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            key = key.strip()
+            value = value.strip().strip('"').strip("'")
+            frontmatter[key] = value
+    return frontmatter
+
+
+def extract_headings(content: str) -> List[str]:
+    """Extract all markdown headings from content, in document order."""
+    return [heading.text for heading in iter_headings(content)]
+
+
+def extract_first_paragraph(body: str) -> str:
+    """Extract first meaningful paragraph for Level 1 snippet.
+
+    `body` is the markdown content with any frontmatter already removed.
+    """
+    return first_paragraph_text(body.split('\n\n'))
+
+
+def first_paragraph_text(paragraphs: Iterable[str]) -> str:
+    """Snippet from the first meaningful paragraph; stops consuming `paragraphs` there."""
+    # Find first non-empty paragraph that's not a heading
+    for para in paragraphs:
+        para = para.strip()
+        if para and not para.startswith('#'):
+            # Remove markdown formatting
+            para = re.sub(r'[#*_`]', '', para)
+            para = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', para)  # Remove links
+            if len(para) > 20:  # Meaningful length
+                # Limit to first sentence or 200 chars
+                sentences = para.split('.')
+                if sentences:
+                    first_sentence = sentences[0].strip()
+                    if len(first_sentence) > 200:
+                        return first_sentence[:200] + '...'
+                    return first_sentence
+                return para[:200] + '...' if len(para) > 200 else para
+
+    return "Documentation file"
+
+
+class MarkdownDocument:
+    """Parsed markdown file, read from disk exactly once."""
+
+    def __init__(self, path: Path, content: str, size_bytes: int, mtime: float,
+                 content_hash: str = '', scan: Optional[MarkdownScan] = None):
+        self.path = path
+        self.name = path.name
+        self.content = content
+        self.size_bytes = size_bytes
+        self.mtime = mtime
+        self.content_hash = content_hash
+
+        self.frontmatter_text, self.body = split_frontmatter(content)
+        self.frontmatter = parse_frontmatter_fields(self.frontmatter_text)
+        self.scan = scan or scan_markdown(content)
+        self.headings = [heading.text for heading in self.scan.headings]
+        body_start = len(content) - len(self.body)
+        self.first_paragraph = first_paragraph_text(
+            content[start:end] for start, end in self.scan.paragraph_spans(body_start, len(content)))
+        self.word_count = self.scan.word_count
+        self.line_count = self.scan.line_count
+        # True when `content` is only the sniffed prefix of a streamed file
+        self.truncated = False
+        # Newlines that were '\r\n' on disk (see crlf_offsets)
+        self.crlf = []
+
+    def byte_offsets(self, offsets: List[int]) -> List[int]:
+        """File byte offsets of sorted character offsets into the document's content.
+
+        Streamed documents are re-read in chunks, so offsets past the
+        sniffed prefix are exact too.
+        """
+        if self.truncated:
+            with open(self.path, 'rb') as f:
+                return stream_byte_offsets(f, offsets)
+        return text_byte_offsets(self.content, self.crlf, offsets)
+
+
+def scan_stream(f, hasher, sniff_chars: int, max_headings: int) -> Dict[str, Any]:
+    """Count words/lines and collect headings from a binary file in one pass.
+    
+    Decodes UTF-8 incrementally with universal newlines (same result as
+    read_document) while holding at most one chunk in memory. Returns the
+    counts, the first `max_headings` headings (md_scanner.Heading, with
+    file offsets) and the first `sniff_chars` characters of content.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    words = newlines = chars = sniffed = 0
+    sniff_parts = []
+    headings = []
+    carry = ''              # start of the current line, while headings are wanted
+    carry_start = 0         # offset of that line in the file
+    skip_line = False       # rest of an over-long line that is already decided
+    pending_cr = False      # '\r' at a chunk end may be the first half of '\r\n'
+    inside_word = False     # previous chunk ended in the middle of a word
+    
+    while True:
+        data = f.read(CHUNK_BYTES)
+        final = not data
+        hasher.update(data)
+        text = decoder.decode(data, final)
+        if pending_cr:
+            text = '\r' + text
+            pending_cr = False
+        if not final and text.endswith('\r'):
+            text = text[:-1]
+            pending_cr = True
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        
+        if text:
+            text_start = chars
+            chars += len(text)
+            if sniffed < sniff_chars:
+                part = text[:sniff_chars - sniffed]
+                sniff_parts.append(part)
+                sniffed += len(part)
+            
+            newlines += text.count('\n')
+            words += len(text.split())
+            if inside_word and not text[0].isspace():
+                words -= 1  # the word continues from the previous chunk
+            inside_word = not text[-1].isspace()
+            
+            if len(headings) < max_headings:
+                block = carry + text
+                # File offset of block positions after the carry (which may be cut short)
+                base = text_start - len(carry)
+                start = 0
+                if skip_line:
+                    newline = block.find('\n')
+                    start = len(block) if newline < 0 else newline + 1
+                    skip_line = newline < 0
+                end = len(block) if final else max(start, block.rfind('\n') + 1)
+                for heading in iter_headings(block, start, end):
+                    heading.offset = carry_start if heading.offset == 0 else base + heading.offset
+                    headings.append(heading)
+                    if len(headings) >= max_headings:
+                        break
+                if end:
+                    carry_start = base + end
+                line = block[end:]
+                if len(line) > MAX_CARRY_CHARS and line.strip():
+                    # Over-long line: its first non-blank character decides whether it is a heading
+                    heading = next(iter_headings(line), None)
+                    if heading and len(headings) < max_headings:
+                        heading.offset = carry_start
+                        heading.text = heading.text[:MAX_CARRY_CHARS]
+                        headings.append(heading)
+                    carry = ''
+                    skip_line = True
+                else:
+                    # Unfinished line (leading whitespace of a long one is interchangeable)
+                    carry = line[:MAX_CARRY_CHARS]
+        elif final and carry and len(headings) < max_headings:
+            heading = next(iter_headings(carry), None)
+            if heading:
+                heading.offset = carry_start
+                headings.append(heading)
+        
+        if final:
+            break
+    
+    return {
+        'word_count': words,
+        'line_count': newlines + 1,
+        'headings': headings,
+        'content': ''.join(sniff_parts),
+        'truncated': sniffed < chars
+    }
+
+
+def stream_document(file_path: Path) -> MarkdownDocument:
+    """Read a large markdown file in chunks (see scan_stream)."""
+    stat = file_path.stat()
+    hasher = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        scan = scan_stream(f, hasher, SNIFF_CHARS, MAX_STREAM_HEADINGS)
+    content = scan['content']
+    # Headings and counts cover the whole file, paragraph breaks only the sniffed prefix
+    prefix = scan_markdown(content)
+    doc = MarkdownDocument(file_path, content, stat.st_size, stat.st_mtime, hasher.hexdigest(),
+                           MarkdownScan(scan['headings'], prefix.breaks, scan['word_count'], scan['line_count']))
+    doc.truncated = scan['truncated']
+    return doc
+
+
+def read_document(file_path: Path) -> MarkdownDocument:
+    """Read and parse a markdown file.
+
+    Files larger than LARGE_FILE_BYTES are streamed (see stream_document).
+    Raises OSError/UnicodeDecodeError if the file cannot be read.
+    """
+    if file_path.stat().st_size > LARGE_FILE_BYTES:
+        return stream_document(file_path)
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    stat = file_path.stat()
+    # Same result as reading in text mode (universal newlines)
+    text = data.decode('utf-8')
+    content = text.replace('\r\n', '\n').replace('\r', '\n')
+    doc = MarkdownDocument(file_path, content, stat.st_size, stat.st_mtime,
+                           hashlib.sha256(data).hexdigest())
+    if len(content) != len(text):
+        doc.crlf = crlf_offsets(text)
+    return doc
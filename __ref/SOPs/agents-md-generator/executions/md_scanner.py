@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+md_scanner.py - Single-pass markdown structure scanner
+
+Purpose: Find the headings (level, text, offset) and paragraph boundaries
+         of markdown content, together with its word and line counts, in one
+         forward walk, so analyze-folder.py and extract-context.py never
+         re-split or re-search the same text
+
+The walk jumps between structural markers with str.find ('#' and the
+'\n\n' paragraph separator) instead of matching a regex or looping over
+every line in Python, so the text is only ever walked at C speed.
+
+Usage:
+    from md_scanner import scan_markdown
+
+    scan = scan_markdown(content)
+    print(scan.word_count, [(h.level, h.text) for h in scan.headings])
+"""
+
+from bisect import bisect_left
+from typing import Iterator, List, Optional, Tuple
+
+
+class Heading:
+    """A heading line: level (number of '#'), text and the offset of its line."""
+
+    __slots__ = ('level', 'text', 'offset')
+
+    def __init__(self, level: int, text: str, offset: int):
+        self.level = level
+        self.text = text
+        self.offset = offset
+
+    def __repr__(self):
+        return f"Heading({self.level}, {self.text!r}, {self.offset})"
+
+
+def iter_headings(content: str, start: int = 0, end: Optional[int] = None) -> Iterator[Heading]:
+    """Yield the heading lines of content[start:end] in document order.
+
+    A heading line is optional leading whitespace, a run of '#' and the
+    text. `start` must be the start of a line; offsets are into `content`.
+    """
+    if end is None:
+        end = len(content)
+    find = content.find
+    pos = find('#', start, end)
+    while pos >= 0:
+        line_start = content.rfind('\n', start, pos) + 1 or start
+        line_end = find('\n', pos, end)
+        if line_end < 0:
+            line_end = end
+        # Only the first '#' of a line can start a heading
+        if line_start == pos or content[line_start:pos].isspace():
+            line = content[pos:line_end]
+            text = line.lstrip('#')
+            yield Heading(len(line) - len(text), text.strip(), line_start)
+        pos = find('#', line_end, end)
+
+
+class MarkdownScan:
+    """Structure of a markdown text as found by scan_markdown()."""
+
+    def __init__(self, headings: List[Heading], breaks: List[int], word_count: int, line_count: int):
+        self.headings = headings
+        # Offsets of the '\n\n' separators between paragraphs
+        self.breaks = breaks
+        self.word_count = word_count
+        self.line_count = line_count
+
+    def paragraph_spans(self, start: int, end: int) -> Iterator[Tuple[int, int]]:
+        """Yield (start, end) offsets of the paragraphs between `start` and `end`.
+
+        Matches `content[start:end].split('\\n\\n')` as long as `start` does
+        not fall inside a separator.
+        """
+        for pos in self.breaks[bisect_left(self.breaks, start):]:
+            if pos + 2 > end:
+                break
+            yield start, pos
+            start = pos + 2
+        yield start, end
+
+
+def scan_markdown(content: str) -> MarkdownScan:
+    """Scan `content` for headings and paragraph breaks and count words/lines."""
+    breaks = []
+    find = content.find
+    pos = find('\n\n')
+    while pos >= 0:
+        breaks.append(pos)
+        pos = find('\n\n', pos + 2)
+    return MarkdownScan(list(iter_headings(content)), breaks, len(content.split()), content.count('\n') + 1)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+md_sections.py - Heading-delimited sections of a markdown file
+
+Purpose: Split a parsed document into sections at its headings (levels 1 to
+         SECTION_LEVEL) with the byte range each occupies in the file, a
+         token estimate and its own keywords, so AGENTS.md can point agents
+         at `file.md#anchor` ranges instead of whole files
+
+Offsets are bytes into the file as stored on disk (UTF-8, original line
+endings), so a section is read with `f.seek(start); f.read(end - start)` or
+sliced from an mmap. Text before the first heading (frontmatter, intro) is
+a section with an empty heading. Deeper headings stay inside their section.
+
+Streamed (large) files only keep their first headings and content prefix:
+sections beyond the prefix get tokens extrapolated from their byte size and
+keywords from their heading alone.
+
+Usage:
+    from md_sections import split_sections
+
+    for section in split_sections(read_document(Path('SOP.md'))):
+        print(section['anchor'], section['start'], section['end'], section['tokens'])
+"""
+
+import re
+from collections import Counter
+from typing import Any, Dict, List
+
+from keyword_engine import KeywordIndex, term_vector
+from tier_planner import estimate_text_tokens, scale_tokens
+
+# Headings of this level or higher (fewer '#') start a new section
+SECTION_LEVEL = 3
+SECTION_KEYWORD_COUNT = 5
+
+
+def heading_anchor(text: str, seen: Counter) -> str:
+    """GitHub-style anchor of a heading; repeated anchors get -1, -2, ... suffixes."""
+    anchor = re.sub(r'[^\w\- ]', '', text.strip().lower()).strip().replace(' ', '-')
+    count = seen[anchor]
+    seen[anchor] += 1
+    return f"{anchor}-{count}" if count else anchor
+
+
+def split_sections(doc, keyword_count: int = SECTION_KEYWORD_COUNT) -> List[Dict[str, Any]]:
+    """Sections of a MarkdownDocument in file order; they cover the file end to end.
+
+    Each section is {heading, level, anchor, start, end, tokens, keywords}
+    with `start`/`end` as file byte offsets.
+    """
+    content = doc.content
+    if not content.strip():
+        return []
+    # '#' lines inside the frontmatter are YAML comments, not headings
+    body_start = len(content) - len(doc.body)
+    headings = [h for h in doc.scan.headings
+                if h.level <= SECTION_LEVEL and h.text and h.offset >= body_start]
+    starts = [h.offset for h in headings]
+    if not headings or (starts[0] > 0 and content[:starts[0]].strip()):
+        starts.insert(0, 0)
+        headings.insert(0, None)
+    elif starts[0] > 0:
+        starts[0] = 0  # leading blank lines belong to the first section
+
+    if doc.truncated:
+        bounds = doc.byte_offsets(starts) + [doc.size_bytes]
+    else:
+        bounds = doc.byte_offsets(starts + [len(content)])
+    ends = starts[1:] + [len(content)]
+
+    seen = Counter()
+    sections = []
+    keywords = KeywordIndex()
+    for i, heading in enumerate(headings):
+        title = heading.text if heading else ''
+        text = content[starts[i]:ends[i]]
+        tokens = estimate_text_tokens(text)
+        if doc.truncated and (i + 1 == len(headings) or ends[i] > len(content)):
+            # The section runs past the sniffed prefix
+            tokens = scale_tokens(tokens, text, bounds[i + 1] - bounds[i])
+        sections.append({
+            'heading': title,
+            'level': heading.level if heading else 0,
+            'anchor': heading_anchor(title, seen) if heading else '',
+            'start': bounds[i],
+            'end': bounds[i + 1],
+            'tokens': tokens
+        })
+        keywords.add(i, term_vector([(title, 2), (text, 1)]))
+
+    for i, section in enumerate(sections):
+        section['keywords'] = keywords.top_keywords(i, keyword_count)
+    return sections
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+near_duplicates.py - Exact and near-duplicate markdown files in a folder
+
+Purpose: Group copied and versioned files (`spec_v01.md`, `spec_v02.md`,
+         `notes-backup.md`, ...) so analyze-folder.py can report them and
+         extract-context.py can list each group once in the AGENTS.md
+         inventory instead of once per copy
+
+Exact duplicates share a content hash. Near duplicates are found with
+MinHash over word 3-gram shingles (one-permutation hashing: the CRC-32 of
+every shingle is sent to one of NUM_HASHES buckets by its low bits and each
+bucket keeps its minimum)
+and LSH banding: files are compared only when all ROWS values of at least
+one of BANDS bands are equal, so the work grows with the number of similar
+files instead of with the square of the folder size. Candidates are kept
+when their estimated Jaccard similarity is at least THRESHOLD.
+
+Signatures are stored in the analysis records as hex strings (NUM_HASHES
+16-bit values, `analyze-folder.py --near-duplicates`) and cover the sniffed
+prefix of streamed files only. Records without one are grouped by content
+hash alone.
+
+Usage:
+    from near_duplicates import minhash_signature, find_duplicate_groups
+
+    record['minhash'] = minhash_signature(doc.content)
+    groups = find_duplicate_groups(records)
+"""
+
+import posixpath
+import re
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List
+
+NUM_HASHES = 64
+BANDS = 16
+ROWS = NUM_HASHES // BANDS
+SHINGLE_WORDS = 3
+# Estimated Jaccard similarity at which two files count as near duplicates
+THRESHOLD = 0.8
+
+BUCKET_BITS = 6  # NUM_HASHES == 1 << BUCKET_BITS
+BUCKET_MASK = NUM_HASHES - 1
+HEX_DIGITS = 4  # per stored 16-bit value
+
+# File name stems that mark a copy ("notes-backup", "spec copy 2", "old_plan")
+# or a numbered version ("spec_v02"); such files are not picked as canonical
+# over a plain name
+COPY_NAME = re.compile(r'(?:^|[\W_])(?:backup|bak|copy|old|orig)(?:$|[\W_\d])', re.IGNORECASE)
+VERSION_NAME = re.compile(r'[\W_]v(\d+)$', re.IGNORECASE)
+
+
+def minhash_signature(text: str) -> str:
+    """MinHash signature of the word 3-gram shingles of `text` ('' if it has none)."""
+    words = text.lower().split()
+    if len(words) < SHINGLE_WORDS:
+        return ''
+    shingles = set(map(' '.join, zip(*(words[i:] for i in range(SHINGLE_WORDS)))))
+    # Low bits pick the bucket; sorted descending so each bucket keeps its smallest hash
+    hashes = sorted(map(zlib.crc32, map(str.encode, shingles)), reverse=True)
+    mins = dict(zip(map(BUCKET_MASK.__and__, hashes), hashes))
+    signature = []
+    for bucket in range(NUM_HASHES):
+        # Empty buckets borrow the next filled bucket's value (densification)
+        offset = 0
+        while (bucket + offset) % NUM_HASHES not in mins:
+            offset += 1
+        signature.append(f"{(mins[(bucket + offset) % NUM_HASHES] >> BUCKET_BITS) & 0xFFFF:04x}")
+    return ''.join(signature)
+
+
+def similarity(a: str, b: str) -> float:
+    """Estimated Jaccard similarity of two signatures (fraction of equal values)."""
+    if not a or not b:
+        return 0.0
+    equal = sum(1 for i in range(0, len(a), HEX_DIGITS) if a[i:i + HEX_DIGITS] == b[i:i + HEX_DIGITS])
+    return equal / NUM_HASHES
+
+
+class _Groups:
+    """Union-find over record positions."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        self.parent[self.find(i)] = self.find(j)
+
+
+def canonical_rank(file_data: Dict[str, Any], key: str = 'name') -> tuple:
+    """Sort key of a group member; the highest is the canonical file.
+
+    Plain names rank above versioned ones (`_vNN`, higher versions first),
+    which rank above copies (backup/copy/old/bak/orig); ties go to the most
+    recently modified file, then the shortest name.
+    """
+    name = file_data[key]
+    stem = posixpath.splitext(posixpath.basename(name.replace('\\', '/')))[0]
+    version = VERSION_NAME.search(stem)
+    if COPY_NAME.search(stem):
+        kind = 0
+    elif version:
+        kind = 1
+    else:
+        kind = 2
+    return (kind, int(version.group(1)) if version else 0, file_data.get('last_modified', ''),
+            -len(name), name)
+
+
+def find_duplicate_groups(files: List[Dict[str, Any]], key: str = 'name',
+                          threshold: float = THRESHOLD) -> List[Dict[str, Any]]:
+    """Group analysis records (with `content_hash` and `minhash`) into duplicate sets.
+
+    Returns one entry per group of two or more files:
+    {"canonical": <key>, "duplicates": [{<key>, "match": "exact"|"near", "similarity"}]}.
+    The canonical file is chosen by canonical_rank(): a plain name over a
+    versioned one over a backup or copy, then the highest version, then the
+    most recently modified file, so the original of a backup is kept even
+    when the copy is newer.
+    Files are identified by `key` ('path' for combined recursive analyses).
+    """
+    groups = _Groups(len(files))
+
+    # Exact duplicates: one representative per content hash
+    by_hash = {}
+    representatives = []
+    for i, file_data in enumerate(files):
+        content_hash = file_data.get('content_hash')
+        if not content_hash or 'error' in file_data:
+            continue
+        if content_hash in by_hash:
+            groups.union(i, by_hash[content_hash])
+        else:
+            by_hash[content_hash] = i
+            representatives.append(i)
+
+    # Near duplicates: LSH buckets, then one comparison per distinct group in a bucket
+    buckets = defaultdict(list)
+    width = ROWS * HEX_DIGITS
+    for i in representatives:
+        signature = files[i].get('minhash')
+        if not signature:
+            continue
+        for band in range(BANDS):
+            buckets[(band, signature[band * width:(band + 1) * width])].append(i)
+    for members in buckets.values():
+        seen = []
+        for i in members:
+            for j in seen:
+                if groups.find(i) == groups.find(j):
+                    break
+                if similarity(files[i]['minhash'], files[j]['minhash']) >= threshold:
+                    groups.union(i, j)
+                    break
+            else:
+                seen.append(i)
+
+    members_of = defaultdict(list)
+    for i in range(len(files)):
+        if 'error' not in files[i]:
+            members_of[groups.find(i)].append(i)
+
+    result = []
+    for members in members_of.values():
+        if len(members) < 2:
+            continue
+        canonical = max(members, key=lambda i: canonical_rank(files[i], key))
+        duplicates = []
+        for i in sorted(members, key=lambda i: files[i][key]):
+            if i == canonical:
+                continue
+            exact = files[i].get('content_hash') == files[canonical].get('content_hash')
+            duplicates.append({
+                key: files[i][key],
+                'match': 'exact' if exact else 'near',
+                'similarity': 1.0 if exact else round(similarity(files[i].get('minhash', ''),
+                                                                 files[canonical].get('minhash', '')), 3)
+            })
+        result.append({'canonical': files[canonical][key], 'duplicates': duplicates})
+    result.sort(key=lambda group: group['canonical'])
+    return result
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+query-context.py - Find the files of a folder that match a task
+
+Purpose: Rank a folder's markdown files against a natural-language task
+         using the search index written by `extract-context.py --index`,
+         so an agent opens only the few files that matter
+
+Usage:
+    python query-context.py [INDEX_JSON_FILE] "TASK DESCRIPTION" [--top N] [--json]
+
+    --top        Number of files to return (default: 5)
+    --json       Print the hits as JSON (name, tier, score, matched terms,
+                 snippet, use_when) instead of a readable list
+
+Exit codes:
+    0 = Success (also when nothing matches)
+    1 = Error (index not found or not a search index)
+"""
+
+import json
+import time
+
+from search_index import load_search_index, search
+
+
+def main():
+    """Main execution function."""
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Find the files of a folder that match a task")
+    parser.add_argument('index_file', metavar='INDEX_JSON_FILE')
+    parser.add_argument('query', metavar='TASK_DESCRIPTION')
+    parser.add_argument('--top', type=int, default=5,
+                        help="Number of files to return (default: 5)")
+    parser.add_argument('--json', action='store_true',
+                        help="Print the hits as JSON")
+    args = parser.parse_args()
+
+    try:
+        start = time.perf_counter()
+        index = load_search_index(args.index_file)
+        loaded = time.perf_counter()
+        hits = search(index, args.query, args.top)
+        searched = time.perf_counter()
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(hits, indent=2, ensure_ascii=False))
+        sys.exit(0)
+
+    if not hits:
+        print(f"No matching files in {index.get('folder_name') or args.index_file}")
+    for rank, hit in enumerate(hits, 1):
+        print(f"{rank}. {hit['name']}  (tier {hit['tier']}, score {hit['score']})")
+        if hit['snippet']:
+            print(f"   {' '.join(hit['snippet'].split())}")
+        if hit['use_when']:
+            print(f"   Use when: {hit['use_when']}")
+        print(f"   Matched: {', '.join(hit['matched'])}")
+    print(f"({len(index['files'])} files, load {(loaded - start) * 1000:.1f} ms, "
+          f"search {(searched - loaded) * 1000:.1f} ms)")
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+script_loader.py - Import the hyphen-named execution scripts as modules
+
+Purpose: Let drivers (watch mode, benchmarks) call analyze-folder.py,
+         extract-context.py, check-existing-agents-md.py and
+         validate-agents-md.py in-process instead of spawning them
+
+Usage:
+    from script_loader import load_execution
+
+    analyzer = load_execution('analyze-folder.py')
+    analysis = analyzer.analyze_folder('docs')
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+EXECUTIONS_DIR = Path(__file__).resolve().parent
+
+
+def load_execution(script_name: str) -> ModuleType:
+    """Import an execution script such as 'analyze-folder.py' as a module.
+
+    The module is registered in sys.modules under its underscored name
+    (e.g. 'analyze_folder') so its functions can be pickled for process
+    pools and repeated loads return the same module.
+    """
+    module_name = script_name.replace('-', '_').replace('.py', '')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    if str(EXECUTIONS_DIR) not in sys.path:
+        sys.path.insert(0, str(EXECUTIONS_DIR))
+    spec = importlib.util.spec_from_file_location(module_name, EXECUTIONS_DIR / script_name)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
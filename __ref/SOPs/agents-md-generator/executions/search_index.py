@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+search_index.py - Inverted keyword index over a folder's context records
+
+Purpose: Build a compact term -> files index (BM25 weights from
+         keyword_engine.py) that extract-context.py writes next to
+         [TARGET_FOLDER]_context.json, and rank the folder's files for a
+         natural-language task so an agent opens only the best matches
+
+Index file layout (JSON):
+    {"format": 1, "folder_name": ..., "files": [{name, tier, snippet, use_when}, ...],
+     "postings": {"term": [file_id, weight, file_id, weight, ...], ...}}
+
+Weights are BM25 scores x 1000 as integers; each term keeps only its
+MAX_POSTINGS best files, so common terms cannot bloat the index.
+
+Usage:
+    from search_index import load_search_index, search
+
+    index = load_search_index('docs_index.json')
+    for hit in search(index, 'how do I validate the frontmatter', top=3):
+        print(hit['name'], hit['score'])
+"""
+
+import heapq
+import json
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from keyword_engine import KeywordIndex, count_terms
+
+INDEX_FORMAT = 1
+# Best-scoring files kept per term
+MAX_POSTINGS = 200
+# Stored weights are integers: BM25 score x SCORE_SCALE
+SCORE_SCALE = 1000
+# Query terms also match index terms sharing their first PREFIX_LENGTH
+# characters (validate -> validation), at PREFIX_WEIGHT
+PREFIX_LENGTH = 6
+PREFIX_WEIGHT = 0.5
+
+
+def build_search_index(keywords: KeywordIndex, records: Iterable[Dict[str, Any]],
+                       folder_name: str = '') -> Dict[str, Any]:
+    """Build the index from context records and the KeywordIndex they were scored with.
+
+    `records` must be in KeywordIndex key order (record position 0, 1, ...).
+    """
+    files = []
+    postings = defaultdict(list)
+    for position, record in enumerate(records):
+        files.append({
+            'name': record['name'],
+            'tier': record.get('tier'),
+            'snippet': record.get('snippet', ''),
+            'use_when': record.get('use_when', '')
+        })
+        for term, score in keywords.scores(position, include_rest=True).items():
+            weight = int(score * SCORE_SCALE)
+            if weight > 0:
+                postings[term].append((weight, position))
+
+    compact = {}
+    for term in sorted(postings):
+        flat = []
+        for weight, position in heapq.nlargest(MAX_POSTINGS, postings[term]):
+            flat.extend((position, weight))
+        compact[term] = flat
+
+    return {
+        'format': INDEX_FORMAT,
+        'folder_name': folder_name,
+        'files': files,
+        'postings': compact
+    }
+
+
+def write_search_index(index_file: str, index: Dict[str, Any]):
+    """Write the index as compact JSON."""
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def load_search_index(index_file: str) -> Dict[str, Any]:
+    """Load an index written by write_search_index(); raises ValueError on other files."""
+    with open(index_file, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    if not isinstance(index, dict) or index.get('format') != INDEX_FORMAT:
+        raise ValueError(f"Not a search index (format {INDEX_FORMAT}): {index_file}")
+    return index
+
+
+def expand_term(index: Dict[str, Any], term: str) -> List[Tuple[str, float]]:
+    """(index term, weight) pairs for a query term: itself and terms sharing its prefix."""
+    postings = index['postings']
+    expanded = [(term, 1.0)] if term in postings else []
+    if len(term) >= PREFIX_LENGTH:
+        # Postings are written in sorted order, so prefix matches are one contiguous run
+        terms = index.get('_terms')
+        if terms is None:
+            terms = index['_terms'] = list(postings)
+        prefix = term[:PREFIX_LENGTH]
+        for i in range(bisect_left(terms, prefix), len(terms)):
+            if not terms[i].startswith(prefix):
+                break
+            if terms[i] != term:
+                expanded.append((terms[i], PREFIX_WEIGHT))
+    return expanded
+
+
+def search(index: Dict[str, Any], query: str, top: int = 5) -> List[Dict[str, Any]]:
+    """Rank the index's files for `query`; returns up to `top` hits, best first.
+    
+    Each query term adds its best-weighted match per file (exact term or a
+    prefix variant), so files are not rewarded for many spellings of a word.
+    """
+    scores = defaultdict(float)
+    matched = defaultdict(list)
+    for term in count_terms(query):
+        best = {}
+        for index_term, factor in expand_term(index, term):
+            flat = index['postings'][index_term]
+            for i in range(0, len(flat), 2):
+                score = factor * flat[i + 1] / SCORE_SCALE
+                if score > best.get(flat[i], (0.0, ''))[0]:
+                    best[flat[i]] = (score, index_term)
+        for position, (score, index_term) in best.items():
+            scores[position] += score
+            matched[position].append(index_term)
+
+    hits = []
+    for position in heapq.nlargest(top, scores, key=lambda p: (scores[p], -p)):
+        hit = dict(index['files'][position])
+        hit['score'] = round(scores[position], 3)
+        hit['matched'] = sorted(set(matched[position]))
+        hits.append(hit)
+    return hits
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+tier_planner.py - Token estimates and budgeted tier assignment
+
+Purpose: Estimate how many tokens each markdown file costs an agent to load
+         (local approximations, no tokenizer download or network call) and
+         pack files into loading tiers so that everything in tier 1 and
+         tier 2 fits a token budget per tier
+
+Tokenizers are plain functions of a text, registered by name:
+    words   word count x TOKENS_PER_WORD (default; generate-agents-md.py uses
+            count_tokens() for context records without a token count)
+    chars   characters / CHARS_PER_TOKEN
+    pieces  letter runs, digit runs and punctuation counted like BPE pieces
+            (slower, closer for code-heavy or non-English files)
+
+Tier planning is a 0/1 knapsack per tier: when the files that prefer a tier
+cost more than its budget, the most valuable set that fits is kept (by
+default the most files) and the rest move down one tier. The last tier has
+no budget.
+
+Usage:
+    from tier_planner import configure_tokenizer, estimate_tokens, plan_tiers
+
+    configure_tokenizer('pieces')
+    tokens = [estimate_tokens(doc) for doc in docs]
+    tiers = plan_tiers(list(zip(tokens, preferred_tiers)), [8000, 40000])
+"""
+
+import re
+from operator import gt
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+TOKENS_PER_WORD = 1.3
+CHARS_PER_TOKEN = 4
+# Letter runs up to this length count as one token, longer ones as several
+PIECE_LETTERS = 8
+PIECE_DIGITS = 3
+PIECE_PATTERN = re.compile(r'[A-Za-z]+|[0-9]+|[^\sA-Za-z0-9]')
+
+LAST_TIER = 3
+# Knapsack capacities are rounded to at most this many units
+MAX_SLOTS = 1000
+
+
+def count_tokens(word_count: int) -> int:
+    """Token estimate of the `words` tokenizer from a word count."""
+    return int(round(word_count * TOKENS_PER_WORD))
+
+
+def word_tokens(text: str) -> int:
+    return count_tokens(len(text.split()))
+
+
+def char_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def piece_tokens(text: str) -> int:
+    tokens = 0
+    for piece in PIECE_PATTERN.findall(text):
+        if piece[0].isalpha() and piece.isascii():
+            tokens += 1 + (len(piece) - 1) // PIECE_LETTERS
+        elif piece[0].isdigit():
+            tokens += 1 + (len(piece) - 1) // PIECE_DIGITS
+        else:
+            tokens += 1
+    return tokens
+
+
+TOKENIZERS = {
+    'words': word_tokens,
+    'chars': char_tokens,
+    'pieces': piece_tokens
+}
+
+_tokenizer = 'words'
+
+
+def register_tokenizer(name: str, tokenizer: Callable[..., int]):
+    """Add a tokenizer: a function of a text returning a token count."""
+    TOKENIZERS[name] = tokenizer
+
+
+def configure_tokenizer(name: str):
+    """Select the tokenizer used by estimate_tokens() in this process."""
+    global _tokenizer
+    if name not in TOKENIZERS:
+        raise ValueError(f"Unknown tokenizer '{name}' (available: {', '.join(sorted(TOKENIZERS))})")
+    _tokenizer = name
+
+
+def tokenizer_name() -> str:
+    return _tokenizer
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Estimated token count of `text` with the configured tokenizer."""
+    return TOKENIZERS[_tokenizer](text)
+
+
+def scale_tokens(tokens: int, text: str, size_bytes: int) -> int:
+    """Extrapolate the tokens of `text` to `size_bytes` bytes of the same kind of content."""
+    read_bytes = len(text.encode('utf-8'))
+    if not read_bytes:
+        return -(-size_bytes // CHARS_PER_TOKEN)
+    return tokens * size_bytes // read_bytes
+
+
+def estimate_tokens(doc) -> int:
+    """Estimated token cost of loading `doc` (a MarkdownDocument) with the configured tokenizer."""
+    if _tokenizer == 'words':
+        # The document scan already counted the words of the whole file
+        return count_tokens(doc.word_count)
+    tokens = estimate_text_tokens(doc.content)
+    if doc.truncated:
+        # Only the sniffed head of a streamed file is in memory; scale up by size
+        tokens = scale_tokens(tokens, doc.content, doc.size_bytes)
+    return tokens
+
+
+def parse_budgets(text: str) -> List[int]:
+    """Parse "8000,40000" into per-tier token budgets (tier 1 first)."""
+    try:
+        budgets = [int(part.replace('_', '')) for part in text.split(',') if part.strip()]
+    except ValueError:
+        raise ValueError(f"Tier budgets must be comma-separated token counts: {text}")
+    if not budgets or len(budgets) >= LAST_TIER or min(budgets) < 0:
+        raise ValueError(f"Expected 1 to {LAST_TIER - 1} non-negative tier budgets: {text}")
+    return budgets
+
+
+def pack(items: Sequence[Tuple[int, float]], capacity: int) -> List[int]:
+    """0/1 knapsack over (tokens, value) items.
+
+    Returns the indices of the most valuable subset that fits in `capacity`
+    tokens; among equally valuable subsets, the one with the fewest tokens.
+    Token counts are rounded up to capacity / MAX_SLOTS units, so the
+    result always fits.
+    """
+    unit = max(1, -(-capacity // MAX_SLOTS))
+    slots = capacity // unit
+    weights = [-(-tokens // unit) for tokens, _ in items]
+    if sum(weights) <= slots:
+        return list(range(len(items)))
+
+    # best[c]: highest value within c units; keep[i][c - w]: item i taken at capacity c
+    best = [0.0] * (slots + 1)
+    keep = [None] * len(items)
+    chosen = []
+    for i, ((_, value), weight) in enumerate(zip(items, weights)):
+        if weight == 0:
+            chosen.append(i)
+            continue
+        if weight > slots or value <= 0:
+            continue
+        with_item = [b + value for b in best[:slots + 1 - weight]]
+        keep[i] = bytes(map(gt, with_item, best[weight:]))
+        best[weight:] = map(max, with_item, best[weight:])
+
+    capacity_used = best.index(best[slots])
+    for i in range(len(items) - 1, -1, -1):
+        if keep[i] is not None and capacity_used >= weights[i] and keep[i][capacity_used - weights[i]]:
+            chosen.append(i)
+            capacity_used -= weights[i]
+    return sorted(chosen)
+
+
+def plan_tiers(items: Sequence[Tuple[int, int]], budgets: Sequence[int],
+               values: Optional[Sequence[float]] = None) -> List[int]:
+    """Assign a tier to every (tokens, preferred tier) item within the budgets.
+
+    budgets[0] is tier 1's token budget, budgets[1] (if given) tier 2's; the
+    last tier takes whatever is left. A file never moves above its preferred
+    tier. Files demoted from a higher tier are packed before the tier's own
+    files. `values` weights files in the knapsack (default 1 each, so the
+    most files fit).
+    """
+    values = values if values is not None else [1.0] * len(items)
+    preferred = [min(max(tier, 1), LAST_TIER) for _, tier in items]
+    tiers = list(preferred)
+    for tier, budget in enumerate(budgets[:LAST_TIER - 1], 1):
+        remaining = budget
+        members = [i for i, t in enumerate(tiers) if t == tier]
+        for rank in sorted({preferred[i] for i in members}):
+            group = [i for i in members if preferred[i] == rank]
+            chosen = set(pack([(items[i][0], values[i]) for i in group], remaining))
+            for position, i in enumerate(group):
+                if position in chosen:
+                    remaining -= items[i][0]
+                else:
+                    tiers[i] = tier + 1
+    return tiers
+
+
+def tier_loads(items: Sequence[Tuple[int, int]], tiers: Sequence[int]) -> Dict[int, int]:
+    """Total tokens per tier."""
+    loads = {tier: 0 for tier in range(1, LAST_TIER + 1)}
+    for (tokens, _), tier in zip(items, tiers):
+        loads[tier] += tokens
+    return loads
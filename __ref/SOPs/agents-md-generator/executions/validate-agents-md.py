@@ -6,25 +6,29 @@ Purpose: Validate AGENTS.md against all requirements from validation checklist
 Output: Validation report with pass/fail status
 
 Usage:
-    python validate-agents-md.py [AGENTS_MD_FILE] [TARGET_FOLDER_PATH]
+    python validate-agents-md.py [AGENTS_MD_FILE] [TARGET_FOLDER_PATH] [--timings]
+    python validate-agents-md.py --batch [ROOT] [--workers N] [--report-format json|junit] [--report FILE]
+
+    --timings        Also print how long each check took
+    --batch          Validate every AGENTS.md under ROOT against its own folder
+    --workers        Parallel worker processes for --batch (default: 1)
+    --report-format  Batch report format (default: json)
+    --report         Write the batch report to FILE instead of stdout
 
 Exit codes:
     0 = All checks passed
-    1 = One or more checks failed
+    1 = One or more checks failed (--batch: also when no AGENTS.md was found,
+        reported with status "empty")
 """
 
 import os
 import json
 import re
+import time
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Callable, Optional
 
-# Try to import yaml, use basic parsing if not available
-try:
-    import yaml
-    HAS_YAML = True
-except ImportError:
-    HAS_YAML = False
+from frontmatter_loader import load_frontmatter
 
 
 class ValidationResult:
@@ -33,6 +37,9 @@ class ValidationResult:
         self.passed = []
         self.failed = []
         self.warnings = []
+        self.timings = []
+        # Result name -> seconds, the time of the check(s) that produced it
+        self.durations = {}
     
     def add_pass(self, check: str):
         self.passed.append(check)
@@ -60,6 +67,70 @@ class ValidationResult:
         
         total = len(self.passed) + len(self.failed)
         print(f"\nOverall: {'PASS' if not self.failed else 'FAIL'} ({len(self.passed)}/{total} checks passed, {len(self.warnings)} warnings)")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Machine-readable form of the result (used by batch reports)."""
+        return {
+            'status': 'fail' if self.failed else 'pass',
+            'passed': list(self.passed),
+            'failed': [{'check': c, 'details': d} for c, d in self.failed],
+            'warnings': [{'check': c, 'details': d} for c, d in self.warnings],
+            'timings': {name: round(seconds, 6) for name, seconds in self.timings},
+            'durations': {name: round(seconds, 6) for name, seconds in self.durations.items()}
+        }
+    
+    def print_timings(self):
+        """Print per-check timings, slowest first."""
+        total = sum(seconds for _, seconds in self.timings)
+        print("\nCheck timings:")
+        for name, seconds in sorted(self.timings, key=lambda t: -t[1]):
+            share = (seconds / total * 100) if total else 0.0
+            print(f"  {name:<24} {seconds * 1000:8.2f} ms  {share:5.1f}%")
+        print(f"  {'total':<24} {total * 1000:8.2f} ms")
+
+
+class ValidationContext:
+    """AGENTS.md content and frontmatter, read and parsed once per validation run."""
+    
+    def __init__(self, agents_md_file: str, folder_path: str, content: Optional[str] = None):
+        self.agents_md_file = agents_md_file
+        self.folder_path = folder_path
+        if content is None:
+            with open(agents_md_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+        self.content = content
+        self._frontmatter = None
+        self._markdown_content = content
+        self._parse_error = None
+        self._parsed = False
+        self._content_lower = None
+    
+    def _parse(self):
+        if not self._parsed:
+            self._parsed = True
+            try:
+                self._frontmatter, self._markdown_content = parse_yaml_frontmatter(self.content)
+            except ValueError as e:
+                self._parse_error = e
+    
+    @property
+    def frontmatter(self) -> Dict:
+        """Parsed frontmatter; raises the parse error to every check that needs it."""
+        self._parse()
+        if self._parse_error is not None:
+            raise self._parse_error
+        return self._frontmatter
+    
+    @property
+    def markdown_content(self) -> str:
+        self._parse()
+        return self._markdown_content
+    
+    @property
+    def content_lower(self) -> str:
+        if self._content_lower is None:
+            self._content_lower = self.content.lower()
+        return self._content_lower
 
 
 def parse_yaml_frontmatter(content: str) -> Tuple[Dict, str]:
@@ -75,32 +146,16 @@ def parse_yaml_frontmatter(content: str) -> Tuple[Dict, str]:
     markdown_content = parts[2]
     
     try:
-        if HAS_YAML:
-            frontmatter = yaml.safe_load(yaml_content)
-            return frontmatter or {}, markdown_content
-        else:
-            # Basic YAML parsing (key-value pairs only)
-            frontmatter = {}
-            for line in yaml_content.split('\n'):
-                if ':' in line and not line.strip().startswith('#'):
-                    key, value = line.split(':', 1)
-                    key = key.strip()
-                    value = value.strip().strip('"').strip("'")
-                    if value.startswith('[') and value.endswith(']'):
-                        # Simple array parsing
-                        items = [item.strip().strip('"').strip("'") for item in value[1:-1].split(',')]
-                        frontmatter[key] = items
-                    else:
-                        frontmatter[key] = value
-            return frontmatter, markdown_content
+        # libyaml when available, otherwise the built-in frontmatter parser
+        return load_frontmatter(yaml_content), markdown_content
     except Exception as e:
         raise ValueError(f"YAML parsing error: {e}")
 
 
-def check_yaml_frontmatter(content: str, result: ValidationResult):
+def check_yaml_frontmatter(ctx: ValidationContext, result: ValidationResult):
     """Check 1: YAML frontmatter validation."""
     try:
-        frontmatter, _ = parse_yaml_frontmatter(content)
+        frontmatter = ctx.frontmatter
         
         # Check required fields
         required_fields = ['title', 'version', 'date', 'status', 'classification']
@@ -120,15 +175,17 @@ def check_yaml_frontmatter(content: str, result: ValidationResult):
         result.add_fail("YAML frontmatter", str(e))
 
 
-def check_required_sections(content: str, result: ValidationResult):
+def check_required_sections(ctx: ValidationContext, result: ValidationResult):
     """Check 2: Required sections validation."""
+    content = ctx.content
     # Check CONTEXT section
     if '## CONTEXT' in content or '## 🎯 CONTEXT' in content:
         # Check for all 4 levels
-        has_level1 = 'Level 1' in content or 'level 1' in content.lower()
-        has_level2 = 'Level 2' in content or 'level 2' in content.lower()
-        has_level3 = 'Level 3' in content or 'level 3' in content.lower()
-        has_level4 = 'Level 4' in content or 'level 4' in content.lower()
+        content_lower = ctx.content_lower
+        has_level1 = 'Level 1' in content or 'level 1' in content_lower
+        has_level2 = 'Level 2' in content or 'level 2' in content_lower
+        has_level3 = 'Level 3' in content or 'level 3' in content_lower
+        has_level4 = 'Level 4' in content or 'level 4' in content_lower
         
         if has_level1 and has_level2 and has_level3 and has_level4:
             result.add_pass("CONTEXT section")
@@ -150,7 +207,7 @@ def check_required_sections(content: str, result: ValidationResult):
     
     # Check file inventory in YAML
     try:
-        frontmatter, _ = parse_yaml_frontmatter(content)
+        frontmatter = ctx.frontmatter
         if 'files' in frontmatter and isinstance(frontmatter['files'], list) and len(frontmatter['files']) > 0:
             result.add_pass("File inventory")
         else:
@@ -164,10 +221,10 @@ def check_required_sections(content: str, result: ValidationResult):
         result.add_fail("File inventory", "Cannot parse file inventory")
 
 
-def check_tier_assignments(content: str, result: ValidationResult):
+def check_tier_assignments(ctx: ValidationContext, result: ValidationResult):
     """Check 3: Tier assignment validation."""
     try:
-        frontmatter, _ = parse_yaml_frontmatter(content)
+        frontmatter = ctx.frontmatter
         
         # Check contextual_snippets tiers
         if 'contextual_snippets' in frontmatter:
@@ -190,67 +247,91 @@ def check_tier_assignments(content: str, result: ValidationResult):
         result.add_fail("Tier assignments", f"Error checking tiers: {e}")
 
 
-def check_placeholders(content: str, result: ValidationResult):
+PLACEHOLDER_NAMES = [
+    'PLACEHOLDER', 'FILL_ME', 'REPLACE', 'EXAMPLE', 'CHANGE_ME', 'FOLDER_TITLE',
+    'FILE_NAME', 'FILE_PURPOSE', 'TIER_ASSIGNMENT', 'KEYWORDS', 'KEY_CONCEPTS', 'OUTCOMES'
+]
+
+TEMPLATE_COMMENT_MARKERS = [
+    '# REPLACE:',
+    '# EXTRACT:',
+    '# ADD MORE:',
+    '# PLACEHOLDER REPLACEMENT GUIDE'
+]
+
+# One precompiled alternation finds every placeholder and template comment
+# in a single pass. It starts with a case-sensitive [\[#] class so the regex
+# engine can skip ahead to candidate characters; names are matched
+# case-insensitively after that.
+TEMPLATE_MARKER_SCANNER = re.compile(
+    r'[\[#](?:'
+    r'(?<=\[)(?P<placeholder>(?i:' + '|'.join(re.escape(n) for n in PLACEHOLDER_NAMES) + r')\])'
+    r'|(?<=#)(?P<comment> (?i:' + '|'.join(re.escape(m[2:]) for m in TEMPLATE_COMMENT_MARKERS) + r'))'
+    r')'
+)
+
+
+def scan_template_markers(content: str) -> List[Tuple[str, str, int, int]]:
+    """Find placeholders and template comments in one pass.
+    
+    Returns (kind, text, line, column) tuples in document order, where kind
+    is 'placeholder' or 'comment' and line/column are 1-based.
+    """
+    markers = []
+    line = 1
+    line_start = 0
+    last = 0
+    for match in TEMPLATE_MARKER_SCANNER.finditer(content):
+        start = match.start()
+        newlines = content.count('\n', last, start)
+        if newlines:
+            line += newlines
+            line_start = content.rfind('\n', last, start) + 1
+        last = start
+        markers.append((match.lastgroup, match.group(), line, start - line_start + 1))
+    return markers
+
+
+def check_placeholders(ctx: ValidationContext, result: ValidationResult):
     """Check 4: Placeholder text validation."""
-    placeholder_patterns = [
-        r'\[PLACEHOLDER\]',
-        r'\[FILL_ME\]',
-        r'\[REPLACE\]',
-        r'\[EXAMPLE\]',
-        r'\[CHANGE_ME\]',
-        r'\[FOLDER_TITLE\]',
-        r'\[FILE_NAME\]',
-        r'\[FILE_PURPOSE\]',
-        r'\[TIER_ASSIGNMENT\]',
-        r'\[KEYWORDS\]',
-        r'\[KEY_CONCEPTS\]',
-        r'\[OUTCOMES\]'
-    ]
-    
-    found_placeholders = []
-    for pattern in placeholder_patterns:
-        matches = re.findall(pattern, content, re.IGNORECASE)
-        if matches:
-            found_placeholders.extend(matches)
+    found_placeholders = {}
+    found_comments = {}
+    for kind, text, line, column in scan_template_markers(ctx.content):
+        if kind == 'placeholder':
+            found_placeholders.setdefault(text, (line, column))
+        else:
+            found_comments.setdefault(text.upper(), (line, column))
     
     if found_placeholders:
-        unique_placeholders = list(set(found_placeholders))
-        result.add_fail("No placeholders", f"Placeholder text found: {', '.join(unique_placeholders[:5])}")
+        listed = [f"{text} (line {line})" for text, (line, _) in list(found_placeholders.items())[:5]]
+        result.add_fail("No placeholders", f"Placeholder text found: {', '.join(listed)}")
     else:
         result.add_pass("No placeholders")
     
     # Check for template comments
-    template_comment_patterns = [
-        r'# REPLACE:',
-        r'# EXTRACT:',
-        r'# ADD MORE:',
-        r'# PLACEHOLDER REPLACEMENT GUIDE'
-    ]
-    
-    found_comments = []
-    for pattern in template_comment_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            found_comments.append(pattern)
-    
     if found_comments:
-        result.add_warning("Template comments", f"Template comments found: {', '.join(found_comments)}")
+        listed = [f"{text} (line {line})" for text, (line, _) in found_comments.items()]
+        result.add_warning("Template comments", f"Template comments found: {', '.join(listed)}")
 
 
-def check_file_inventory(agents_md_file: str, folder_path: str, result: ValidationResult):
+def check_file_inventory(ctx: ValidationContext, result: ValidationResult):
     """Check 5: File inventory validation."""
     try:
-        frontmatter, _ = parse_yaml_frontmatter(open(agents_md_file, 'r', encoding='utf-8').read())
+        frontmatter = ctx.frontmatter
         
         if 'files' not in frontmatter:
             result.add_fail("File inventory", "File inventory missing")
             return
         
         # Get actual files in folder
-        folder = Path(folder_path)
+        folder = Path(ctx.folder_path)
         actual_files = set(f.name for f in folder.glob('*.md') if f.name != 'AGENTS.md')
         
-        # Get files from inventory
+        # Get files from inventory (duplicates collapsed into an entry count as listed)
         inventory_files = set(f.get('name', '') for f in frontmatter['files'])
+        for f in frontmatter['files']:
+            if isinstance(f.get('aliases'), list):
+                inventory_files.update(f['aliases'])
         
         # Check completeness
         missing = actual_files - inventory_files
@@ -279,10 +360,10 @@ def check_file_inventory(agents_md_file: str, folder_path: str, result: Validati
         result.add_fail("File inventory", f"Error checking file inventory: {e}")
 
 
-def check_key_concepts(content: str, result: ValidationResult):
+def check_key_concepts(ctx: ValidationContext, result: ValidationResult):
     """Check 7: Key concepts validation."""
     try:
-        frontmatter, _ = parse_yaml_frontmatter(content)
+        frontmatter = ctx.frontmatter
         
         if 'key_concepts' not in frontmatter:
             result.add_fail("Key concepts", "Key concepts missing")
@@ -310,10 +391,10 @@ def check_key_concepts(content: str, result: ValidationResult):
         result.add_fail("Key concepts", f"Error checking key concepts: {e}")
 
 
-def check_expected_outcomes(content: str, result: ValidationResult):
+def check_expected_outcomes(ctx: ValidationContext, result: ValidationResult):
     """Check 8: Expected outcomes validation."""
     try:
-        frontmatter, _ = parse_yaml_frontmatter(content)
+        frontmatter = ctx.frontmatter
         
         if 'outcomes' not in frontmatter:
             result.add_fail("Expected outcomes", "Expected outcomes missing")
@@ -335,10 +416,10 @@ def check_expected_outcomes(content: str, result: ValidationResult):
         result.add_fail("Expected outcomes", f"Error checking expected outcomes: {e}")
 
 
-def check_content_quality(agents_md_file: str, folder_path: str, result: ValidationResult):
+def check_content_quality(ctx: ValidationContext, result: ValidationResult):
     """Check 9: Content quality validation (snippets, purposes, Document Guide)."""
     try:
-        frontmatter, markdown_content = parse_yaml_frontmatter(open(agents_md_file, 'r', encoding='utf-8').read())
+        frontmatter, markdown_content = ctx.frontmatter, ctx.markdown_content
         
         # Check 9.1: Snippet content verification
         if 'contextual_snippets' in frontmatter:
@@ -348,7 +429,7 @@ def check_content_quality(agents_md_file: str, folder_path: str, result: Validat
                 file_name = snippet_data.get('file', 'unknown')
                 
                 # Check if snippet is too generic
-                if any(pattern in snippet_text and len(snippet_text.split()) < 10 for pattern in generic_snippet_patterns):
+                if len(snippet_text.split()) < 10 and any(pattern in snippet_text for pattern in generic_snippet_patterns):
                     result.add_warning("Snippet content quality", f"Snippet for {file_name} may be too generic (verify by reading actual file)")
         
         # Check 9.2: File purpose specificity
@@ -359,21 +440,24 @@ def check_content_quality(agents_md_file: str, folder_path: str, result: Validat
                 file_name = file_data.get('name', 'unknown')
                 
                 # Check if purpose is too vague
-                if any(vague in purpose and len(purpose.split()) < 5 for vague in vague_purposes):
+                if len(purpose.split()) < 5 and any(vague in purpose for vague in vague_purposes):
                     result.add_warning("File purpose specificity", f"File purpose for {file_name} may be too vague: '{file_data.get('purpose', '')}' (should be specific and actionable)")
         
         # Check 9.3: Document Guide content verification
         if '## Document Guide' in markdown_content or '## 📚 Document Guide' in markdown_content:
             # Check for generic Document Guide content
             generic_patterns = ['various sections', 'multiple topics', 'different sections', 'various topics']
+            markdown_lower = markdown_content.lower()
             for pattern in generic_patterns:
-                if pattern in markdown_content.lower():
+                if pattern in markdown_lower:
                     result.add_warning("Document Guide content", f"Document Guide may contain generic content (verify by reading actual files)")
         
         # Check 9.4: Overview text source verification
-        overview_section = markdown_content.split('##')[0] if '##' in markdown_content else markdown_content[:500]
+        overview_end = markdown_content.find('##')
+        overview_section = markdown_content[:overview_end] if overview_end >= 0 else markdown_content[:500]
+        overview_lower = overview_section.lower()
         generic_overview = ['collection of files', 'documentation folder', 'set of files', 'group of files']
-        if any(pattern in overview_section.lower() for pattern in generic_overview):
+        if any(pattern in overview_lower for pattern in generic_overview):
             result.add_warning("Overview text source", "Overview text may be generic (verify by reading README)")
         
         # Check 9.5: Key concepts source verification
@@ -391,17 +475,205 @@ def check_content_quality(agents_md_file: str, folder_path: str, result: Validat
         result.add_warning("Content quality", f"Error checking content quality: {e} (manual verification recommended)")
 
 
+# Pluggable check registry: (name, check function) in execution order.
+# Every check takes (ValidationContext, ValidationResult).
+VALIDATION_CHECKS: List[Tuple[str, Callable[[ValidationContext, ValidationResult], None]]] = [
+    ('yaml_frontmatter', check_yaml_frontmatter),
+    ('required_sections', check_required_sections),
+    ('tier_assignments', check_tier_assignments),
+    ('placeholders', check_placeholders),
+    ('file_inventory', check_file_inventory),
+    ('key_concepts', check_key_concepts),
+    ('expected_outcomes', check_expected_outcomes),
+    ('content_quality', check_content_quality),
+]
+
+
+def run_checks(ctx: ValidationContext, checks=None, result: Optional[ValidationResult] = None) -> ValidationResult:
+    """Run `checks` (default: VALIDATION_CHECKS) against one context, timing each.
+    
+    A check's time is split evenly over the pass/fail results it adds
+    (result.durations), so per-result times add up to the checks' times.
+    """
+    result = result if result is not None else ValidationResult()
+    for name, check in (checks if checks is not None else VALIDATION_CHECKS):
+        passed, failed = len(result.passed), len(result.failed)
+        start = time.perf_counter()
+        check(ctx, result)
+        elapsed = time.perf_counter() - start
+        result.timings.append((name, elapsed))
+        produced = set(result.passed[passed:]) | {check_name for check_name, _ in result.failed[failed:]}
+        for check_name in produced:
+            result.durations[check_name] = result.durations.get(check_name, 0.0) + elapsed / len(produced)
+    return result
+
+
+def run_all_checks(agents_md_file: str, folder_path: str) -> ValidationResult:
+    """Run every validation check against an AGENTS.md file."""
+    return run_checks(ValidationContext(agents_md_file, folder_path))
+
+
+def find_agents_md_files(root: str) -> List[Path]:
+    """Find every AGENTS.md below root (hidden and symlinked folders skipped), sorted."""
+    found = []
+    pending = [Path(root)]
+    while pending:
+        folder = pending.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith('.'):
+                            pending.append(folder / entry.name)
+                    elif entry.name == 'AGENTS.md' and entry.is_file():
+                        found.append(folder / entry.name)
+        except OSError:
+            continue
+    return sorted(found)
+
+
+def validate_file(agents_md_file: str) -> Dict[str, Any]:
+    """Validate one AGENTS.md against its own folder (batch worker)."""
+    start = time.perf_counter()
+    try:
+        report = run_all_checks(agents_md_file, str(Path(agents_md_file).parent)).to_dict()
+    except Exception as e:
+        report = {'status': 'error', 'error': str(e), 'passed': [], 'failed': [], 'warnings': [],
+                  'timings': {}, 'durations': {}}
+    report['file'] = str(agents_md_file)
+    report['duration'] = round(time.perf_counter() - start, 6)
+    return report
+
+
+def validate_batch(root: str, workers: int = 1) -> Dict[str, Any]:
+    """Validate every AGENTS.md under root, in a process pool if workers > 1."""
+    files = [str(f) for f in find_agents_md_files(root)]
+    if workers > 1 and len(files) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        chunksize = max(1, len(files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            reports = list(pool.map(validate_file, files, chunksize=chunksize))
+    else:
+        reports = [validate_file(f) for f in files]
+    
+    for report in reports:
+        report['file'] = os.path.relpath(report['file'], root)
+    
+    counts = {status: sum(1 for r in reports if r['status'] == status) for status in ('pass', 'fail', 'error')}
+    if not reports:
+        status = 'empty'
+    else:
+        status = 'pass' if counts['pass'] == len(reports) else 'fail'
+    return {
+        'root': str(Path(root).absolute()),
+        'total': len(reports),
+        'passed': counts['pass'],
+        'failed': counts['fail'],
+        'errors': counts['error'],
+        'status': status,
+        'files': reports
+    }
+
+
+def batch_report_junit(batch: Dict[str, Any]) -> str:
+    """Render a batch report as JUnit XML (one testcase per file and check).
+    
+    Testcase times come from each report's 'durations' (see run_checks).
+    Warnings go to the system-out of the testcase of their check; those of
+    checks without a testcase go to the testsuite's system-out.
+    """
+    import xml.etree.ElementTree as ET
+    
+    cases = []
+    unattached = []
+    for report in batch['files']:
+        classname = report['file'].replace(os.sep, '/')
+        duration = report['duration']
+        if report['status'] == 'error':
+            case = ET.Element('testcase', classname=classname, name='validation', time=f"{duration:.6f}")
+            ET.SubElement(case, 'error', message=report['error'])
+            cases.append(case)
+            continue
+        durations = report.get('durations', {})
+        file_cases = {}
+        for check in report['passed']:
+            case = ET.Element('testcase', classname=classname, name=check,
+                              time=f"{durations.get(check, 0.0):.6f}")
+            file_cases.setdefault(check, case)
+            cases.append(case)
+        for failure in report['failed']:
+            case = ET.Element('testcase', classname=classname, name=failure['check'],
+                              time=f"{durations.get(failure['check'], 0.0):.6f}")
+            ET.SubElement(case, 'failure', message=failure['details'] or 'FAIL')
+            file_cases.setdefault(failure['check'], case)
+            cases.append(case)
+        warnings = {}
+        for warning in report['warnings']:
+            case = file_cases.get(warning['check'])
+            if case is None:
+                unattached.append(f"{classname}: {warning['check']}: {warning['details']}")
+            else:
+                warnings.setdefault(case, []).append(f"{warning['check']}: {warning['details']}")
+        for case, lines in warnings.items():
+            ET.SubElement(case, 'system-out').text = '\n'.join(lines)
+    
+    suite = ET.Element('testsuite', name='agents-md-validation', tests=str(len(cases)),
+                       failures=str(sum(1 for c in cases if c.find('failure') is not None)),
+                       errors=str(sum(1 for c in cases if c.find('error') is not None)))
+    suite.extend(cases)
+    if unattached:
+        ET.SubElement(suite, 'system-out').text = '\n'.join(unattached)
+    suites = ET.Element('testsuites')
+    suites.append(suite)
+    return ET.tostring(suites, encoding='unicode')
+
+
 def main():
     """Main execution function."""
     import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Validate generated AGENTS.md file")
+    parser.add_argument('agents_md_file', nargs='?', metavar='AGENTS_MD_FILE')
+    parser.add_argument('folder_path', nargs='?', metavar='TARGET_FOLDER_PATH')
+    parser.add_argument('--timings', action='store_true', help="Print per-check timings")
+    parser.add_argument('--batch', metavar='ROOT', help="Validate every AGENTS.md under ROOT")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes for --batch (default: 1)")
+    parser.add_argument('--report-format', choices=['json', 'junit'], default='json',
+                        help="Batch report format (default: json)")
+    parser.add_argument('--report', metavar='FILE', help="Write the batch report to FILE")
+    args = parser.parse_args()
     
-    if len(sys.argv) < 3:
+    if args.batch:
+        if not os.path.isdir(args.batch):
+            print(f"Error: Target folder not found: {args.batch}", file=sys.stderr)
+            sys.exit(1)
+        
+        batch = validate_batch(args.batch, args.workers)
+        if args.report_format == 'junit':
+            output = batch_report_junit(batch)
+        else:
+            output = json.dumps(batch, indent=2, ensure_ascii=False)
+        
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+            print(f"Batch validation: {batch['passed']}/{batch['total']} passed, "
+                  f"{batch['failed']} failed, {batch['errors']} errors -> {args.report}")
+        else:
+            print(output)
+        if batch['status'] == 'empty':
+            print(f"Error: No AGENTS.md files found under: {args.batch}", file=sys.stderr)
+        
+        sys.exit(0 if batch['status'] == 'pass' else 1)
+    
+    if not args.agents_md_file or not args.folder_path:
         print("Error: AGENTS.md file and target folder path required", file=sys.stderr)
         print("Usage: python validate-agents-md.py [AGENTS_MD_FILE] [TARGET_FOLDER_PATH]", file=sys.stderr)
         sys.exit(1)
     
-    agents_md_file = sys.argv[1]
-    folder_path = sys.argv[2]
+    agents_md_file = args.agents_md_file
+    folder_path = args.folder_path
     
     if not os.path.exists(agents_md_file):
         print(f"Error: AGENTS.md file not found: {agents_md_file}", file=sys.stderr)
@@ -412,23 +684,12 @@ def main():
         sys.exit(1)
     
     try:
-        with open(agents_md_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        result = ValidationResult()
-        
-        # Run all validation checks
-        check_yaml_frontmatter(content, result)
-        check_required_sections(content, result)
-        check_tier_assignments(content, result)
-        check_placeholders(content, result)
-        check_file_inventory(agents_md_file, folder_path, result)
-        check_key_concepts(content, result)
-        check_expected_outcomes(content, result)
-        check_content_quality(agents_md_file, folder_path, result)
+        result = run_all_checks(agents_md_file, folder_path)
         
         # Print report
         result.print_report()
+        if args.timings:
+            result.print_timings()
         
         # Exit with appropriate code
         sys.exit(0 if not result.failed else 1)
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+watch-agents-md.py - Keep analysis, context and AGENTS.md validation in sync
+
+Purpose: Long-running watcher that re-runs the SOP phases (analyze -> extract
+         -> check-existing -> validate) incrementally whenever markdown files
+         in the target folder change. Only changed files are re-analyzed and
+         only their context entries are patched; validation runs only the
+         checks affected by the change.
+
+Usage:
+    python watch-agents-md.py [TARGET_FOLDER_PATH] [--poll] [--interval S] [--debounce S] [--output-dir DIR] [--generate]
+
+    --poll        Force polling instead of inotify
+    --interval    Polling interval in seconds (default: 0.5)
+    --debounce    Quiet period before a batch of changes is processed (default: 0.2)
+    --output-dir  Where [TARGET_FOLDER]_analysis.json / _context.json are written (default: .)
+    --generate    Re-render AGENTS.md with generate-agents-md.py after each change
+                  (only if it is missing or was generated by this tool)
+
+Exit codes:
+    0 = Stopped (Ctrl+C)
+    1 = Error (folder not found, no markdown files)
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Optional, Set
+
+from md_document import MarkdownDocument
+from script_loader import load_execution
+
+# inotify event masks (see <sys/inotify.h>)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+
+# Word counts in AGENTS.md may drift this much before an entry is stale
+WORD_COUNT_TOLERANCE = 0.10
+
+
+class InotifyWatcher:
+    """Report names of files changed in a folder using Linux inotify."""
+
+    def __init__(self, folder: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, str(folder).encode(), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {folder}")
+
+    def poll(self, timeout: float) -> Set[str]:
+        """Wait up to `timeout` seconds and return the names that changed."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return set()
+        names = set()
+        offset = 0
+        while offset + 16 <= len(data):
+            _, _, _, length = struct.unpack_from('iIII', data, offset)
+            name = data[offset + 16:offset + 16 + length].rstrip(b'\0')
+            names.add(name.decode('utf-8', 'replace'))
+            offset += 16 + length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Report names of files changed in a folder by comparing stat snapshots."""
+
+    def __init__(self, folder: Path, interval: float = 0.5):
+        self.folder = folder
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, tuple]:
+        snapshot = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                # A file removed or replaced mid-scan is skipped; the next
+                # scan reports it as changed
+                try:
+                    if entry.name.endswith('.md') and entry.is_file():
+                        st = entry.stat()
+                        snapshot[entry.name] = (st.st_size, st.st_mtime_ns)
+                except OSError:
+                    continue
+        return snapshot
+
+    def poll(self, timeout: float) -> Set[str]:
+        """Sleep up to one polling interval and return the names that changed."""
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = {name for name in current.keys() | self.snapshot.keys()
+                   if current.get(name) != self.snapshot.get(name)}
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+def make_watcher(folder: Path, force_poll: bool = False, interval: float = 0.5):
+    """Use inotify where available, otherwise fall back to polling."""
+    if not force_poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(folder)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(folder, interval)
+
+
+def wait_for_changes(watcher, debounce: float) -> Set[str]:
+    """Block until markdown files change, then collect changes until quiet."""
+    changed = set()
+    while not changed:
+        changed = {n for n in watcher.poll(1.0) if n.endswith('.md')}
+    while True:
+        more = {n for n in watcher.poll(debounce) if n.endswith('.md')}
+        if not more:
+            return changed
+        changed |= more
+
+
+class WatchSession:
+    """In-memory analysis/context state of a folder, patched file by file."""
+
+    def __init__(self, folder_path: str, output_dir: str = '.',
+                 generate: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None):
+        self.analyzer = load_execution('analyze-folder.py')
+        self.extractor = load_execution('extract-context.py')
+        self.checker = load_execution('check-existing-agents-md.py')
+        self.validator = load_execution('validate-agents-md.py')
+
+        self.folder_path = folder_path
+        self.folder = self.analyzer.check_folder(folder_path)
+        self.output_dir = Path(output_dir)
+        self.generate = generate
+
+        self.file_data = {}
+        self.contexts = {}
+        self.signals = {}
+        self.keywords = self.extractor.KeywordIndex()
+        for md_file in self.analyzer.list_markdown_files(self.folder):
+            self._refresh(md_file.name)
+
+    def _refresh(self, name: str):
+        """Re-analyze one file and rebuild its context entry (or drop it)."""
+        path = self.folder / name
+        if not path.is_file():
+            self.file_data.pop(name, None)
+            self.contexts.pop(name, None)
+            self.signals.pop(name, None)
+            self.keywords.remove(name)
+            return
+        documents = {}
+        file_data = self.analyzer.analyze_file(path, documents)
+        doc = documents.get(name) or MarkdownDocument(path, "", 0, 0.0)
+        self.file_data[name] = file_data
+        self.contexts[name], self.signals[name], vector = self.extractor.build_file_context(doc, file_data)
+        # Replaces the file's old vector, updating document frequencies in place
+        self.keywords.add(name, vector)
+
+    def analysis(self) -> Dict[str, Any]:
+        names = sorted(self.file_data)
+        return self.analyzer.summarize_folder(self.folder, [self.file_data[n] for n in names])
+
+    def context(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Context of the current files; link centrality comes from `analysis` (its link graph)."""
+        names = sorted(self.contexts)
+        files = [dict(self.contexts[n], keywords=self.extractor.file_keywords(self.keywords, n))
+                 for n in names]
+        graph = analysis.get('link_graph')
+        index = self.extractor.node_index(graph)
+        for record in files:
+            self.extractor.apply_links(record, graph, index, record['name'])
+        return {
+            'folder_path': self.folder_path,
+            'folder_name': self.folder.name,
+            'files': files,
+            'key_concepts': self.extractor.extract_key_concepts([self.signals[n] for n in names]),
+            'total_files': len(names)
+        }
+
+    def write_outputs(self, analysis: Dict[str, Any], context: Dict[str, Any]):
+        """Write `<folder>_analysis.json` and `<folder>_context.json`."""
+        for suffix, data in (('analysis', analysis), ('context', context)):
+            output_file = self.output_dir / f"{self.folder.name}_{suffix}.json"
+            tmp_file = output_file.with_name(output_file.name + '.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, output_file)
+
+    def check_changed_entries(self, ctx, changed: List[str], result):
+        """Flag AGENTS.md inventory entries that no longer match changed files."""
+        try:
+            frontmatter = ctx.frontmatter
+        except ValueError as e:
+            result.add_fail("Changed file entries", f"Cannot parse AGENTS.md: {e}")
+            return
+        entries = {e.get('name'): e for e in frontmatter.get('files', []) or [] if isinstance(e, dict)}
+        stale = []
+        for name in changed:
+            entry = entries.get(name)
+            current = self.contexts.get(name)
+            if entry is None or current is None:
+                continue  # additions/removals are reported by the inventory check
+            listed = entry.get('word_count') or 0
+            actual = current['word_count']
+            if not isinstance(listed, int) or abs(listed - actual) > WORD_COUNT_TOLERANCE * max(actual, 1):
+                stale.append(f"{name} (word_count {listed} vs {actual})")
+            elif entry.get('tier') != current['tier']:
+                stale.append(f"{name} (tier {entry.get('tier')} vs {current['tier']})")
+        if stale:
+            result.add_warning("Changed file entries", f"Stale entries: {', '.join(stale[:5])}")
+        else:
+            result.add_pass("Changed file entries")
+
+    def process(self, changed: Set[str]):
+        """Run the phases for one batch of changed file names."""
+        started = time.perf_counter()
+        sources = sorted(n for n in changed if n != 'AGENTS.md')
+
+        # Phase 1 + 2: re-analyze only the changed files, patch their context
+        for name in sources:
+            self._refresh(name)
+        analysis = self.analysis()
+        context = self.context(analysis)
+        self.write_outputs(analysis, context)
+
+        # Phase 3: regenerate only if the existing AGENTS.md may be overwritten
+        existing = self.checker.check_existing_agents_md(self.folder_path)
+        if self.generate and sources and existing.get('status') in ('not_exists', 'tool_generated'):
+            self.generate(analysis, context)
+            changed = changed | {'AGENTS.md'}
+
+        # Phase 4: validate the sections affected by this batch
+        agents_md_file = self.folder / 'AGENTS.md'
+        result = None
+        if agents_md_file.exists():
+            if 'AGENTS.md' in changed:
+                result = self.validator.run_all_checks(str(agents_md_file), self.folder_path)
+            else:
+                ctx = self.validator.ValidationContext(str(agents_md_file), self.folder_path)
+                result = self.validator.run_checks(ctx, [('file_inventory', self.validator.check_file_inventory)])
+                self.check_changed_entries(ctx, sources, result)
+
+        elapsed = time.perf_counter() - started
+        stamp = datetime.now().strftime('%H:%M:%S')
+        print(f"[{stamp}] {len(changed)} change(s): {', '.join(sorted(changed)[:5])}")
+        print(f"  Files: {context['total_files']}  AGENTS.md: {existing.get('status')}  ({elapsed * 1000:.0f} ms)")
+        if result is not None:
+            result.print_report()
+        sys.stdout.flush()
+
+
+def make_generate_hook(folder_path: str) -> Callable[[Dict[str, Any], Dict[str, Any]], None]:
+    """WatchSession hook that re-renders AGENTS.md from the in-memory context."""
+    generator = load_execution('generate-agents-md.py')
+    state = {'backup': True}
+    
+    def generate(analysis: Dict[str, Any], context: Dict[str, Any]):
+        # Back up the AGENTS.md found at startup once, not every regenerated copy;
+        # patch mode rewrites only the entries of the files that changed
+        result = generator.generate_agents_md(folder_path, context, analysis, backup=state['backup'],
+                                              patch=True)
+        state['backup'] = False
+        if result.get('backup'):
+            print(f"  Backup: {result['backup']}")
+    
+    return generate
+
+
+def main():
+    """Main execution function."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Watch a folder and keep AGENTS.md inputs and validation in sync")
+    parser.add_argument('folder_path', nargs='?', metavar='TARGET_FOLDER_PATH')
+    parser.add_argument('--poll', action='store_true', help="Force polling instead of inotify")
+    parser.add_argument('--interval', type=float, default=0.5, help="Polling interval in seconds (default: 0.5)")
+    parser.add_argument('--debounce', type=float, default=0.2,
+                        help="Quiet period before processing changes (default: 0.2)")
+    parser.add_argument('--output-dir', default='.', help="Directory for the JSON outputs (default: .)")
+    parser.add_argument('--generate', action='store_true',
+                        help="Re-render AGENTS.md after changes (only if missing or tool-generated)")
+    args = parser.parse_args()
+
+    if not args.folder_path:
+        print("Error: Target folder path required", file=sys.stderr)
+        print("Usage: python watch-agents-md.py [TARGET_FOLDER_PATH]", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        generate = make_generate_hook(args.folder_path) if args.generate else None
+        session = WatchSession(args.folder_path, args.output_dir, generate)
+        analysis = session.analysis()
+        session.write_outputs(analysis, session.context(analysis))
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    watcher = make_watcher(session.folder, args.poll, args.interval)
+    mode = 'inotify' if isinstance(watcher, InotifyWatcher) else f'polling every {args.interval}s'
+    print(f"Watching {session.folder} ({mode}, {len(session.file_data)} files) - Ctrl+C to stop")
+    sys.stdout.flush()
+
+    try:
+        while True:
+            changed = wait_for_changes(watcher, args.debounce)
+            try:
+                session.process(changed)
+            except Exception as e:
+                print(f"Error: Update failed: {e}", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("Stopped.")
+    finally:
+        watcher.close()
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()